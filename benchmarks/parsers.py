@@ -0,0 +1,112 @@
+"""Micro-benchmarks of the page parsers over a page corpus.
+
+Replays every page of a :mod:`scripts.page_corpus` file through each
+``parse_*`` page function of the extractors and reports pages per second,
+without the XML parsing that dominates a full :mod:`benchmarks.run` stage.
+Build a corpus from a real dump once (``python -m scripts.page_corpus build``)
+and rerun this after parser changes; without ``--corpus`` a synthetic dump is
+generated and turned into a corpus first.
+
+Usage:
+    python -m benchmarks.parsers [--corpus pages.corpus] [--repeat 5] [--parsers parse_weapon_page,...]
+        [--pages 5000] [--item-ratio 0.4] [--seed 0]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from benchmarks.synthetic_dump import add_dump_arguments, generate_dump
+from scripts.attachment_views import extract_attachments_section
+from scripts.extract_attachments import (
+    parse_attachment_page,
+    parse_chisel_from_misc_infobox,
+    parse_chisel_page,
+    parse_equipment_attachment,
+)
+from scripts.extract_calibers import parse_ammo_page
+from scripts.extract_enchantments import parse_oil_from_equipment_infobox, parse_oil_page
+from scripts.extract_scrolls import parse_scroll_from_equipment_infobox, parse_scroll_page
+from scripts.extract_weapons import parse_weapon_page
+from scripts.page_corpus import PageCorpus, build_corpus
+
+# Every (title, wikitext) page function the extractors call per page
+PAGE_PARSERS: Dict[str, Callable[[str, str], object]] = {
+    "parse_attachment_page": parse_attachment_page,
+    "parse_equipment_attachment": parse_equipment_attachment,
+    "parse_chisel_from_misc_infobox": parse_chisel_from_misc_infobox,
+    "parse_chisel_page": parse_chisel_page,
+    "parse_weapon_page": parse_weapon_page,
+    "parse_oil_page": parse_oil_page,
+    "parse_oil_from_equipment_infobox": parse_oil_from_equipment_infobox,
+    "parse_scroll_page": parse_scroll_page,
+    "parse_scroll_from_equipment_infobox": parse_scroll_from_equipment_infobox,
+    "parse_ammo_page": parse_ammo_page,
+    "extract_attachments_section": lambda title, wikitext: extract_attachments_section(wikitext),
+}
+
+
+def benchmark_parsers(
+    pages: List[Tuple[str, str]],
+    parsers: Optional[List[str]] = None,
+    repeat: int = 5,
+) -> Dict[str, Dict[str, float]]:
+    """Time each parser over ``pages``.
+
+    Returns:
+        Parser name -> ``{"seconds", "pages_per_sec", "matched"}`` where
+        ``seconds`` is the best of ``repeat`` runs and ``matched`` the pages
+        the parser returned a result for.
+    """
+    results: Dict[str, Dict[str, float]] = {}
+    for name in parsers or list(PAGE_PARSERS):
+        parse = PAGE_PARSERS[name]
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            matched = sum(1 for title, wikitext in pages if parse(title, wikitext))
+            best = min(best, time.perf_counter() - start)
+        results[name] = {
+            "seconds": best,
+            "pages_per_sec": len(pages) / best if best else 0.0,
+            "matched": matched,
+        }
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the page parsers over a page corpus")
+    parser.add_argument("--corpus", default=None, help="Corpus file (default: built from a synthetic dump)")
+    parser.add_argument("--parsers", default=",".join(PAGE_PARSERS), help="Comma-separated parsers to time")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per parser (best time is kept)")
+    add_dump_arguments(parser)
+    args = parser.parse_args(argv)
+
+    names = args.parsers.split(",")
+    unknown = set(names) - set(PAGE_PARSERS)
+    if unknown:
+        parser.error(f"Unknown parsers: {sorted(unknown)}")
+
+    with tempfile.TemporaryDirectory(prefix="sulfur-parsers-") as tmp:
+        corpus_path = args.corpus
+        if corpus_path is None:
+            dump_path = os.path.join(tmp, "dump.xml")
+            generate_dump(dump_path, args.pages, args.revisions, args.item_ratio, args.formats.split(","), args.seed)
+            corpus_path = os.path.join(tmp, "pages.corpus")
+            build_corpus(dump_path, corpus_path)
+        start = time.perf_counter()
+        with PageCorpus(corpus_path) as corpus:
+            pages = list(corpus)
+        load_seconds = time.perf_counter() - start
+
+    print(f"Loaded {len(pages)} pages in {load_seconds * 1000:.1f} ms")
+    print(f"  {'parser':<36} {'ms':>9} {'pages/s':>11} {'matched':>8}")
+    for name, result in benchmark_parsers(pages, names, args.repeat).items():
+        print(f"  {name:<36} {result['seconds'] * 1000:9.2f} {result['pages_per_sec']:>11,.0f} "
+              f"{result['matched']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""Pipeline benchmarks over a synthetic wiki dump.
+
+Generates a dump with :mod:`benchmarks.synthetic_dump`, then times
+``iterate_pages``, each ``extract_*`` function and ``update_all`` end to
+end. Every stage runs in a fresh interpreter (``spawn``), so its peak RSS is
+its own and not the high-water mark of an earlier stage. Results are written
+as JSON::
+
+    {
+      "format": 1,
+      "commit": "<git HEAD>", "created": "...", "python": "3.11.4",
+      "dump": {"pages": 5000, "item_pages": 2000, "revisions": 5000, "bytes": ..., ...},
+      "stages": {
+        "iterate_pages": {"seconds": 0.41, "pages_per_sec": 12195.1, "mb_per_sec": 17.3,
+                          "peak_rss_mb": 31.2, "baseline_rss_mb": 18.0},
+        ...
+      }
+    }
+
+``seconds`` is the best of ``--repeat`` runs and ``peak_rss_mb`` the largest.
+``baseline_rss_mb`` is the child's RSS before the stage started (interpreter
+and imports). Compare two results files with ``--compare``.
+
+Usage:
+    python -m benchmarks.run [--pages 5000] [--revisions 1] [--item-ratio 0.4]
+        [--formats item,weapon,equipment] [--repeat 3] [--stages iterate_pages,update_all]
+        [--output benchmarks/results.json]
+    python -m benchmarks.run --compare old.json new.json
+"""
+
+import argparse
+import contextlib
+import io
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from benchmarks.synthetic_dump import FORMATS, add_dump_arguments, generate_dump
+from scripts.data_io import write_json
+from scripts.json_backend import load_json
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+RESULTS_FORMAT = 1
+
+STAGES = [
+    "iterate_pages",
+    "extract_attachments",
+    "extract_weapons",
+    "extract_enchantments",
+    "extract_scrolls",
+    "extract_calibers",
+    "update_all",
+]
+
+
+def _rss_mb() -> Optional[float]:
+    """Peak RSS of this process so far, in MB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# ---------------------------------------------------------------------------
+# Stages (run in a child process)
+# ---------------------------------------------------------------------------
+
+
+def _run_stage(stage: str, dump_path: str, work_dir: str) -> None:
+    if stage == "iterate_pages":
+        from scripts.wiki_parser import iterate_pages
+        for _ in iterate_pages(dump_path):
+            pass
+    elif stage == "extract_attachments":
+        from scripts.extract_attachments import extract_attachments
+        extract_attachments(dump_path, work_dir)
+    elif stage == "extract_weapons":
+        from scripts.extract_weapons import extract_weapons
+        extract_weapons(dump_path, os.path.join(work_dir, "weapons.json"))
+    elif stage == "extract_enchantments":
+        from scripts.extract_enchantments import extract_enchantments
+        extract_enchantments(dump_path, os.path.join(work_dir, "enchantments.json"))
+    elif stage == "extract_scrolls":
+        from scripts.extract_scrolls import extract_scrolls
+        extract_scrolls(dump_path, os.path.join(work_dir, "scrolls.json"))
+    elif stage == "extract_calibers":
+        from scripts.extract_calibers import extract_calibers
+        extract_calibers(dump_path, os.path.join(work_dir, "caliber-modifiers.json"))
+    elif stage == "update_all":
+        from scripts import update_all
+        argv = sys.argv
+        sys.argv = ["update_all", dump_path, "--output-dir", os.path.join(work_dir, "data")]
+        try:
+            update_all.main()
+        finally:
+            sys.argv = argv
+    else:
+        raise ValueError(f"Unknown stage: {stage}")
+
+
+def _stage_child(stage: str, dump_path: str, work_dir: str, conn) -> None:
+    try:
+        # Import everything the stage needs before measuring the baseline
+        import scripts.update_all  # noqa: F401
+        baseline = _rss_mb()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            _run_stage(stage, dump_path, work_dir)
+            elapsed = time.perf_counter() - start
+        conn.send({"seconds": elapsed, "peak_rss_mb": _rss_mb(), "baseline_rss_mb": baseline})
+    except BaseException as exc:
+        conn.send({"error": f"{type(exc).__name__}: {exc}"})
+    finally:
+        conn.close()
+
+
+def time_stage(stage: str, dump_path: str, work_dir: str) -> Dict[str, Any]:
+    """Run one stage in a fresh interpreter and return its seconds and RSS."""
+    context = multiprocessing.get_context("spawn")
+    parent_conn, child_conn = context.Pipe(duplex=False)
+    process = context.Process(target=_stage_child, args=(stage, dump_path, work_dir, child_conn))
+    process.start()
+    child_conn.close()
+    try:
+        result = parent_conn.recv()
+    except EOFError:
+        result = {"error": "stage process exited without a result"}
+    process.join()
+    if "error" in result:
+        raise RuntimeError(f"{stage} failed: {result['error']}")
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Suite
+# ---------------------------------------------------------------------------
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(
+    pages: int = 5000,
+    revisions: int = 1,
+    item_ratio: float = 0.4,
+    formats: Optional[List[str]] = None,
+    seed: int = 0,
+    stages: Optional[List[str]] = None,
+    repeat: int = 3,
+) -> Dict[str, Any]:
+    """Generate a dump, time each stage on it and return the results dict.
+
+    Args:
+        pages, revisions, item_ratio, formats, seed: Dump shape, see
+            :func:`benchmarks.synthetic_dump.generate_dump`.
+        stages: Stages to run (default: all of :data:`STAGES`).
+        repeat: Runs per stage; the fastest time and largest peak RSS are kept.
+    """
+    stages = stages or STAGES
+    formats = list(formats or FORMATS)
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        raise ValueError(f"Unknown stages: {sorted(unknown)} (expected {STAGES})")
+    params = {"pages": pages, "revisions": revisions, "item_ratio": item_ratio,
+              "formats": formats, "seed": seed}
+
+    with tempfile.TemporaryDirectory(prefix="sulfur-bench-") as tmp:
+        dump_path = os.path.join(tmp, "dump.xml")
+        dump = generate_dump(dump_path, pages, revisions, item_ratio, formats, seed)
+        megabytes = dump["bytes"] / (1024 * 1024)
+
+        results: Dict[str, Dict[str, Any]] = {}
+        for stage in stages:
+            runs = []
+            for run in range(repeat):
+                work_dir = os.path.join(tmp, f"{stage}-{run}")
+                os.makedirs(work_dir)
+                runs.append(time_stage(stage, dump_path, work_dir))
+            seconds = min(r["seconds"] for r in runs)
+            peaks = [r["peak_rss_mb"] for r in runs if r["peak_rss_mb"] is not None]
+            results[stage] = {
+                "seconds": seconds,
+                "pages_per_sec": pages / seconds if seconds else None,
+                "mb_per_sec": megabytes / seconds if seconds else None,
+                "peak_rss_mb": max(peaks) if peaks else None,
+                "baseline_rss_mb": runs[0]["baseline_rss_mb"],
+            }
+            print(f"  {stage:<22} {seconds:8.3f} s  {results[stage]['pages_per_sec']:>10,.0f} pages/s  "
+                  f"{results[stage]['mb_per_sec']:7.2f} MB/s  peak {results[stage]['peak_rss_mb'] or 0:7.1f} MB")
+
+    return {
+        "format": RESULTS_FORMAT,
+        "commit": _git_commit(),
+        "created": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": dict(params, repeat=repeat),
+        "dump": dump,
+        "stages": results,
+    }
+
+
+def compare_results(old: Dict[str, Any], new: Dict[str, Any]) -> None:
+    """Print per-stage time and peak RSS of two results files side by side."""
+    print(f"old: {old.get('commit') or '?'} ({old['created']})  new: {new.get('commit') or '?'} ({new['created']})")
+    if old.get("params") != new.get("params"):
+        print("  warning: results were measured with different parameters")
+    print(f"  {'stage':<22} {'old s':>9} {'new s':>9} {'speedup':>8} {'old MB':>8} {'new MB':>8}")
+    for stage in [s for s in STAGES if s in old["stages"] or s in new["stages"]]:
+        before, after = old["stages"].get(stage), new["stages"].get(stage)
+        if before is None or after is None:
+            print(f"  {stage:<22} {'only in ' + ('new' if before is None else 'old'):>19}")
+            continue
+        speedup = before["seconds"] / after["seconds"] if after["seconds"] else float("inf")
+        print(f"  {stage:<22} {before['seconds']:9.3f} {after['seconds']:9.3f} {speedup:7.2f}x "
+              f"{before['peak_rss_mb'] or 0:8.1f} {after['peak_rss_mb'] or 0:8.1f}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the extraction pipeline on a synthetic dump")
+    add_dump_arguments(parser)
+    parser.add_argument("--stages", default=",".join(STAGES), help="Comma-separated stages to run")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per stage (best time is kept)")
+    parser.add_argument("--output", default=None, help="Write results JSON here")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare two results files")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare_results(load_json(args.compare[0]), load_json(args.compare[1]))
+        return
+
+    results = run_benchmarks(args.pages, args.revisions, args.item_ratio, args.formats.split(","),
+                             args.seed, args.stages.split(","), args.repeat)
+    if args.output:
+        write_json(args.output, results)
+        print(f"Results -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Benchmarks of the Monte Carlo TTK/DPS simulator.
+
+Times :func:`scripts.simulate.simulate` on a few fixed stat vectors,
+including the worst case for per-shot sampling: a wide cone at long range,
+where about 2% of shots hit and a kill takes ~1600 shots. Each build should
+run a million trials in well under a second.
+
+Usage:
+    python -m benchmarks.simulate [--trials 1000000] [--repeat 3] [--builds rare_hits,...]
+"""
+
+import argparse
+import time
+from typing import Dict, List, Optional, Tuple
+
+from scripts.simulate import simulate
+
+_BASE = {"Damage": 100.0, "RPM": 600.0, "MagazineSize": 2.0, "Spread": 0.0, "ProjectileCount": 1.0,
+         "ReloadSpeed": 1.0, "AmmoConsumeChance": 1.0, "CritChance": 0.0, "BulletPenetrations": 0.0}
+
+# Name -> (stats, target overrides)
+BUILDS: Dict[str, Tuple[Dict[str, float], Dict]] = {
+    "sure_hit": (_BASE, {"distance": 10.0, "radius": 0.5, "head_fraction": 0.0}),
+    "shotgun_crits": (dict(_BASE, CritChance=0.3, Spread=12.0, ProjectileCount=3.0),
+                      {"health": 900.0, "crit_multiplier": 1.75}),
+    "rare_hits": (dict(_BASE, Damage=50.0, Spread=20.0, CritChance=0.2, MagazineSize=30.0, AmmoConsumeChance=0.7),
+                  {"health": 2000.0}),
+}
+
+
+def benchmark_simulate(
+    builds: Optional[List[str]] = None,
+    trials: int = 1_000_000,
+    repeat: int = 3,
+) -> Dict[str, Dict[str, float]]:
+    """Time :func:`simulate` for each build.
+
+    Returns:
+        Build name -> ``{"seconds", "trials_per_sec", "hit_chance",
+        "mean_shots"}`` where ``seconds`` is the best of ``repeat`` runs
+        (after one small warm-up run).
+    """
+    results: Dict[str, Dict[str, float]] = {}
+    for name in builds or list(BUILDS):
+        stats, target = BUILDS[name]
+        simulate(stats, target, trials=1000, seed=0)
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = simulate(stats, target, trials=trials, seed=0)
+            best = min(best, time.perf_counter() - start)
+        results[name] = {
+            "seconds": best,
+            "trials_per_sec": trials / best if best else 0.0,
+            "hit_chance": result["hit_chance"],
+            "mean_shots": result["shots_to_kill"]["mean"],
+        }
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the Monte Carlo TTK/DPS simulator")
+    parser.add_argument("--builds", default=",".join(BUILDS), help="Comma-separated builds to time")
+    parser.add_argument("--trials", type=int, default=1_000_000, help="Trials per run")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per build (best time is kept)")
+    args = parser.parse_args(argv)
+
+    names = args.builds.split(",")
+    unknown = set(names) - set(BUILDS)
+    if unknown:
+        parser.error(f"Unknown builds: {sorted(unknown)}")
+
+    print(f"  {'build':<16} {'ms':>9} {'trials/s':>13} {'hit chance':>11} {'mean shots':>11}")
+    for name, result in benchmark_simulate(names, args.trials, args.repeat).items():
+        print(f"  {name:<16} {result['seconds'] * 1000:9.1f} {result['trials_per_sec']:>13,.0f} "
+              f"{result['hit_chance']:>11.4f} {result['mean_shots']:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+"""Synthetic MediaWiki XML dumps for benchmarking the extraction pipeline.
+
+Generates a dump in the export-0.11 schema that the extractors read, with
+controllable size and shape:
+
+- ``pages``: total ``<page>`` elements.
+- ``revisions``: ``<revision>`` elements per page (history dumps); only the
+  last one is current, earlier ones carry older stat values.
+- ``item_ratio``: fraction of pages that are items (weapons, oils, scrolls,
+  attachments, chisels, ammo); the rest are lore pages, category pages and
+  redirects, which every extractor has to read and skip.
+- ``formats``: infobox formats to emit, any of ``item`` (``{{Item Infobox}}``
+  with ``kind=``), ``weapon`` (``{{Weapon Infobox}}``) and ``equipment``
+  (``{{Equipment Infobox}}`` for oils, scrolls and attachments). Item kinds
+  that none of the formats cover are not generated.
+
+Output is deterministic for a given ``seed``.
+
+Usage:
+    python -m benchmarks.synthetic_dump <output.xml> [--pages 5000] [--revisions 1]
+        [--item-ratio 0.4] [--formats item,weapon,equipment] [--seed 0]
+"""
+
+import argparse
+import random
+from typing import Callable, Dict, List, Sequence
+from xml.sax.saxutils import escape
+
+FORMATS = ("item", "weapon", "equipment")
+
+_NAMESPACE = "http://www.mediawiki.org/xml/export-0.11/"
+
+_CALIBERS = ["9mm", "5.56mm", "7.62mm", "12ga", ".50 BMG", ".22 LR"]
+_WEAPON_TYPES = ["Pistol", "Rifle", "SMG", "Shotgun", "Sniper"]
+_SLOT_SUBTYPES = {
+    "muzzle": "[[Muzzle Attachments|Muzzle attachment]]",
+    "sight": "[[Sight|Sights]]",
+    "laser": "[[Laser Sights|Laser sight]]",
+    "chamber": "[[Chamber Attachments|Chamber attachment]]",
+}
+_ATTACHMENT_LINKS = [
+    "[[Muzzle Attachments]]", "[[Sight|Sights]]", "[[Laser Sights]]", "[[Chamber Chisel|Chamber Chisels]]",
+]
+_WORDS = (
+    "the sulfur lies beneath old church where cultists gather oil barrels and "
+    "broken lanterns line every corridor bullets ricochet off stone walls while "
+    "goblins scavenge scrap metal from fallen adventurers"
+).split()
+
+
+def _lore(rng: random.Random, sentences: int) -> str:
+    return "\n\n".join(
+        " ".join(rng.choice(_WORDS) for _ in range(rng.randint(8, 20))).capitalize() + "."
+        for _ in range(sentences)
+    )
+
+
+def _signed(rng: random.Random, low: int, high: int, percent: bool = False) -> str:
+    value = rng.randint(low, high) or 1
+    return f"{value:+d}{'%' if percent else ''}"
+
+
+# ---------------------------------------------------------------------------
+# Item page templates: (rng, name, revision) -> wikitext
+# ---------------------------------------------------------------------------
+
+
+def _weapon_item(rng: random.Random, name: str, revision: int) -> str:
+    return f"""{{{{Item Infobox
+| kind = weapon
+| SubType = [[{rng.choice(_WEAPON_TYPES)}s|{rng.choice(_WEAPON_TYPES)}]]
+| Ammo = [[{rng.choice(_CALIBERS)}]]
+| Damage = {rng.randint(20, 200) + revision}{'x8' if rng.random() < 0.15 else ''}
+| RPM = {rng.randint(60, 900)}
+| Mag = {rng.randint(5, 40)}
+| Spread = {rng.uniform(0.5, 5):.1f}
+| Recoil = {rng.uniform(0.5, 10):.1f}
+| Durability = {rng.randint(500, 3000)}
+| Weight = {rng.randint(2, 15)}
+}}}}
+
+{_lore(rng, 3)}
+
+==Available Attachments==
+The weapon can accept the following [[Attachments|attachment]] types:
+
+{chr(10).join(f'{chr(0x2022)} {link}' for link in rng.sample(_ATTACHMENT_LINKS, rng.randint(1, 4)))}
+
+== Trivia ==
+{_lore(rng, 2)}
+"""
+
+
+def _weapon_infobox(rng: random.Random, name: str, revision: int) -> str:
+    return f"""{{{{Weapon Infobox
+| title = {name}
+| Type = [[{rng.choice(_WEAPON_TYPES)}]]
+| Ammo = [[{rng.choice(_CALIBERS)}]]
+| Damage = {rng.randint(20, 200) + revision}
+| RPM = {rng.randint(60, 900)}
+| Mag = {rng.randint(5, 40)}
+| Spread = {rng.uniform(0.5, 5):.1f}
+| Recoil = {rng.uniform(0.5, 10):.1f}
+| Durability = {rng.randint(500, 3000)}
+| Weight = {rng.randint(2, 15)}
+}}}}
+
+{_lore(rng, 4)}
+"""
+
+
+def _oil_item(rng: random.Random, name: str, revision: int) -> str:
+    return f"""{{{{Item Infobox
+| kind = oil
+| image = {name}.png
+| GridSize = 1x1
+| Dmg = {_signed(rng, -20, 30 + revision, percent=True)}
+| Recoil = {_signed(rng, -50, 50, percent=True)}
+| RldSpeed = {_signed(rng, -10, 40, percent=True)}
+| SellVal = {rng.randint(100, 900)}
+}}}}
+
+{_lore(rng, 2)}
+"""
+
+
+def _oil_equipment(rng: random.Random, name: str, revision: int) -> str:
+    return f"""{{{{Equipment Infobox
+|Grid Size=1x1
+|Value= {rng.randint(100, 900)}
+|Type=[[Oil]]
+}}}}
+== Description ==
+* '''Damage: {_signed(rng, -20, 30 + revision)}'''
+* '''Recoil: {_signed(rng, -30, 30, percent=True)}'''
+
+{_lore(rng, 2)}
+"""
+
+
+def _scroll_item(rng: random.Random, name: str, revision: int) -> str:
+    return f"""{{{{Item Infobox
+| kind = scroll
+| Proc = {rng.randint(5, 50) + revision}%
+| StunArea = {rng.randint(1, 5)}m
+| SellVal = {rng.randint(500, 3000)}
+}}}}
+
+==Description==
+* Bullets have a chance to stun nearby enemies
+* {_lore(rng, 1)}
+"""
+
+
+def _scroll_equipment(rng: random.Random, name: str, revision: int) -> str:
+    return f"""{{{{Equipment Infobox
+|Grid Size=1x2
+|Value= {rng.randint(500, 3000) + revision}
+|Type=[[Scroll Enchantment]]
+}}}}
+== Description ==
+'''Elemental enchantment'''
+''{_lore(rng, 1)}''
+"""
+
+
+def _attachment_item(rng: random.Random, name: str, revision: int) -> str:
+    slot = rng.choice(sorted(_SLOT_SUBTYPES))
+    return f"""{{{{Item Infobox
+| kind = attachment
+| SubType = {_SLOT_SUBTYPES[slot]}
+| Spread = {-rng.randint(1, 4) * 0.25 - revision * 0.05:.2f}
+| CritADS = +{rng.randint(1, 20)}%
+| Speed = {_signed(rng, -10, 0, percent=True)}
+}}}}
+
+==Description==
+{_lore(rng, 1)}
+"""
+
+
+def _attachment_equipment(rng: random.Random, name: str, revision: int) -> str:
+    link = rng.choice(["[[Muzzle Attachments]]", "[[Sights]]", "[[Laser Sights]]", "[[Chamber Attachments]]"])
+    return f"""{{{{Equipment Infobox
+|title={name}
+|Type=[[Attachments]] {link}
+|CritADS=+{rng.randint(1, 20) + revision}%
+Spread {-rng.randint(1, 4) * 0.25:.2f}
+}}}}
+== Description ==
+* Damage: {_signed(rng, -10, 15, percent=True)}
+
+{_lore(rng, 1)}
+
+[[Category:Attachments]]
+"""
+
+
+def _chisel_item(rng: random.Random, name: str, revision: int) -> str:
+    return f"""{{{{Item Infobox
+| kind = chisel
+| ChamberAmmo = [[{rng.choice(_CALIBERS)}]]
+| SellVal = {1700 + revision}
+}}}}
+
+{_lore(rng, 1)}
+"""
+
+
+def _ammo_item(rng: random.Random, name: str, revision: int) -> str:
+    return f"""{{{{Item Infobox
+| kind = ammo
+| title = {name} Box
+| Base Damage = {rng.randint(20, 200) + revision}
+| Ammo Count  = 30
+}}}}
+"""
+
+
+def _caliber_weapon(rng: random.Random, name: str, revision: int) -> str:
+    rows = "\n".join(
+        f"|-\n|style=\"text-align: left;|[[{caliber}]]||{rng.randint(40, 200)}||×{rng.choice([1, 1, 8])}"
+        f"||{rng.randint(1, 5)}||{rng.randint(1, 10)}"
+        for caliber in _CALIBERS
+    )
+    return _weapon_item(rng, name, revision) + f"""
+== Caliber Modding ==
+{{| class="wikitable"
+!Caliber!!Damage!!Projectiles!!Spread!!Recoil
+{rows}
+|}}
+"""
+
+
+# Item kind -> format -> template, and the page title prefix per kind
+_TEMPLATES: Dict[str, Dict[str, Callable[[random.Random, str, int], str]]] = {
+    "weapon": {"item": _weapon_item, "weapon": _weapon_infobox},
+    "oil": {"item": _oil_item, "equipment": _oil_equipment},
+    "scroll": {"item": _scroll_item, "equipment": _scroll_equipment},
+    "attachment": {"item": _attachment_item, "equipment": _attachment_equipment},
+    "chisel": {"item": _chisel_item},
+    "ammo": {"item": _ammo_item},
+}
+_TITLES = {
+    "weapon": "Synthetic Gun {}",
+    "oil": "Synthetic Oil {}",
+    "scroll": "Scroll of Synthetic {}",
+    "attachment": "Synthetic Attachment {}",
+    "chisel": "Chamber Chisel (Synthetic {})",
+    "ammo": "Synthetic Caliber {}",
+}
+
+
+def _filler_page(rng: random.Random, index: int) -> tuple:
+    roll = rng.random()
+    if roll < 0.1:
+        return f"Category:Synthetic {index}", f"[[Category:Items]]\n{_lore(rng, 1)}"
+    if roll < 0.2:
+        return f"Synthetic Redirect {index}", f"#REDIRECT [[Synthetic Lore {index - 1}]]"
+    return f"Synthetic Lore {index}", _lore(rng, rng.randint(3, 12))
+
+
+# ---------------------------------------------------------------------------
+# Writer
+# ---------------------------------------------------------------------------
+
+
+def _write_page(f, page_id: int, title: str, texts: Sequence[str]) -> None:
+    f.write(f"  <page>\n    <title>{escape(title)}</title>\n    <ns>0</ns>\n    <id>{page_id}</id>\n")
+    for number, text in enumerate(texts):
+        f.write(
+            f"    <revision>\n      <id>{page_id * 100 + number}</id>\n"
+            f"      <timestamp>2026-01-{1 + number % 28:02d}T00:00:00Z</timestamp>\n"
+            f"      <text bytes=\"{len(text.encode('utf-8'))}\" xml:space=\"preserve\">{escape(text)}</text>\n"
+            f"    </revision>\n"
+        )
+    f.write("  </page>\n")
+
+
+def generate_dump(
+    path: str,
+    pages: int = 5000,
+    revisions: int = 1,
+    item_ratio: float = 0.4,
+    formats: Sequence[str] = FORMATS,
+    seed: int = 0,
+) -> Dict[str, int]:
+    """Write a synthetic dump to ``path``.
+
+    Args:
+        path: Output XML file.
+        pages: Number of ``<page>`` elements.
+        revisions: Revisions per page (at least 1).
+        item_ratio: Fraction of pages that are item pages (0 to 1).
+        formats: Infobox formats to generate, a subset of :data:`FORMATS`.
+        seed: Random seed; equal arguments give byte-identical dumps.
+
+    Returns:
+        ``{"pages", "item_pages", "revisions", "bytes"}`` for the dump written.
+    """
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        raise ValueError(f"Unknown infobox formats: {sorted(unknown)} (expected {FORMATS})")
+    kinds: List[tuple] = [
+        (kind, template)
+        for kind, by_format in _TEMPLATES.items()
+        for fmt, template in by_format.items()
+        if fmt in formats
+    ]
+    if not kinds and item_ratio > 0:
+        raise ValueError("No item kinds for the requested formats")
+
+    rng = random.Random(seed)
+    revisions = max(1, revisions)
+    item_pages = 0
+    caliber_table_written = False
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f'<mediawiki xmlns="{_NAMESPACE}" version="0.11" xml:lang="en">\n')
+        f.write("  <siteinfo>\n    <sitename>Synthetic SULFUR Wiki</sitename>\n  </siteinfo>\n")
+        for index in range(pages):
+            if kinds and rng.random() < item_ratio:
+                kind, template = rng.choice(kinds)
+                if kind == "weapon" and template is _weapon_item and not caliber_table_written:
+                    template, caliber_table_written = _caliber_weapon, True
+                title = _TITLES[kind].format(index)
+                texts = [template(rng, title, number) for number in range(revisions)]
+                item_pages += 1
+            else:
+                title, text = _filler_page(rng, index)
+                texts = [text] * revisions
+            _write_page(f, index + 1, title, texts)
+        f.write("</mediawiki>\n")
+        size = f.tell()
+
+    return {"pages": pages, "item_pages": item_pages, "revisions": pages * revisions, "bytes": size}
+
+
+def add_dump_arguments(parser: argparse.ArgumentParser) -> None:
+    """Dump-shape options shared with :mod:`benchmarks.run`."""
+    parser.add_argument("--pages", type=int, default=5000, help="Number of pages")
+    parser.add_argument("--revisions", type=int, default=1, help="Revisions per page")
+    parser.add_argument("--item-ratio", type=float, default=0.4, help="Fraction of item pages")
+    parser.add_argument("--formats", default=",".join(FORMATS),
+                        help=f"Comma-separated infobox formats ({', '.join(FORMATS)})")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic SULFUR wiki dump")
+    parser.add_argument("output", help="Output XML path")
+    add_dump_arguments(parser)
+    args = parser.parse_args()
+
+    stats = generate_dump(args.output, args.pages, args.revisions, args.item_ratio,
+                          args.formats.split(","), args.seed)
+    print(f"Wrote {stats['pages']} pages ({stats['item_pages']} items, {stats['revisions']} revisions, "
+          f"{stats['bytes']:,} bytes) -> {args.output}")
@@ -4,33 +4,26 @@ Parse SULFUR wiki XML dump to extract weapon attachment compatibility.
 
 This script reads the MediaWiki XML dump and extracts the "Available Attachments"
 section for each weapon page, mapping weapons to their compatible attachment types.
+It falls back to the latest revision that still has the section (for
+history dumps).
+
+Thin wrapper around scripts/attachment_views.py, which builds this view
+together with the other attachment compatibility views in one pass (also
+available as ``update_all --attachment-views DIR``). Run from the repository
+root.
 """
 
 import json
-import re
 from typing import Dict, List
 from pathlib import Path
 
-
-# Mapping from wiki terms to attachment type IDs
-ATTACHMENT_MAPPING = {
-    'muzzle attachments': 'muzzle',
-    'muzzle attachment': 'muzzle',
-    'muzzle': 'muzzle',
-    'sight': 'sight',
-    'sights': 'sight',
-    'laser sight': 'laser',
-    'laser sights': 'laser',
-    'laser': 'laser',
-    'gun crank': 'chamber',
-    'chamber attachments': 'chamber',
-    'chamber attachment': 'chamber',
-    'chamber': 'chamber',
-    'chamber chisel': 'chisel',
-    'chamber chisels': 'chisel',
-    'chisel': 'chisel',
-    'insurance': 'insurance',
-}
+from scripts.attachment_views import (
+    COMPATIBILITY_VIEW,
+    AttachmentViews,
+    attachment_slot_types,
+    extract_attachments_section,
+)
+from scripts.wiki_parser import PARSE_STATS, iterate_pages
 
 
 def extract_weapon_name_from_title(title: str) -> str:
@@ -48,48 +41,19 @@ def parse_attachments_section(text: str) -> List[str]:
     Returns:
         List of attachment types found for this weapon
     """
-    attachments_set = set()
-
-    # Find the "Available Attachments" section
-    # Match both == and === level headers (allow optional spaces around header)
-    attachment_pattern = r'={2,3}\s*Available Attachments\s*={2,3}(.*?)(?:={2,}[^=]|$)'
-    match = re.search(attachment_pattern, text, re.DOTALL | re.IGNORECASE)
-
-    if not match:
+    section = extract_attachments_section(text)
+    if section is None:
         return []
-
-    section_text = match.group(1)
-
-    # Extract all wiki links in the section
-    # Pattern matches [[Link]] or [[Link|Display Text]]
-    link_pattern = r'\[\[([^\]|]+)(?:\|[^\]]+)?\]\]'
-    links = re.findall(link_pattern, section_text)
-
-    for link in links:
-        link_lower = link.strip().lower()
-        if link_lower in ATTACHMENT_MAPPING:
-            attachments_set.add(ATTACHMENT_MAPPING[link_lower])
-
-    # Also extract plain text bullet points (for newer wiki format)
-    # Look for lines starting with bullet (• or *) followed by attachment name
-    bullet_pattern = r'[•\*]\s*([^\n\r]+)'
-    bullet_items = re.findall(bullet_pattern, section_text)
-
-    for item in bullet_items:
-        item_lower = item.strip().lower()
-        if item_lower in ATTACHMENT_MAPPING:
-            attachments_set.add(ATTACHMENT_MAPPING[item_lower])
-
-    return sorted(list(attachments_set))
+    return attachment_slot_types(section)
 
 
 def parse_wiki_xml_simple(xml_path: str) -> Dict[str, List[str]]:
     """
-    Parse MediaWiki XML dump using simple text processing.
-    This is more robust than XML parsing for malformed XML.
+    Parse MediaWiki XML dump, streaming one page at a time.
 
-    For each page, extracts data from the LATEST revision only
-    (the last <revision> block in each <page> block).
+    For each page, extracts data from the most recent revision that still
+    has an "Available Attachments" section (newer revisions may have lost
+    it). Memory use does not grow with the size of the dump.
 
     Args:
         xml_path: Path to the MediaWiki XML dump file
@@ -97,68 +61,19 @@ def parse_wiki_xml_simple(xml_path: str) -> Dict[str, List[str]]:
     Returns:
         Dictionary mapping weapon names to lists of compatible attachment types
     """
-    weapon_attachments: Dict[str, List[str]] = {}
-
     print(f"Reading XML file: {xml_path}")
-    print("This may take a moment for large files...")
-
-    with open(xml_path, 'r', encoding='utf-8', errors='ignore') as f:
-        content = f.read()
-
-    print(f"File loaded ({len(content):,} characters)")
-    print("Parsing pages...")
-
-    # Split into pages using <page> tags
-    # Use non-greedy matching to get individual pages
-    page_pattern = r'<page>(.*?)</page>'
-    pages = re.findall(page_pattern, content, re.DOTALL)
-
-    print(f"Found {len(pages)} pages")
-
-    weapons_found = 0
-
-    for i, page_content in enumerate(pages):
-        # Extract title
-        title_match = re.search(r'<title>(.*?)</title>', page_content)
-        if not title_match:
-            continue
-
-        weapon_name = title_match.group(1)
-
-        # Find all revisions in this page
-        revision_pattern = r'<revision>(.*?)</revision>'
-        revisions = re.findall(revision_pattern, page_content, re.DOTALL)
-
-        if not revisions:
-            continue
-
-        # Find the most recent revision that has "Available Attachments"
-        # Iterate backwards through revisions (most recent first)
-        page_text = None
-        for rev in reversed(revisions):
-            text_match = re.search(r'<text[^>]*>(.*?)</text>', rev, re.DOTALL)
-            if text_match:
-                candidate_text = text_match.group(1)
-                if 'Available Attachments' in candidate_text:
-                    page_text = candidate_text
-                    break
-
-        if page_text is None:
-            continue
-
-        # Parse attachments
-        attachments = parse_attachments_section(page_text)
 
-        if attachments:
-            weapon_attachments[weapon_name] = attachments
-            weapons_found += 1
-            print(f"  Found: {weapon_name} -> {attachments}")
+    pages_before = PARSE_STATS["pages"]
 
-        # Progress indicator
-        if (i + 1) % 1000 == 0:
-            print(f"  Processed {i + 1:,} pages, found {weapons_found} weapons with attachments...")
+    collector = AttachmentViews()
+    for title, wikitext in iterate_pages(xml_path, on_revision=collector.add_revision):
+        collector.add_page(title, wikitext)
+    weapon_attachments = collector.views()[COMPATIBILITY_VIEW]
+    weapons_found = len(weapon_attachments)
+    for weapon_name, attachments in weapon_attachments.items():
+        print(f"  Found: {weapon_name} -> {attachments}")
 
-    print(f"\nCompleted! Processed {len(pages):,} total pages")
+    print(f"\nCompleted! Processed {PARSE_STATS['pages'] - pages_before:,} total pages")
     print(f"Found {weapons_found} weapons with attachment data")
 
     return weapon_attachments
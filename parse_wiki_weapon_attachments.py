@@ -6,83 +6,32 @@ For each weapon page, finds the "==Available Attachments==" section
 and extracts all attachment names listed in that section.
 
 Output: weapon_attachments_from_wiki.json
+
+The section is parsed by scripts/attachment_views.py, which also builds this
+view during ``update_all --attachment-views DIR``. Run from the repository root.
 """
 
 import json
 import os
-import re
-import xml.etree.ElementTree as ET
-from collections import defaultdict
-from pathlib import Path
+
+from scripts.attachment_views import FROM_WIKI_VIEW, AttachmentViews, attachment_names, extract_attachments_section
+from scripts.wiki_parser import iterate_pages
 
 # Wiki dump path — override via environment variables
 WIKI_DUMP_PATH = os.environ.get('SULFUR_DUMP_PATH', "/mnt/z/Claude/sulfurdump/sulfur.wiki.gg-20251224-wikidump/sulfur.wiki.gg-20251224-history-fixed.xml")
 OUTPUT_PATH = os.environ.get('SULFUR_OUTPUT_PATH', "weapon_attachments_from_wiki.json")
 WEAPONS_JSON_PATH = os.environ.get('SULFUR_WEAPONS_JSON', "public/data/weapons.json")
 
-# MediaWiki namespace
-NS = {'mw': 'http://www.mediawiki.org/xml/export-0.11/'}
-
-
 def extract_attachments_from_wikitext(wikitext, weapon_name):
     """
     Extract attachment names from the Available Attachments section.
 
     Returns list of attachment names.
     """
-    attachments = []
-
-    # Find the "Available Attachments" section
-    match = re.search(r'==Available Attachments==\s*(.*?)(?:\n==|$)', wikitext, re.DOTALL | re.IGNORECASE)
-
-    if not match:
-        return attachments
-
-    section_text = match.group(1)
-
-    # Extract wikilinks: [[Attachment Name]] or [[Attachment Name|Display Text]]
-    # Also extract plain text list items
-
-    # Method 1: Extract wikilinks
-    wikilink_pattern = r'\[\[([^\]|]+)(?:\|[^\]]+)?\]\]'
-    for link_match in re.finditer(wikilink_pattern, section_text):
-        attachment = link_match.group(1).strip()
-        # Skip category links and file links
-        if not attachment.startswith(('Category:', 'File:', 'Image:')):
-            # Remove any namespace prefixes - but keep the full name for now
-            if attachment and attachment not in attachments:
-                attachments.append(attachment)
-
-    # Method 2: Extract from bullet lists (lines starting with * or •)
-    lines = section_text.split('\n')
-    for line in lines:
-        line = line.strip()
-        # Check for bullet points (*, •, or other unicode bullets)
-        if line.startswith(('*', '•', '·', '-')):
-            # Remove the bullet
-            content = line.lstrip('*•·- ').strip()
-
-            # If the line contains wikilinks, extract them
-            if '[[' in content:
-                for link_match in re.finditer(wikilink_pattern, content):
-                    attachment = link_match.group(1).strip()
-                    if not attachment.startswith(('Category:', 'File:', 'Image:')):
-                        if attachment and attachment not in attachments:
-                            attachments.append(attachment)
-            else:
-                # Plain text - remove any markup
-                content = re.sub(r"'''|''", '', content)
-                content = content.strip()
-
-                # Split by common separators if multiple attachments per line
-                for part in re.split(r'[,;]', content):
-                    part = part.strip()
-                    if part and part not in attachments and len(part) > 2:
-                        # Filter out common non-attachment words
-                        if part.lower() not in ['none', 'n/a', 'tba', 'all', 'any']:
-                            attachments.append(part)
-
-    return attachments
+    section = extract_attachments_section(wikitext)
+    if section is None:
+        return []
+    return attachment_names(section)
 
 
 def parse_wiki_dump():
@@ -93,70 +42,13 @@ def parse_wiki_dump():
     """
     print(f"Parsing wiki dump: {WIKI_DUMP_PATH}")
 
-    weapon_attachments = {}
-    weapon_pages_found = 0
-    pages_with_attachments = 0
-
-    # Parse XML iteratively to handle large files
-    context = ET.iterparse(WIKI_DUMP_PATH, events=('start', 'end'))
-    context = iter(context)
-    event, root = next(context)
-
-    for event, elem in context:
-        if event == 'end' and elem.tag == '{http://www.mediawiki.org/xml/export-0.11/}page':
-            # Extract page title
-            title_elem = elem.find('mw:title', NS)
-            if title_elem is None:
-                elem.clear()
-                continue
-
-            title = title_elem.text
-
-            # Skip non-weapon pages (talk pages, templates, categories, etc.)
-            if not title or ':' in title:
-                elem.clear()
-                continue
-
-            # Get the FIRST (most recent) revision only
-            # Wiki dumps have revisions in reverse chronological order (newest first)
-            revision = elem.find('mw:revision', NS)
-            if revision is None:
-                elem.clear()
-                continue
-
-            text_elem = revision.find('mw:text', NS)
-            if text_elem is None or text_elem.text is None:
-                elem.clear()
-                continue
-
-            wikitext = text_elem.text
-
-            # Check if this looks like a weapon page (has Weapon Infobox or Available Attachments)
-            is_weapon_page = (
-                '{{Weapon Infobox' in wikitext or
-                '{{Item Infobox' in wikitext and '| kind = weapon' in wikitext.lower() or
-                '==Available Attachments==' in wikitext
-            )
-
-            if is_weapon_page:
-                weapon_pages_found += 1
-
-                # Extract attachments
-                attachments = extract_attachments_from_wikitext(wikitext, title)
-
-                if attachments:
-                    weapon_attachments[title] = attachments
-                    pages_with_attachments += 1
-                    print(f"  Found {len(attachments)} attachments for: {title}")
-
-            # Clear element to save memory
-            elem.clear()
-
-    root.clear()
+    collector = AttachmentViews()
+    for title, wikitext in iterate_pages(WIKI_DUMP_PATH):
+        collector.add_page(title, wikitext)
+    weapon_attachments = collector.views()[FROM_WIKI_VIEW]
 
     print(f"\nParsing complete!")
-    print(f"  Total weapon pages found: {weapon_pages_found}")
-    print(f"  Pages with attachment data: {pages_with_attachments}")
+    print(f"  Pages with attachment data: {len(weapon_attachments)}")
 
     return weapon_attachments
 
@@ -0,0 +1,301 @@
+"""Weapon attachment compatibility views from the wiki's Available Attachments sections.
+
+Three JSON views of the same sections are kept for tooling outside the
+frontend (the frontend uses weapons.json and weapon-attachments.json):
+
+- ``weapon_attachments_compatibility.json``: weapon -> sorted slot ids
+  (``muzzle``, ``sight``, ...) named by the section's links and bullets,
+  from the latest revision that still has the section (in history dumps a
+  newer revision may have lost it).
+- ``weapon_attachments_from_wiki.json``: weapon -> every attachment or type
+  name listed in the section, in page order.
+- ``weapon_specific_attachments.json``: weapon -> attachment names, with
+  each linked type (``[[Sights]]``) expanded to the pages in that category.
+  Only pages in ``[[Category:Weapons]]`` are included.
+
+An :class:`AttachmentViews` collector builds all three from one pass over
+the dump: ``update_all`` feeds it the pages and revisions ``extract_weapons``
+already reads, and :func:`extract_attachment_views` runs a pass of its own.
+The section is found with :func:`extract_attachments_section`, which the
+weapon extractor uses for ``allowedAttachments`` as well.
+"""
+
+import os
+import re
+import sys
+from typing import Dict, List, Optional
+
+from scripts.data_io import OutputWriter, write_json
+from scripts.wiki_parser import iterate_pages
+
+COMPATIBILITY_VIEW = "weapon_attachments_compatibility.json"
+FROM_WIKI_VIEW = "weapon_attachments_from_wiki.json"
+SPECIFIC_VIEW = "weapon_specific_attachments.json"
+
+# Lowercased wiki link/bullet text -> slot id (compatibility view)
+ATTACHMENT_MAPPING: Dict[str, str] = {
+    'muzzle attachments': 'muzzle',
+    'muzzle attachment': 'muzzle',
+    'muzzle': 'muzzle',
+    'sight': 'sight',
+    'sights': 'sight',
+    'laser sight': 'laser',
+    'laser sights': 'laser',
+    'laser': 'laser',
+    'gun crank': 'chamber',
+    'chamber attachments': 'chamber',
+    'chamber attachment': 'chamber',
+    'chamber': 'chamber',
+    'chamber chisel': 'chisel',
+    'chamber chisels': 'chisel',
+    'chisel': 'chisel',
+    'insurance': 'insurance',
+}
+
+# Categories that hold individual attachment pages (specific view)
+ATTACHMENT_CATEGORIES = [
+    "Muzzle Attachments",
+    "Sights",
+    "Laser Sights",
+    "Chamber Attachments",
+    "Chamber Chisels",
+]
+
+# Singular/variant link targets -> category name
+_TYPE_ALIASES: Dict[str, str] = {
+    "Sight": "Sights",
+    "Chamber Chisel": "Chamber Chisels",
+    "Muzzle Attachment": "Muzzle Attachments",
+    "Laser Sight": "Laser Sights",
+    "Chamber Attachment": "Chamber Attachments",
+}
+
+# Stops only at the next level-2 heading, so old-format ===Category===
+# sub-sections are part of the section
+_SECTION_PATTERN = re.compile(
+    r'={2,3}\s*Available Attachments\s*={2,3}\s*(.*?)(?=\n==[^=]|\Z)', re.DOTALL | re.IGNORECASE
+)
+_WIKILINK_PATTERN = re.compile(r'\[\[([^\]|]+)(?:\|[^\]]*)?\]\]')
+_CATEGORY_PATTERN = re.compile(r'\[\[Category:([^\]]+)\]\]')
+
+# Not attachment names when listed as plain text
+_PLAIN_TEXT_STOPWORDS = {'none', 'n/a', 'tba', 'all', 'any'}
+
+
+# ---------------------------------------------------------------------------
+# Section parsing
+# ---------------------------------------------------------------------------
+
+
+def extract_attachments_section(wikitext: str) -> Optional[str]:
+    """
+    Extract the ==Available Attachments== section including all === sub-sections.
+
+    Unlike extract_section from wiki_parser, this stops only at the next true
+    == (level-2) heading, not at === (level-3) sub-headings.
+
+    Args:
+        wikitext: Full page wikitext.
+
+    Returns:
+        Section content string, or None if the heading is absent.
+    """
+    # Cheap check first: most pages have no such section
+    if 'ttachments' not in wikitext:
+        return None
+    match = _SECTION_PATTERN.search(wikitext)
+    if match:
+        return match.group(1).strip()
+    return None
+
+
+def parse_wiki_links(text: str) -> List[str]:
+    """Link targets of ``[[Link]]`` / ``[[Link|Display Text]]`` in ``text``."""
+    return _WIKILINK_PATTERN.findall(text)
+
+
+def extract_categories(text: str) -> List[str]:
+    """Category names from ``[[Category:Name]]`` tags in page text."""
+    return _CATEGORY_PATTERN.findall(text)
+
+
+def attachment_slot_types(section: str) -> List[str]:
+    """Sorted slot ids named by the section's links and bullet items."""
+    slots = set()
+    for link in parse_wiki_links(section):
+        slot = ATTACHMENT_MAPPING.get(link.strip().lower())
+        if slot:
+            slots.add(slot)
+    for item in re.findall(r'[•\*]\s*([^\n\r]+)', section):
+        slot = ATTACHMENT_MAPPING.get(item.strip().lower())
+        if slot:
+            slots.add(slot)
+    return sorted(slots)
+
+
+def attachment_names(section: str) -> List[str]:
+    """Every attachment or type name in the section, in page order.
+
+    Linked names come first, then plain-text bullet items (split on ``,``
+    and ``;``). Category and file links are skipped.
+    """
+    names: List[str] = []
+    for link in parse_wiki_links(section):
+        name = link.strip()
+        if name and not name.startswith(('Category:', 'File:', 'Image:')) and name not in names:
+            names.append(name)
+
+    for line in section.split('\n'):
+        line = line.strip()
+        if not line.startswith(('*', '•', '·', '-')):
+            continue
+        content = line.lstrip('*•·- ').strip()
+        if '[[' in content:
+            # Already collected with the section's links
+            continue
+        content = re.sub(r"'''|''", '', content).strip()
+        for part in re.split(r'[,;]', content):
+            part = part.strip()
+            if len(part) > 2 and part not in names and part.lower() not in _PLAIN_TEXT_STOPWORDS:
+                names.append(part)
+    return names
+
+
+def attachment_type_links(section: str) -> List[str]:
+    """Link targets in the section, without the generic ``Attachments`` link."""
+    return [link for link in parse_wiki_links(section) if link != "Attachments"]
+
+
+def normalize_attachment_type(name: str) -> str:
+    """Map a linked attachment type to its category name (``"Sight"`` -> ``"Sights"``)."""
+    return _TYPE_ALIASES.get(name, name)
+
+
+def resolve_specific_attachments(
+    attachment_categories: Dict[str, List[str]],
+    weapon_attachment_types: Dict[str, List[str]],
+) -> Dict[str, List[str]]:
+    """Expand each weapon's attachment types into attachment names.
+
+    Args:
+        attachment_categories: Category name -> attachment page titles.
+        weapon_attachment_types: Weapon title -> linked attachment types.
+
+    Returns:
+        Weapon title -> sorted, de-duplicated attachment names. A type that
+        is not a known category (e.g. a link to a single attachment such as
+        ``Gun Crank``) is kept as a name.
+    """
+    result: Dict[str, List[str]] = {}
+    for weapon, attachment_types in weapon_attachment_types.items():
+        names = set()
+        for attachment_type in attachment_types:
+            normalized = normalize_attachment_type(attachment_type)
+            if normalized in attachment_categories:
+                names.update(attachment_categories[normalized])
+            else:
+                names.add(attachment_type)
+        result[weapon] = sorted(names)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Collector
+# ---------------------------------------------------------------------------
+
+
+class AttachmentViews:
+    """Builds the three views from pages fed to :meth:`add_page`.
+
+    The compatibility view comes from :meth:`add_revision`, which sees every
+    revision (pass it as ``on_revision`` to
+    :func:`scripts.wiki_parser.iterate_pages`). Weapon sections are parsed as
+    pages arrive; the specific view is resolved in :meth:`views`, once every
+    attachment category is known.
+    """
+
+    def __init__(self):
+        self.slot_types: Dict[str, List[str]] = {}
+        self.names: Dict[str, List[str]] = {}
+        self.type_links: Dict[str, List[str]] = {}
+        self.attachment_categories: Dict[str, List[str]] = {}
+
+    def add_page(self, title: str, wikitext: str) -> None:
+        categories = extract_categories(wikitext) if '[[Category:' in wikitext else []
+        for category in ATTACHMENT_CATEGORIES:
+            if category in categories:
+                self.attachment_categories.setdefault(category, []).append(title)
+                break
+
+        section = extract_attachments_section(wikitext)
+        if section is None:
+            return
+        names = attachment_names(section)
+        if names:
+            self.names[title] = names
+        if "Weapons" in categories:
+            type_links = attachment_type_links(section)
+            if type_links:
+                self.type_links[title] = type_links
+
+    def add_revision(self, title: str, wikitext: str) -> None:
+        """Take the slot ids of a revision that has the section; revisions arrive oldest first."""
+        if 'Available Attachments' not in wikitext:
+            return
+        section = extract_attachments_section(wikitext)
+        slot_types = attachment_slot_types(section) if section is not None else []
+        # The latest revision with the section decides, even when it lists no slots
+        if slot_types:
+            self.slot_types[title] = slot_types
+        else:
+            self.slot_types.pop(title, None)
+
+    def views(self) -> Dict[str, Dict[str, List[str]]]:
+        """Output filename -> view."""
+        return {
+            COMPATIBILITY_VIEW: dict(sorted(self.slot_types.items())),
+            FROM_WIKI_VIEW: self.names,
+            SPECIFIC_VIEW: resolve_specific_attachments(self.attachment_categories, self.type_links),
+        }
+
+    def write(self, output_dir: str, writer: Optional[OutputWriter] = None) -> Dict[str, Dict[str, List[str]]]:
+        """Write every view into ``output_dir`` and return them."""
+        os.makedirs(output_dir, exist_ok=True)
+        views = self.views()
+        for filename, view in views.items():
+            write_json(os.path.join(output_dir, filename), view, writer)
+        print(f"Wrote attachment views for {len(self.slot_types)} / {len(self.names)} / "
+              f"{len(views[SPECIFIC_VIEW])} weapons -> {output_dir}")
+        return views
+
+
+def extract_attachment_views(
+    dump_path: str,
+    output_dir: str,
+    writer: Optional[OutputWriter] = None,
+) -> Dict[str, Dict[str, List[str]]]:
+    """Build all three views in one pass over the dump and write them to ``output_dir``.
+
+    Args:
+        dump_path: Path to the MediaWiki XML dump file.
+        output_dir: Directory for the three view files.
+        writer: Optional OutputWriter; if given, the files are written on its
+            thread pool (call ``writer.flush()`` before reading them back).
+
+    Returns:
+        Output filename -> view.
+    """
+    collector = AttachmentViews()
+    for title, wikitext in iterate_pages(dump_path, on_revision=collector.add_revision):
+        collector.add_page(title, wikitext)
+    return collector.write(output_dir, writer)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python3 -m scripts.attachment_views <dump_path> [output_dir]")
+        sys.exit(1)
+
+    dump = sys.argv[1]
+    out = sys.argv[2] if len(sys.argv) > 2 else "."
+    extract_attachment_views(dump, out)
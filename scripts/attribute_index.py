@@ -0,0 +1,119 @@
+"""Inverted attribute index: which items modify a given stat.
+
+Answers "which oils, scrolls or attachments touch ``BulletPenetrations``"
+without scanning every ``modifiers`` list. Output (``attribute-index.json``)::
+
+    {
+      "Damage": {
+        "PercentAdd": [{"kind": "oil", "id": "Complicated_Oil", "value": 0.3}, ...],
+        "Percent": [{"kind": "attachment", "id": "Haukland_Silencer", "value": -0.1}, ...]
+      },
+      ...
+    }
+
+Stats are sorted by name; modifier types follow the search index labels
+(Flat, PercentAdd, PercentMult for oils and scrolls, Flat or Percent for
+attachments). Each list is sorted by magnitude, largest first, with ties in
+file order (oils, scrolls, then attachments by slot).
+"""
+
+import os
+import sys
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from scripts.data_io import write_json
+from scripts.json_backend import load_json
+from scripts.search_index import item_modifiers, load_documents
+
+ATTRIBUTE_INDEX_FILENAME = "attribute-index.json"
+
+# Order of the modifier types within a stat
+_TYPE_ORDER = ("Flat", "PercentAdd", "PercentMult", "Percent")
+
+
+def build_attribute_index(documents: Iterable[Tuple[str, Dict]]) -> Dict[str, Dict[str, List[Dict]]]:
+    """Map stat -> modifier type -> items with their values, from (kind, item) pairs."""
+    index: Dict[str, Dict[str, List[Dict]]] = {}
+    for kind, item in documents:
+        for stat, label, value in item_modifiers(kind, item):
+            index.setdefault(stat, {}).setdefault(label, []).append({"kind": kind, "id": item["id"], "value": value})
+
+    def _type_key(label: str) -> Tuple[int, str]:
+        return (_TYPE_ORDER.index(label) if label in _TYPE_ORDER else len(_TYPE_ORDER), label)
+
+    return {
+        stat: {
+            label: sorted(entries, key=lambda entry: -abs(entry["value"]))
+            for label, entries in sorted(by_type.items(), key=lambda pair: _type_key(pair[0]))
+        }
+        for stat, by_type in sorted(index.items())
+    }
+
+
+def modifiers_of(
+    index: Dict[str, Dict[str, List[Dict]]],
+    stat: str,
+    mod_type: Optional[str] = None,
+    kind: Optional[str] = None,
+) -> List[Dict]:
+    """Entries modifying ``stat``, largest magnitude first.
+
+    Args:
+        index: Output of :func:`build_attribute_index`.
+        stat: Attribute name, e.g. ``BulletPenetrations``.
+        mod_type: Restrict to one modifier type.
+        kind: Restrict to ``oil``, ``scroll`` or ``attachment``.
+
+    Returns:
+        ``{"kind", "id", "value", "modType"}`` dicts.
+    """
+    entries = [
+        {**entry, "modType": label}
+        for label, items in index.get(stat, {}).items()
+        if mod_type is None or label == mod_type
+        for entry in items
+        if kind is None or entry["kind"] == kind
+    ]
+    entries.sort(key=lambda entry: -abs(entry["value"]))
+    return entries
+
+
+def candidate_ids(index: Dict[str, Dict[str, List[Dict]]], stats: Iterable[str], kind: Optional[str] = None) -> Set[str]:
+    """Ids of the items that modify at least one of ``stats``."""
+    return {entry["id"] for stat in stats for entry in modifiers_of(index, stat, kind=kind)}
+
+
+def load_attribute_index(data_dir: str) -> Dict[str, Dict[str, List[Dict]]]:
+    return load_json(os.path.join(data_dir, ATTRIBUTE_INDEX_FILENAME))
+
+
+def write_attribute_index(data_dir: str, output_path: Optional[str] = None) -> Dict[str, Dict[str, List[Dict]]]:
+    """Build the index from the data files in ``data_dir`` and write it.
+
+    Args:
+        data_dir: Directory containing the extracted data files.
+        output_path: Destination (default: ``data_dir/attribute-index.json``).
+
+    Returns:
+        The index that was written.
+    """
+    index = build_attribute_index(load_documents(data_dir))
+    output_path = output_path or os.path.join(data_dir, ATTRIBUTE_INDEX_FILENAME)
+    write_json(output_path, index)
+
+    entries = sum(len(items) for by_type in index.values() for items in by_type.values())
+    print(f"Indexed {entries} modifiers over {len(index)} stats -> {output_path}")
+    return index
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python3 -m scripts.attribute_index <data_dir> [stat [modType]]")
+        sys.exit(1)
+
+    if len(sys.argv) > 2:
+        stat_index = load_attribute_index(sys.argv[1])
+        for entry in modifiers_of(stat_index, sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None):
+            print(f"  {entry['value']:>+10g} {entry['modType']:<12} {entry['kind']:<10} {entry['id']}")
+    else:
+        write_attribute_index(sys.argv[1])
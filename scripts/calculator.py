@@ -0,0 +1,587 @@
+"""Python port of the stat stacking rules in ``src/utils/calculator.js``.
+
+Two entry points are provided:
+
+* :func:`calculate_modified_stats` mirrors ``calculateModifiedStats`` in the
+  frontend and returns the same list of stat rows.
+* :class:`IncrementalBuild` keeps per-stage partial sums for a single weapon so
+  that swapping one oil, scroll or attachment only re-evaluates the attributes
+  that item touches. Interactive tuning and local-search optimizers use it.
+
+Stacking order per stat (same as the frontend):
+
+0. Chamber chisel caliber conversion rewrites Damage/ProjectileCount/Spread/Recoil.
+1. ConvertWpn scroll modifiers: Flat -> PercentAdd -> PercentMult.
+2. Attachment modifiers: flat values, then compounding percentages.
+3. Oil (and non-convert scroll) modifiers: Flat -> PercentAdd -> PercentMult,
+   using the scroll/attachment-modified value as the percentage base.
+4. Damage gains ``perBulletDamage * ProjectileCount`` from bypassPercentages scrolls.
+"""
+
+import math
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# StatModType values used by the wiki data
+FLAT = 100
+PERCENT_ADD = 200
+PERCENT_MULT = 300
+
+MOD_TYPE_NAMES: Dict[str, int] = {
+    "Flat": FLAT,
+    "PercentAdd": PERCENT_ADD,
+    "PercentMult": PERCENT_MULT,
+}
+
+# Stats where every modifier is additive regardless of its modType
+ADDITIVE_STATS: Set[str] = {"CritChance", "ADSCritChance"}
+
+# Stats rewritten by a chamber chisel caliber conversion
+CALIBER_STATS: Tuple[str, ...] = ("Damage", "ProjectileCount", "Spread", "Recoil")
+
+
+# ---------------------------------------------------------------------------
+# Item helpers
+# ---------------------------------------------------------------------------
+
+
+def mod_type_of(mod: Dict) -> Optional[int]:
+    """Return the numeric modType of an enchantment modifier, or None if unknown."""
+    raw = mod.get("modType") or mod.get("mod_type") or mod.get("mod_type_id")
+    raw = MOD_TYPE_NAMES.get(raw, raw)
+    return raw if raw in (FLAT, PERCENT_ADD, PERCENT_MULT) else None
+
+
+def is_convert_scroll(enchantment: Optional[Dict]) -> bool:
+    """True if the enchantment's modifiers apply before attachments and oils."""
+    return bool(enchantment and (enchantment.get("specialEffects") or {}).get("ConvertWpn"))
+
+
+def is_bypass_scroll(enchantment: Optional[Dict]) -> bool:
+    """True if the enchantment adds flat per-bullet damage instead of modifiers."""
+    return bool(enchantment and (enchantment.get("specialEffects") or {}).get("bypassPercentages"))
+
+
+def chisel_caliber(attachment: Optional[Dict]) -> Optional[str]:
+    """Return the caliber a chamber chisel converts to, or None for other attachments."""
+    if not attachment:
+        return None
+    return (attachment.get("specialEffects") or {}).get("caliberConversion") or None
+
+
+def attachment_modifiers(attachment: Optional[Dict]) -> List[Tuple[str, float, bool]]:
+    """Flatten an attachment's modifiers dict into (stat, value, is_percent) tuples.
+
+    Attachment modifiers are either a bare number (flat) or
+    ``{"value": x, "type": "percent"}``.
+    """
+    if not attachment or not attachment.get("modifiers"):
+        return []
+    result = []
+    for stat, raw in attachment["modifiers"].items():
+        if isinstance(raw, dict) and "value" in raw:
+            result.append((stat, raw["value"], (raw.get("type") or "flat") == "percent"))
+        else:
+            result.append((stat, raw, False))
+    return result
+
+
+def enchantment_modifiers(enchantment: Optional[Dict]) -> List[Tuple[str, Optional[int], float]]:
+    """Flatten an enchantment's modifiers list into (stat, modType, value) tuples."""
+    if not enchantment or not enchantment.get("modifiers"):
+        return []
+    return [(mod["attribute"], mod_type_of(mod), mod["value"]) for mod in enchantment["modifiers"]]
+
+
+def round_stat(value: float) -> float:
+    """Round to two decimals the way ``Math.round(x * 100) / 100`` does."""
+    return math.floor(value * 100 + 0.5) / 100
+
+
+# ---------------------------------------------------------------------------
+# Full pipeline
+# ---------------------------------------------------------------------------
+
+
+def apply_caliber_conversion(
+    base_stats: Dict[str, float],
+    caliber: Optional[str],
+    caliber_modifiers: Dict,
+    weapon: Dict,
+) -> Dict[str, float]:
+    """Rewrite base stats for a chamber chisel conversion to ``caliber``.
+
+    Damage keeps the weapon's multiplier over its native ammo's base damage;
+    ProjectileCount, Spread and Recoil come from the caliber table.
+    """
+    calibers = caliber_modifiers.get("calibers") or {}
+    if not caliber or caliber not in calibers:
+        return base_stats
+
+    new_caliber_stats = calibers[caliber]
+    base_ammo_damage = caliber_modifiers.get("baseAmmoDamage") or {}
+
+    current_ammo = weapon.get("ammoType")
+    current_base_damage = base_ammo_damage.get(current_ammo)
+    if current_base_damage is None:
+        current_base_damage = (calibers.get(current_ammo) or {}).get("Damage")
+    multiplier = base_stats.get("Damage", 0.0) / current_base_damage if current_base_damage else 1
+
+    new_base_damage = base_ammo_damage.get(caliber)
+    if new_base_damage is None:
+        new_base_damage = new_caliber_stats.get("Damage")
+
+    converted = dict(base_stats)
+    converted["Damage"] = new_base_damage * multiplier
+    converted["ProjectileCount"] = new_caliber_stats.get("ProjectileCount")
+    converted["Spread"] = new_caliber_stats.get("Spread")
+    converted["Recoil"] = new_caliber_stats.get("Recoil")
+    return converted
+
+
+def _apply_modifier(current: float, base: float, mod_type: Optional[int], value: float, stat: str) -> float:
+    """Apply one typed modifier; crit stats are always additive."""
+    if stat in ADDITIVE_STATS:
+        return current + value
+    if mod_type == FLAT:
+        return current + value
+    if mod_type == PERCENT_ADD:
+        return current + base * value
+    if mod_type == PERCENT_MULT:
+        return current * (1 + value)
+    return current
+
+
+def _apply_typed_stage(
+    value: float,
+    mods: List[Tuple[Optional[int], float]],
+    stat: str,
+    base_mode: str = "staged",
+) -> float:
+    """Apply (modType, value) modifiers in Flat -> PercentAdd -> PercentMult order.
+
+    ``base_mode`` selects the base used by PercentAdd modifiers:
+
+    - ``"staged"``: the value after all Flat modifiers (base stats)
+    - ``"zero"``: always 0 (convert scrolls on stats absent from baseStats)
+    - ``"running"``: the current value (oils on stats absent from baseStats)
+    """
+    base = value
+    for mod_type in (FLAT, PERCENT_ADD, PERCENT_MULT):
+        if base_mode == "staged":
+            base = value
+        for m_type, m_value in mods:
+            if m_type != mod_type:
+                continue
+            if base_mode == "running":
+                base = value
+            value = _apply_modifier(value, 0.0 if base_mode == "zero" else base, m_type, m_value, stat)
+    return value
+
+
+def _apply_attachment_stage(value: float, mods: List[Tuple[float, bool]]) -> float:
+    """Apply attachment modifiers: flat values first, then compounding percentages."""
+    for m_value, is_percent in mods:
+        if not is_percent:
+            value += m_value
+    for m_value, is_percent in mods:
+        if is_percent:
+            value = value + value * m_value
+    return value
+
+
+def _stat_row(stat: str, base_value: float, value: float) -> Dict:
+    return {
+        "stat": stat,
+        "baseValue": base_value,
+        "modifiedValue": round_stat(value),
+        "change": round_stat(value - base_value),
+        "modifier": None,
+    }
+
+
+def _finish_ads_crit(rows: List[Dict], base_stats: Dict[str, float]) -> None:
+    """Fold the CritChance row into ADSCritChance (total ADS crit = crit + scope bonus)."""
+    crit_row = next((r for r in rows if r["stat"] == "CritChance"), None)
+    ads_row = next((r for r in rows if r["stat"] == "ADSCritChance"), None)
+    base_crit = crit_row["modifiedValue"] if crit_row else (base_stats.get("CritChance") or 0)
+
+    if ads_row:
+        ads_bonus = ads_row["modifiedValue"]
+        ads_row["baseValue"] = base_crit
+        ads_row["modifiedValue"] = round_stat(base_crit + ads_bonus)
+        ads_row["change"] = round_stat(ads_bonus)
+    else:
+        rows.append({
+            "stat": "ADSCritChance",
+            "baseValue": base_crit,
+            "modifiedValue": base_crit,
+            "change": 0,
+            "modifier": None,
+        })
+
+
+def calculate_modified_stats(
+    weapon: Optional[Dict],
+    attachments: Optional[List[Dict]] = None,
+    enchantments: Optional[List[Dict]] = None,
+    caliber_modifiers: Optional[Dict] = None,
+) -> Optional[List[Dict]]:
+    """Calculate modified weapon stats for a build.
+
+    Args:
+        weapon: A weapon entry from weapons.json.
+        attachments: Selected attachment entries (chisels included).
+        enchantments: Selected oils and scroll, in selection order.
+        caliber_modifiers: Contents of caliber-modifiers.json.
+
+    Returns:
+        List of ``{stat, baseValue, modifiedValue, change, modifier}`` rows in
+        the same order as the frontend, or None when there is no weapon or
+        nothing is applied.
+    """
+    if not weapon:
+        return None
+    attachment_list = [a for a in (attachments or []) if a]
+    enchantment_list = [e for e in (enchantments or []) if e]
+    if not attachment_list and not enchantment_list:
+        return None
+    caliber_modifiers = caliber_modifiers or {}
+
+    base_stats = weapon.get("baseStats") or weapon.get("base_stats") or {}
+
+    chisel = next((a for a in attachment_list if chisel_caliber(a)), None)
+    if chisel:
+        base_stats = apply_caliber_conversion(base_stats, chisel_caliber(chisel), caliber_modifiers, weapon)
+
+    convert_mods: Dict[str, List[Tuple[Optional[int], float]]] = {}
+    attach_mods: Dict[str, List[Tuple[float, bool]]] = {}
+    other_mods: Dict[str, List[Tuple[Optional[int], float]]] = {}
+    bypass_scrolls = [e for e in enchantment_list if is_bypass_scroll(e)]
+
+    for ench in enchantment_list:
+        if is_convert_scroll(ench):
+            for stat, mod_type, value in enchantment_modifiers(ench):
+                convert_mods.setdefault(stat, []).append((mod_type, value))
+    for attachment in attachment_list:
+        if chisel_caliber(attachment):
+            continue
+        for stat, value, is_percent in attachment_modifiers(attachment):
+            attach_mods.setdefault(stat, []).append((value, is_percent))
+    for ench in enchantment_list:
+        if is_convert_scroll(ench) or is_bypass_scroll(ench):
+            continue
+        for stat, mod_type, value in enchantment_modifiers(ench):
+            other_mods.setdefault(stat, []).append((mod_type, value))
+
+    rows: List[Dict] = []
+
+    for stat, original in base_stats.items():
+        value = original
+        if stat in convert_mods:
+            value = _apply_typed_stage(value, convert_mods[stat], stat)
+        if stat in attach_mods:
+            value = _apply_attachment_stage(value, attach_mods[stat])
+        if stat in other_mods:
+            value = _apply_typed_stage(value, other_mods[stat], stat)
+        if stat == "Damage" and bypass_scrolls:
+            projectile_count = base_stats.get("ProjectileCount") or 1
+            for scroll in bypass_scrolls:
+                per_bullet = scroll["specialEffects"].get("perBulletDamage")
+                if per_bullet:
+                    value += per_bullet * projectile_count
+        rows.append(_stat_row(stat, original, value))
+
+    # Stats that only appear in modifiers (absent or zero in baseStats)
+    for stat in dict.fromkeys([*convert_mods, *attach_mods, *other_mods]):
+        if base_stats.get(stat):
+            continue
+        value = 0.0
+        if stat in convert_mods:
+            value = _apply_typed_stage(value, convert_mods[stat], stat, base_mode="zero")
+        if stat in attach_mods:
+            value = _apply_attachment_stage(value, attach_mods[stat])
+        if stat in other_mods:
+            value = _apply_typed_stage(value, other_mods[stat], stat, base_mode="running")
+        rows.append(_stat_row(stat, 0, value))
+
+    _finish_ads_crit(rows, base_stats)
+    return rows
+
+
+# ---------------------------------------------------------------------------
+# Incremental evaluation
+# ---------------------------------------------------------------------------
+
+
+class IncrementalBuild:
+    """A weapon build that re-evaluates only the stats touched by a change.
+
+    Items live in named slots (e.g. ``"muzzle"``, ``"oil0"``, ``"scroll"``).
+    For every stat the build caches the value after the chisel, after ConvertWpn
+    scrolls and after attachments, plus the Flat/PercentAdd/PercentMult
+    accumulators of each stage. ``set_attachment``/``set_enchantment`` update
+    only the accumulators of the changed item's attributes and recompute those
+    stats from the first affected stage onward.
+
+    Example::
+
+        build = IncrementalBuild(weapon, caliber_modifiers)
+        build.set_enchantment("oil0", action_oil)
+        changed = build.set_enchantment("oil0", damage_oil)   # {"Recoil", "ReloadSpeed", "Damage"}
+        build.stats()["Damage"]
+    """
+
+    _STAGES = ("convert", "attachment", "oil")
+
+    def __init__(self, weapon: Dict, caliber_modifiers: Optional[Dict] = None):
+        self.weapon = weapon
+        self.caliber_modifiers = caliber_modifiers or {}
+        self._raw_base: Dict[str, float] = weapon.get("baseStats") or weapon.get("base_stats") or {}
+        self._base: Dict[str, float] = self._raw_base
+
+        self._attachments: Dict[str, Dict] = {}
+        self._enchantments: Dict[str, Dict] = {}
+
+        # stage -> stat -> slot -> contributions
+        self._contrib: Dict[str, Dict[str, Dict[str, List[Tuple]]]] = {s: {} for s in self._STAGES}
+        # stage -> stat -> accumulator dict
+        self._acc: Dict[str, Dict[str, Dict[str, float]]] = {s: {} for s in self._STAGES}
+        # slot -> perBulletDamage of bypass scrolls
+        self._per_bullet: Dict[str, float] = {}
+
+        # stat -> [after_convert, after_attachments, final]
+        self._values: Dict[str, List[float]] = {}
+        for stat in self._stats_with_any_input():
+            self._recompute(stat, "convert")
+
+    # -- public API ---------------------------------------------------------
+
+    def set_attachment(self, slot: str, attachment: Optional[Dict]) -> Set[str]:
+        """Put ``attachment`` in ``slot`` (None clears it).
+
+        Returns:
+            The set of stats whose value may have changed.
+        """
+        old = self._place(self._attachments, slot, attachment)
+
+        changed = self._set_contributions(
+            "attachment", slot, self._attachment_stage_mods(old), self._attachment_stage_mods(attachment)
+        )
+        rebased: Set[str] = set()
+        if chisel_caliber(old) or chisel_caliber(attachment):
+            rebased = self._update_chisel()
+
+        for stat in changed | rebased:
+            self._recompute(stat, "convert" if stat in rebased else "attachment")
+        return changed | rebased
+
+    def set_enchantment(self, slot: str, enchantment: Optional[Dict]) -> Set[str]:
+        """Put an oil or scroll in ``slot`` (None clears it).
+
+        Returns:
+            The set of stats whose value may have changed.
+        """
+        old = self._place(self._enchantments, slot, enchantment)
+
+        changed: Dict[str, str] = {}
+        for stage in ("convert", "oil"):
+            old_mods = self._enchantment_stage_mods(old, stage)
+            new_mods = self._enchantment_stage_mods(enchantment, stage)
+            for stat in self._set_contributions(stage, slot, old_mods, new_mods):
+                changed.setdefault(stat, stage)
+
+        old_bullet = self._per_bullet.pop(slot, 0)
+        if is_bypass_scroll(enchantment):
+            self._per_bullet[slot] = enchantment["specialEffects"].get("perBulletDamage") or 0
+        if old_bullet != self._per_bullet.get(slot, 0):
+            changed.setdefault("Damage", "oil")
+
+        for stat, stage in changed.items():
+            self._recompute(stat, stage)
+        return set(changed)
+
+    def stats(self) -> Dict[str, float]:
+        """Return unrounded modified values for every stat with a base value or modifier."""
+        return {stat: values[2] for stat, values in self._values.items()}
+
+    def stage_values(self, stat: str) -> Dict[str, float]:
+        """Return the cached partial values of ``stat`` after each pipeline stage."""
+        after_convert, after_attachments, final = self._values.get(stat, (0.0, 0.0, 0.0))
+        return {
+            "base": self._base.get(stat, 0.0),
+            "convert": after_convert,
+            "attachment": after_attachments,
+            "final": final,
+        }
+
+    def results(self) -> Optional[List[Dict]]:
+        """Return the same rows :func:`calculate_modified_stats` produces for this build."""
+        if not self._attachments and not self._enchantments:
+            return None
+
+        rows = [_stat_row(stat, original, self._base_path_value(stat)) for stat, original in self._base.items()]
+
+        extra: Dict[str, None] = {}
+        for ench in self._enchantments.values():
+            if is_convert_scroll(ench):
+                extra.update((stat, None) for stat, _, _ in enchantment_modifiers(ench))
+        for attachment in self._attachments.values():
+            if not chisel_caliber(attachment):
+                extra.update((stat, None) for stat, _, _ in attachment_modifiers(attachment))
+        for ench in self._enchantments.values():
+            if not is_convert_scroll(ench) and not is_bypass_scroll(ench):
+                extra.update((stat, None) for stat, _, _ in enchantment_modifiers(ench))
+        for stat in extra:
+            if not self._base.get(stat):
+                rows.append(_stat_row(stat, 0, self._modifier_only_value(stat)))
+
+        _finish_ads_crit(rows, self._base)
+        return rows
+
+    # -- internals ----------------------------------------------------------
+
+    @staticmethod
+    def _place(items: Dict[str, Dict], slot: str, item: Optional[Dict]) -> Optional[Dict]:
+        """Store ``item`` in ``slot`` keeping slot order stable; returns the previous item."""
+        old = items.get(slot)
+        if item:
+            items[slot] = item
+        else:
+            items.pop(slot, None)
+        return old
+
+    @staticmethod
+    def _attachment_stage_mods(attachment: Optional[Dict]) -> List[Tuple[str, Tuple]]:
+        if chisel_caliber(attachment):
+            return []
+        return [(stat, (value, is_percent)) for stat, value, is_percent in attachment_modifiers(attachment)]
+
+    @staticmethod
+    def _enchantment_stage_mods(enchantment: Optional[Dict], stage: str) -> List[Tuple[str, Tuple]]:
+        if not enchantment:
+            return []
+        if stage == "convert" and not is_convert_scroll(enchantment):
+            return []
+        if stage == "oil" and (is_convert_scroll(enchantment) or is_bypass_scroll(enchantment)):
+            return []
+        return [(stat, (mod_type, value)) for stat, mod_type, value in enchantment_modifiers(enchantment)]
+
+    def _stats_with_any_input(self) -> Iterable[str]:
+        stats = dict.fromkeys(self._base)
+        for stage in self._STAGES:
+            stats.update(dict.fromkeys(self._contrib[stage]))
+        return list(stats)
+
+    def _set_contributions(
+        self,
+        stage: str,
+        slot: str,
+        old_mods: List[Tuple[str, Tuple]],
+        new_mods: List[Tuple[str, Tuple]],
+    ) -> Set[str]:
+        """Replace ``slot``'s contributions to ``stage`` and refresh touched accumulators."""
+        touched = {stat for stat, _ in old_mods} | {stat for stat, _ in new_mods}
+        by_stat = self._contrib[stage]
+        for stat in touched:
+            by_stat.get(stat, {}).pop(slot, None)
+        for stat, mod in new_mods:
+            by_stat.setdefault(stat, {}).setdefault(slot, []).append(mod)
+        for stat in touched:
+            if not by_stat.get(stat):
+                by_stat.pop(stat, None)
+                self._acc[stage].pop(stat, None)
+            else:
+                self._acc[stage][stat] = self._accumulate(stage, by_stat[stat])
+        return touched
+
+    @staticmethod
+    def _accumulate(stage: str, slots: Dict[str, List[Tuple]]) -> Dict[str, float]:
+        """Fold one stat's per-slot contributions into the stage accumulators."""
+        if stage == "attachment":
+            flat, pct_prod = 0.0, 1.0
+            for mods in slots.values():
+                for value, is_percent in mods:
+                    if is_percent:
+                        pct_prod *= 1 + value
+                    else:
+                        flat += value
+            return {"flat": flat, "pct_prod": pct_prod}
+
+        flat = pa_sum = 0.0
+        pa_prod = pm_prod = 1.0
+        typed_sum = 0.0
+        for mods in slots.values():
+            for mod_type, value in mods:
+                if mod_type is None:
+                    continue
+                typed_sum += value
+                if mod_type == FLAT:
+                    flat += value
+                elif mod_type == PERCENT_ADD:
+                    pa_sum += value
+                    pa_prod *= 1 + value
+                else:
+                    pm_prod *= 1 + value
+        return {"flat": flat, "pa_sum": pa_sum, "pa_prod": pa_prod, "pm_prod": pm_prod, "typed_sum": typed_sum}
+
+    def _update_chisel(self) -> Set[str]:
+        """Re-derive the post-chisel base stats; returns the stats that were rebased."""
+        chisel = next((a for a in self._attachments.values() if chisel_caliber(a)), None)
+        self._base = apply_caliber_conversion(
+            self._raw_base, chisel_caliber(chisel), self.caliber_modifiers, self.weapon
+        )
+        return set(CALIBER_STATS)
+
+    def _typed_stage(self, stage: str, stat: str, value: float, base_mode: str) -> float:
+        acc = self._acc[stage].get(stat)
+        if acc is None:
+            return value
+        if stat in ADDITIVE_STATS:
+            return value + acc["typed_sum"]
+        if base_mode == "staged":
+            return (value + acc["flat"]) * (1 + acc["pa_sum"]) * acc["pm_prod"]
+        if base_mode == "zero":
+            return (value + acc["flat"]) * acc["pm_prod"]
+        return (value + acc["flat"]) * acc["pa_prod"] * acc["pm_prod"]
+
+    def _attachment_stage(self, stat: str, value: float) -> float:
+        acc = self._acc["attachment"].get(stat)
+        if acc is None:
+            return value
+        return (value + acc["flat"]) * acc["pct_prod"]
+
+    def _recompute(self, stat: str, from_stage: str) -> None:
+        """Recompute ``stat`` starting at ``from_stage`` using cached earlier partials."""
+        in_base = stat in self._base
+        if not in_base and not any(stat in self._acc[s] for s in self._STAGES):
+            self._values.pop(stat, None)
+            return
+
+        cached = self._values.get(stat)
+        if cached is None:
+            from_stage = "convert"
+        if from_stage == "convert":
+            start = self._base.get(stat, 0.0) if in_base else 0.0
+            after_convert = self._typed_stage("convert", stat, start, "staged" if in_base else "zero")
+        else:
+            after_convert = cached[0]
+        if from_stage in ("convert", "attachment"):
+            after_attachments = self._attachment_stage(stat, after_convert)
+        else:
+            after_attachments = cached[1]
+        final = self._typed_stage("oil", stat, after_attachments, "staged" if in_base else "running")
+        if stat == "Damage" and in_base and self._per_bullet:
+            final += sum(self._per_bullet.values()) * (self._base.get("ProjectileCount") or 1)
+        self._values[stat] = [after_convert, after_attachments, final]
+
+    def _base_path_value(self, stat: str) -> float:
+        values = self._values.get(stat)
+        return values[2] if values else self._base[stat]
+
+    def _modifier_only_value(self, stat: str) -> float:
+        if stat not in self._base:
+            return self._values[stat][2]
+        # Zero-valued base stat: the frontend also reports the modifier-only path
+        value = self._typed_stage("convert", stat, 0.0, "zero")
+        value = self._attachment_stage(stat, value)
+        return self._typed_stage("oil", stat, value, "running")
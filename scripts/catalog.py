@@ -0,0 +1,103 @@
+"""Bundle the extracted data files into one versioned, content-hashed catalog.
+
+The frontend otherwise fetches and parses ten JSON files on every cold load.
+``catalog.json`` carries all of them in one document:
+
+    {
+      "format": 1,
+      "hash": "<sha256 prefix of the canonical data>",
+      "data": {
+        "weapons": [...], "enchantments": [...], "scrolls": [...],
+        "attachments": {"muzzle": [...], ...},
+        "caliberModifiers": {...}, "weaponAttachments": {...}
+      }
+    }
+
+``hash`` depends only on the data (canonical JSON with sorted keys), so it
+changes exactly when the data does and can serve as the cache key. A
+byte-identical gzip twin (``catalog.json.gz``, fixed mtime) is written next
+to it for servers that deliver precompressed files.
+"""
+
+import gzip
+import hashlib
+import os
+import sys
+from typing import Any, Dict, Optional
+
+from scripts.compatibility import COMPATIBILITY_FILENAME
+from scripts.data_io import atomic_write
+from scripts.json_backend import dumps, load_json
+from scripts.extract_attachments import SLOT_TO_FILENAME
+
+CATALOG_FILENAME = "catalog.json"
+CATALOG_FORMAT = 1
+
+# Catalog key -> data file (attachments are grouped separately by slot)
+CATALOG_FILES: Dict[str, str] = {
+    "weapons": "weapons.json",
+    "enchantments": "enchantments.json",
+    "scrolls": "scrolls.json",
+    "caliberModifiers": "caliber-modifiers.json",
+    "weaponAttachments": COMPATIBILITY_FILENAME,
+}
+
+# Hex digits of the SHA-256 digest kept as the catalog hash
+HASH_LENGTH = 16
+
+
+def content_hash(data: Any) -> str:
+    """Hash JSON-serializable data independently of key order and formatting."""
+    return hashlib.sha256(dumps(data, sort_keys=True)).hexdigest()[:HASH_LENGTH]
+
+
+def build_catalog(data_dir: str) -> Dict[str, Any]:
+    """Read every data file in ``data_dir`` into a catalog dict (missing files are skipped)."""
+    def _load(filename: str):
+        path = os.path.join(data_dir, filename)
+        if not os.path.exists(path):
+            return None
+        return load_json(path)
+
+    data: Dict[str, Any] = {}
+    for key, filename in CATALOG_FILES.items():
+        value = _load(filename)
+        if value is not None:
+            data[key] = value
+    data["attachments"] = {slot: _load(filename) or [] for slot, filename in SLOT_TO_FILENAME.items()}
+
+    return {"format": CATALOG_FORMAT, "hash": content_hash(data), "data": data}
+
+
+def write_catalog(data_dir: str, output_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Build the catalog from ``data_dir`` and write ``catalog.json`` and ``catalog.json.gz``.
+
+    Args:
+        data_dir: Directory containing the extracted data files.
+        output_dir: Where to write the catalog (default: ``data_dir``).
+
+    Returns:
+        The catalog that was written.
+    """
+    catalog = build_catalog(data_dir)
+    output_dir = output_dir or data_dir
+    payload = dumps(catalog)
+
+    path = os.path.join(output_dir, CATALOG_FILENAME)
+    with atomic_write(path, "wb") as f:
+        f.write(payload)
+    # mtime=0 keeps the gzip bytes identical when the data is unchanged
+    with atomic_write(path + ".gz", "wb") as f:
+        f.write(gzip.compress(payload, compresslevel=9, mtime=0))
+
+    print(f"Bundled {len(catalog['data'])} data sets into {path} "
+          f"({len(payload):,} bytes, hash {catalog['hash']})")
+    return catalog
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python3 -m scripts.catalog <data_dir> [output_dir]")
+        sys.exit(1)
+
+    write_catalog(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
@@ -0,0 +1,105 @@
+"""Build the weapon -> slot -> attachment-ids compatibility index.
+
+Combines each weapon's ``allowedAttachments`` slots and ``specificAttachments``
+names with the per-slot ``attachments-*.json`` files, using the same rules as
+the frontend's AttachmentSelector:
+
+- A weapon without ``allowedAttachments`` can use every slot; an empty list
+  means no slots.
+- Within a slot, ``specificAttachments`` restricts the choice only when at
+  least one of the named attachments belongs to that slot.
+
+Output (``weapon-attachments.json``)::
+
+    {"Weapon_Beck_8": {"muzzle": ["Attachment_...", ...], "sight": [...]}, ...}
+
+Slots appear in SLOT_TO_FILENAME order and attachment ids in file order.
+"""
+
+import os
+import sys
+from typing import Dict, List, Optional
+
+from scripts.data_io import write_json
+from scripts.extract_attachments import SLOT_TO_FILENAME
+from scripts.json_backend import load_json
+
+COMPATIBILITY_FILENAME = "weapon-attachments.json"
+
+
+def compatible_attachments(weapon: Dict, attachments_by_slot: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
+    """Resolve the attachments one weapon can take, per slot.
+
+    Args:
+        weapon: A weapon entry from weapons.json.
+        attachments_by_slot: Slot name -> attachment entries.
+
+    Returns:
+        Slot name -> compatible attachment entries, for the allowed slots only.
+    """
+    allowed = weapon.get("allowedAttachments")
+    if allowed is None:
+        allowed = list(attachments_by_slot)
+    specific = set(weapon.get("specificAttachments") or [])
+
+    result: Dict[str, List[Dict]] = {}
+    for slot, items in attachments_by_slot.items():
+        if slot not in allowed:
+            continue
+        restricted = [item for item in items if item["name"] in specific]
+        result[slot] = restricted or list(items)
+    return result
+
+
+def build_compatibility_index(
+    weapons: List[Dict],
+    attachments_by_slot: Dict[str, List[Dict]],
+) -> Dict[str, Dict[str, List[str]]]:
+    """Map every weapon id to its compatible attachment ids per slot."""
+    return {
+        weapon["id"]: {
+            slot: [item["id"] for item in items]
+            for slot, items in compatible_attachments(weapon, attachments_by_slot).items()
+        }
+        for weapon in weapons
+    }
+
+
+def load_attachments_by_slot(data_dir: str) -> Dict[str, List[Dict]]:
+    """Read the per-slot attachment files from ``data_dir`` (missing files are empty)."""
+    by_slot: Dict[str, List[Dict]] = {}
+    for slot, filename in SLOT_TO_FILENAME.items():
+        path = os.path.join(data_dir, filename)
+        if os.path.exists(path):
+            by_slot[slot] = load_json(path)
+        else:
+            by_slot[slot] = []
+    return by_slot
+
+
+def write_compatibility_index(data_dir: str, output_path: Optional[str] = None) -> Dict[str, Dict[str, List[str]]]:
+    """Build the index from the extractor outputs in ``data_dir`` and write it.
+
+    Args:
+        data_dir: Directory containing weapons.json and the attachment files.
+        output_path: Destination (default: ``data_dir/weapon-attachments.json``).
+
+    Returns:
+        The index that was written.
+    """
+    weapons = load_json(os.path.join(data_dir, "weapons.json"))
+    index = build_compatibility_index(weapons, load_attachments_by_slot(data_dir))
+
+    output_path = output_path or os.path.join(data_dir, COMPATIBILITY_FILENAME)
+    write_json(output_path, index)
+
+    print(f"Indexed attachment compatibility for {len(index)} weapons -> {output_path}")
+    return index
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python3 -m scripts.compatibility <data_dir> [output_path]")
+        sys.exit(1)
+
+    write_compatibility_index(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
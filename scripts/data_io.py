@@ -0,0 +1,260 @@
+"""Crash-safe output writes for the data pipeline.
+
+Three layers:
+
+- :func:`atomic_write` writes one file through a temp file in the same
+  directory, fsyncs it and renames it over the target, so readers see either
+  the old or the new file, never a truncated one. Temp names are unique, so
+  concurrent writers in one directory do not collide.
+- :class:`OutputWriter` moves JSON encoding and writes onto a bounded
+  thread pool, so they overlap with parsing and with each other, and records
+  per-file latency.
+- :func:`staged_output` stages a whole refresh in ``<output_dir>.staging``
+  (seeded with the current files) and swaps it in at the end, so a crash
+  mid-run leaves the previous data set untouched.
+
+Swapping two directories takes two renames::
+
+    output_dir          -> output_dir.old
+    output_dir.staging  -> output_dir
+
+A crash between them leaves no ``output_dir``; :func:`recover_output`
+(run at the start of :func:`staged_output`) finishes the swap when the
+staging directory was complete and rolls back to ``.old`` otherwise.
+"""
+
+import contextlib
+import os
+import secrets
+import shutil
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import IO, Any, Dict, Iterator, List, Optional
+
+from scripts.json_backend import dumps
+
+# Written into the staging directory once every file is in place
+STAGING_COMPLETE = ".complete"
+
+
+def _create_temp(path: str) -> str:
+    """Create an empty, uniquely named temp file next to ``path``.
+
+    Unlike ``tempfile.mkstemp`` (always 0600), the file gets the mode
+    ``open(path, "w")`` would give it under the current umask.
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    while True:
+        tmp_path = os.path.join(directory, f".{name}.{secrets.token_hex(4)}.tmp")
+        try:
+            fd = os.open(tmp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666)
+        except FileExistsError:
+            continue
+        os.close(fd)
+        return tmp_path
+
+
+def _fsync_dir(path: str) -> None:
+    """Persist a rename by fsyncing its directory (a no-op where unsupported)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@contextlib.contextmanager
+def atomic_path(path: str) -> Iterator[str]:
+    """Yield a temp path next to ``path``; on success it is fsynced and renamed over ``path``.
+
+    For writers that need a filename rather than a file object (e.g. SQLite).
+    If the block raises, the temp file is removed and ``path`` is unchanged.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    tmp_path = _create_temp(path)
+    try:
+        yield tmp_path
+        fd = os.open(tmp_path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        if os.path.exists(path):
+            # Replacing a file keeps its mode
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o777)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        raise
+    _fsync_dir(directory)
+
+
+@contextlib.contextmanager
+def atomic_write(path: str, mode: str = "w", encoding: str = "utf-8") -> Iterator[IO]:
+    """Open a temp file next to ``path`` and publish it with a rename on success.
+
+    Args:
+        path: Final file path.
+        mode: ``"w"`` (text) or ``"wb"`` (binary).
+        encoding: Text encoding (ignored for binary mode).
+
+    If the block raises, the temp file is removed and ``path`` is unchanged.
+    """
+    with atomic_path(path) as tmp_path:
+        with open(tmp_path, mode, encoding=None if "b" in mode else encoding) as f:
+            yield f
+
+
+def write_json(path: str, data: Any, writer: Optional["OutputWriter"] = None, pretty: bool = True) -> None:
+    """Atomically write ``data`` the way the extractors do (``indent=2``, UTF-8).
+
+    With a ``writer``, the write is queued on its thread pool instead; the
+    caller must not modify ``data`` afterwards. ``pretty=False`` writes
+    compact JSON.
+    """
+    if writer is not None:
+        writer.submit_json(path, data, pretty)
+        return
+    payload = dumps(data, pretty=pretty)
+    with atomic_write(path, "wb") as f:
+        f.write(payload)
+
+
+def copy_file(source: str, target: str) -> None:
+    """Atomically copy ``source`` to ``target``."""
+    with open(source, "rb") as src, atomic_write(target, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+
+
+# ---------------------------------------------------------------------------
+# Concurrent writer
+# ---------------------------------------------------------------------------
+
+
+class OutputWriter:
+    """Serializes and writes output files on a bounded thread pool.
+
+    Each queued file is encoded and written atomically by a worker thread;
+    :meth:`flush` waits for everything queued so far and re-raises the first
+    failure. ``timings`` collects ``{"path", "bytes", "encode", "write"}``
+    (seconds) per file, printed by :meth:`report`.
+
+    Use as a context manager; leaving the block flushes and shuts the pool
+    down.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="output-writer")
+        self._pending: List[Future] = []
+        self.timings: List[Dict[str, Any]] = []
+
+    def _write_json(self, path: str, data: Any, pretty: bool = True) -> None:
+        start = time.perf_counter()
+        payload = dumps(data, pretty=pretty)
+        encoded = time.perf_counter()
+        with atomic_write(path, "wb") as f:
+            f.write(payload)
+        self.timings.append({
+            "path": str(path),
+            "bytes": len(payload),
+            "encode": encoded - start,
+            "write": time.perf_counter() - encoded,
+        })
+
+    def submit_json(self, path: str, data: Any, pretty: bool = True) -> Future:
+        """Queue ``data`` to be written to ``path`` (same format as :func:`write_json`)."""
+        future = self._pool.submit(self._write_json, path, data, pretty)
+        self._pending.append(future)
+        return future
+
+    def flush(self) -> None:
+        """Wait for every queued write; raise the first error, if any."""
+        pending, self._pending = self._pending, []
+        errors = [future.exception() for future in pending]
+        for error in errors:
+            if error is not None:
+                raise error
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self._pool.shutdown(wait=True)
+
+    def __enter__(self) -> "OutputWriter":
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            # Already failing: let queued writes finish, keep the original error
+            self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def report(self) -> None:
+        """Print per-file latency, slowest first."""
+        for timing in sorted(self.timings, key=lambda t: t["encode"] + t["write"], reverse=True):
+            print(f"  {os.path.basename(timing['path'])}: {timing['bytes']:,} bytes, "
+                  f"encode {timing['encode'] * 1000:.1f} ms, write {timing['write'] * 1000:.1f} ms")
+
+
+# ---------------------------------------------------------------------------
+# Staging directory swap
+# ---------------------------------------------------------------------------
+
+
+def recover_output(output_dir: str) -> None:
+    """Repair ``output_dir`` after a crash during a staged refresh."""
+    staging, old = output_dir + ".staging", output_dir + ".old"
+    if not os.path.exists(output_dir):
+        if os.path.exists(os.path.join(staging, STAGING_COMPLETE)):
+            os.rename(staging, output_dir)
+            os.remove(os.path.join(output_dir, STAGING_COMPLETE))
+            print(f"Recovered {output_dir} from completed staging directory")
+        elif os.path.exists(old):
+            os.rename(old, output_dir)
+            print(f"Recovered {output_dir} from {old}")
+    for leftover in (staging, old):
+        if os.path.exists(leftover):
+            shutil.rmtree(leftover)
+
+
+@contextlib.contextmanager
+def staged_output(output_dir: str) -> Iterator[str]:
+    """Yield a staging directory that replaces ``output_dir`` when the block succeeds.
+
+    The staging directory starts as a copy of ``output_dir`` (if any), so
+    steps that read previous outputs (e.g. the manifest's previous
+    generation) still find them. If the block raises, ``output_dir`` is left
+    as it was and the staging directory is removed.
+    """
+    output_dir = os.path.normpath(output_dir)
+    recover_output(output_dir)
+    staging, old = output_dir + ".staging", output_dir + ".old"
+
+    if os.path.isdir(output_dir):
+        shutil.copytree(output_dir, staging, ignore=shutil.ignore_patterns(".*.tmp"))
+    else:
+        os.makedirs(staging)
+    try:
+        yield staging
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    with atomic_write(os.path.join(staging, STAGING_COMPLETE)) as f:
+        f.write("")
+    parent = os.path.dirname(os.path.abspath(output_dir))
+    if os.path.exists(output_dir):
+        os.rename(output_dir, old)
+    os.rename(staging, output_dir)
+    _fsync_dir(parent)
+    os.remove(os.path.join(output_dir, STAGING_COMPLETE))
+    if os.path.exists(old):
+        shutil.rmtree(old)
@@ -1,16 +1,18 @@
 """Diff tool for comparing old vs new SULFUR calculator JSON data files.
 
 Compares two directories of JSON data and prints a human-readable summary
-of additions, removals, and changes for each tracked file.
+of additions, removals, and changes for each tracked file. With ``--store``,
+compares two snapshots of a :mod:`scripts.snapshots` store instead.
 """
 
 from __future__ import annotations
 
-import json
 import sys
 from pathlib import Path
 from typing import Any
 
+from scripts.json_backend import load_json
+
 
 # Files treated as arrays keyed by 'name'
 ARRAY_FILES: list[str] = [
@@ -169,6 +171,55 @@ def _print_object_diff(
             print(f"{pad}  ~ {k}: {old_val!r} -> {new_val!r}")
 
 
+def _print_caliber_diff(old_cal: dict[str, Any], new_cal: dict[str, Any]) -> None:
+    """Print the baseAmmoDamage and calibers sections of a caliber-modifiers.json diff."""
+    # baseAmmoDamage sub-object
+    print("\n  [baseAmmoDamage]")
+    old_bad: dict[str, Any] = old_cal.get("baseAmmoDamage", {})
+    new_bad: dict[str, Any] = new_cal.get("baseAmmoDamage", {})
+    added_k, removed_k, changed_t = diff_json_objects(old_bad, new_bad)
+    _print_object_diff("baseAmmoDamage", added_k, removed_k, changed_t, indent=4)
+
+    # calibers sub-object (each value is itself a dict; compare as nested)
+    print("\n  [calibers]")
+    old_cals: dict[str, Any] = old_cal.get("calibers", {})
+    new_cals: dict[str, Any] = new_cal.get("calibers", {})
+
+    cal_added = sorted(set(new_cals) - set(old_cals))
+    cal_removed = sorted(set(old_cals) - set(new_cals))
+
+    if cal_added:
+        print(f"    ADDED ({len(cal_added)}):")
+        for c in cal_added:
+            print(f"      + {c}")
+
+    if cal_removed:
+        print(f"    REMOVED ({len(cal_removed)}):")
+        for c in cal_removed:
+            print(f"      - {c}")
+
+    common_cals = sorted(set(old_cals) & set(new_cals))
+    any_cal_change = False
+    for caliber in common_cals:
+        added_k, removed_k, changed_t = diff_json_objects(
+            old_cals[caliber], new_cals[caliber]
+        )
+        if added_k or removed_k or changed_t:
+            if not any_cal_change:
+                print(f"    CHANGED:")
+                any_cal_change = True
+            print(f"      ~ {caliber}")
+            for k in added_k:
+                print(f"          + {k}: {new_cals[caliber][k]!r}")
+            for k in removed_k:
+                print(f"          - {k}: {old_cals[caliber][k]!r}")
+            for k, ov, nv in changed_t:
+                print(f"          {k}: {ov!r} -> {nv!r}")
+
+    if not cal_added and not cal_removed and not any_cal_change:
+        print("    (no changes)")
+
+
 def diff_json_files(old_dir: str | Path, new_dir: str | Path) -> None:
     """Compare tracked JSON data files between two directories and print results.
 
@@ -206,8 +257,8 @@ def diff_json_files(old_dir: str | Path, new_dir: str | Path) -> None:
             print(f"{'=' * 60}")
             continue
 
-        old_data: list[dict[str, Any]] = json.loads(old_file.read_text(encoding="utf-8"))
-        new_data: list[dict[str, Any]] = json.loads(new_file.read_text(encoding="utf-8"))
+        old_data: list[dict[str, Any]] = load_json(str(old_file))
+        new_data: list[dict[str, Any]] = load_json(str(new_file))
 
         added, removed, changed = diff_json_arrays(old_data, new_data, key="name")
         _print_array_diff(filename, added, removed, changed)
@@ -227,54 +278,9 @@ def diff_json_files(old_dir: str | Path, new_dir: str | Path) -> None:
     elif not new_cal_file.exists():
         print("  [FILE REMOVED]")
     else:
-        old_cal: dict[str, Any] = json.loads(old_cal_file.read_text(encoding="utf-8"))
-        new_cal: dict[str, Any] = json.loads(new_cal_file.read_text(encoding="utf-8"))
-
-        # baseAmmoDamage sub-object
-        print("\n  [baseAmmoDamage]")
-        old_bad: dict[str, Any] = old_cal.get("baseAmmoDamage", {})
-        new_bad: dict[str, Any] = new_cal.get("baseAmmoDamage", {})
-        added_k, removed_k, changed_t = diff_json_objects(old_bad, new_bad)
-        _print_object_diff("baseAmmoDamage", added_k, removed_k, changed_t, indent=4)
-
-        # calibers sub-object (each value is itself a dict; compare as nested)
-        print("\n  [calibers]")
-        old_cals: dict[str, Any] = old_cal.get("calibers", {})
-        new_cals: dict[str, Any] = new_cal.get("calibers", {})
-
-        cal_added = sorted(set(new_cals) - set(old_cals))
-        cal_removed = sorted(set(old_cals) - set(new_cals))
-
-        if cal_added:
-            print(f"    ADDED ({len(cal_added)}):")
-            for c in cal_added:
-                print(f"      + {c}")
-
-        if cal_removed:
-            print(f"    REMOVED ({len(cal_removed)}):")
-            for c in cal_removed:
-                print(f"      - {c}")
-
-        common_cals = sorted(set(old_cals) & set(new_cals))
-        any_cal_change = False
-        for caliber in common_cals:
-            added_k, removed_k, changed_t = diff_json_objects(
-                old_cals[caliber], new_cals[caliber]
-            )
-            if added_k or removed_k or changed_t:
-                if not any_cal_change:
-                    print(f"    CHANGED:")
-                    any_cal_change = True
-                print(f"      ~ {caliber}")
-                for k in added_k:
-                    print(f"          + {k}: {new_cals[caliber][k]!r}")
-                for k in removed_k:
-                    print(f"          - {k}: {old_cals[caliber][k]!r}")
-                for k, ov, nv in changed_t:
-                    print(f"          {k}: {ov!r} -> {nv!r}")
-
-        if not cal_added and not cal_removed and not any_cal_change:
-            print("    (no changes)")
+        old_cal: dict[str, Any] = load_json(str(old_cal_file))
+        new_cal: dict[str, Any] = load_json(str(new_cal_file))
+        _print_caliber_diff(old_cal, new_cal)
 
 
 def main(argv: list[str] | None = None) -> None:
@@ -284,8 +290,15 @@ def main(argv: list[str] | None = None) -> None:
         argv: Argument list; defaults to sys.argv[1:].
     """
     args = argv if argv is not None else sys.argv[1:]
+    if len(args) == 4 and args[0] == "--store":
+        # Snapshots of a scripts.snapshots store instead of two directories
+        from scripts.snapshots import print_snapshot_diff
+
+        print_snapshot_diff(*args[1:])
+        return
     if len(args) != 2:
         print(f"Usage: {sys.argv[0]} <old_dir> <new_dir>", file=sys.stderr)
+        print(f"       {sys.argv[0]} --store <store_dir> <old_snapshot> <new_snapshot>", file=sys.stderr)
         sys.exit(1)
 
     old_dir, new_dir = args
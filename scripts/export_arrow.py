@@ -0,0 +1,153 @@
+"""Columnar Arrow/Parquet export of the extracted data set.
+
+Writes one file per table. The schema mirrors the SQLite tables
+(:mod:`scripts.export_sqlite`), not the JSON data files: weapon
+``baseStats`` and item modifiers are exploded into one row per stat, so
+notebooks can filter and aggregate them as columns instead of walking dicts.
+
+Two formats:
+
+- ``parquet`` (default): compressed ``<table>.parquet`` files for storage.
+- ``arrow``: uncompressed Arrow IPC ``<table>.arrow`` files, which
+  :func:`read_table` memory-maps without copying.
+
+Passing ``snapshot`` (e.g. the dump date) adds a ``snapshot`` column, so
+exports of many dumps can be read back as one table::
+
+    import pyarrow.compute as pc
+
+    weapons = read_table(["exports/2024-01", "exports/2024-06"], "base_stats")
+    weapons.filter(pc.equal(weapons["stat"], "Damage"))
+
+Requires pyarrow.
+"""
+
+import os
+import sys
+from typing import Dict, List, Optional, Sequence, Union
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from scripts.data_io import atomic_path
+from scripts.export_sqlite import collect_rows
+from scripts.json_backend import dumps
+
+FORMATS = ("parquet", "arrow")
+
+# Column order matches the row tuples of scripts.export_sqlite.collect_rows
+SCHEMAS: Dict[str, pa.Schema] = {
+    "items": pa.schema([
+        ("item_key", pa.int32()), ("kind", pa.string()), ("id", pa.string()), ("name", pa.string()),
+        ("type", pa.string()), ("slot", pa.string()), ("ammo_type", pa.string()), ("rarity", pa.string()),
+        ("description", pa.string()), ("image", pa.string()),
+    ]),
+    "base_stats": pa.schema([("item_key", pa.int32()), ("stat", pa.string()), ("value", pa.float64())]),
+    "modifiers": pa.schema([
+        ("item_key", pa.int32()), ("attribute", pa.string()), ("mod_type", pa.string()), ("value", pa.float64()),
+    ]),
+    # Special effect values as text: strings as is, flags as "1"/"0" (SQLite
+    # stores them as 1/0), numbers, dicts and lists as JSON
+    "special_effects": pa.schema([("item_key", pa.int32()), ("effect", pa.string()), ("value", pa.string())]),
+    "effects": pa.schema([("item_key", pa.int32()), ("position", pa.int32()), ("text", pa.string())]),
+    "compatibility": pa.schema([("weapon_key", pa.int32()), ("slot", pa.string()), ("attachment_key", pa.int32())]),
+    "calibers": pa.schema([("caliber", pa.string()), ("base_ammo_damage", pa.float64())]),
+    "caliber_stats": pa.schema([("caliber", pa.string()), ("stat", pa.string()), ("value", pa.float64())]),
+}
+
+
+def _effect_value(value) -> Optional[str]:
+    """Text form of a special effect value bound by :func:`collect_rows`."""
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        value = int(value)
+    return dumps(value).decode("utf-8")
+
+
+def build_tables(data_dir: str, snapshot: Optional[str] = None) -> Dict[str, pa.Table]:
+    """Build one Arrow table per schema from the data files in ``data_dir``."""
+    rows = collect_rows(data_dir)
+    rows["special_effects"] = [(key, effect, _effect_value(value)) for key, effect, value in rows["special_effects"]]
+
+    tables: Dict[str, pa.Table] = {}
+    for name, schema in SCHEMAS.items():
+        columns = list(zip(*rows[name])) or [()] * len(schema)
+        arrays = [pa.array(list(column), type=field.type) for column, field in zip(columns, schema)]
+        table = pa.Table.from_arrays(arrays, schema=schema)
+        if snapshot is not None:
+            table = table.append_column("snapshot", pa.array([snapshot] * table.num_rows, type=pa.string()))
+        tables[name] = table
+    return tables
+
+
+def export_arrow(
+    data_dir: str,
+    output_dir: str,
+    fmt: str = "parquet",
+    snapshot: Optional[str] = None,
+) -> Dict[str, int]:
+    """Write every table to ``output_dir`` as Parquet or Arrow IPC files.
+
+    Args:
+        data_dir: Directory containing the extracted data files.
+        output_dir: Directory for the ``<table>.parquet`` / ``<table>.arrow`` files.
+        fmt: ``parquet`` or ``arrow``.
+        snapshot: Optional label stored in an extra ``snapshot`` column.
+
+    Returns:
+        Row count per table.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}, expected one of {FORMATS}")
+    os.makedirs(output_dir, exist_ok=True)
+
+    counts: Dict[str, int] = {}
+    for name, table in build_tables(data_dir, snapshot).items():
+        path = os.path.join(output_dir, f"{name}.{fmt}")
+        with atomic_path(path) as tmp_path:
+            if fmt == "parquet":
+                pq.write_table(table, tmp_path, compression="zstd")
+            else:
+                with pa.OSFile(tmp_path, "wb") as sink, ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+        counts[name] = table.num_rows
+
+    print(f"Exported {len(counts)} {fmt} tables ({counts['items']} items, "
+          f"{counts['modifiers']} modifiers) -> {output_dir}")
+    return counts
+
+
+def read_table(export_dirs: Union[str, Sequence[str]], name: str) -> pa.Table:
+    """Read one table from one or more export directories (e.g. dump snapshots).
+
+    Arrow IPC files are memory-mapped, so their buffers are not copied;
+    Parquet files are decoded. Tables from several directories are
+    concatenated in order (their schemas must match, e.g. all exported with
+    or without ``snapshot``).
+    """
+    if isinstance(export_dirs, str):
+        export_dirs = [export_dirs]
+
+    tables: List[pa.Table] = []
+    for export_dir in export_dirs:
+        arrow_path = os.path.join(export_dir, f"{name}.arrow")
+        if os.path.exists(arrow_path):
+            tables.append(ipc.open_file(pa.memory_map(arrow_path, "r")).read_all())
+        else:
+            tables.append(pq.read_table(os.path.join(export_dir, f"{name}.parquet"), memory_map=True))
+    return pa.concat_tables(tables) if len(tables) > 1 else tables[0]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: python3 -m scripts.export_arrow <data_dir> <output_dir> [parquet|arrow] [snapshot]")
+        sys.exit(1)
+
+    export_arrow(
+        sys.argv[1],
+        sys.argv[2],
+        sys.argv[3] if len(sys.argv) > 3 else "parquet",
+        sys.argv[4] if len(sys.argv) > 4 else None,
+    )
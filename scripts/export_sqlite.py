@@ -0,0 +1,199 @@
+"""Export the extracted data set into a normalized, indexed SQLite database.
+
+Tables (``item_key`` is the integer primary key of ``items``; the same
+attachment can appear in several slot files, so ``id`` alone is not unique)::
+
+    items(item_key, kind, id, name, type, slot, ammo_type, rarity, description, image)
+    base_stats(item_key, stat, value)
+    modifiers(item_key, attribute, mod_type, value)
+    special_effects(item_key, effect, value)
+    effects(item_key, position, text)
+    compatibility(weapon_key, slot, attachment_key)
+    calibers(caliber, base_ammo_damage)
+    caliber_stats(caliber, stat, value)
+
+``kind`` is ``weapon``, ``oil``, ``scroll`` or ``attachment``; ``mod_type``
+uses the search index labels (Flat, PercentAdd, PercentMult, Percent).
+Example::
+
+    SELECT i.name, m.value FROM modifiers m JOIN items i USING (item_key)
+    WHERE m.attribute = 'Damage' AND m.mod_type = 'PercentAdd' AND i.kind = 'oil'
+    ORDER BY m.value DESC;
+
+The database is rebuilt from scratch on every export, in one transaction.
+"""
+
+import os
+import sqlite3
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from scripts.compatibility import COMPATIBILITY_FILENAME, build_compatibility_index, load_attachments_by_slot
+from scripts.data_io import atomic_path
+from scripts.json_backend import dumps, load_json
+from scripts.search_index import item_modifiers
+
+SCHEMA = """
+CREATE TABLE items (
+    item_key INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    type TEXT,
+    slot TEXT,
+    ammo_type TEXT,
+    rarity TEXT,
+    description TEXT,
+    image TEXT
+);
+CREATE TABLE base_stats (item_key INTEGER NOT NULL REFERENCES items, stat TEXT NOT NULL, value REAL);
+CREATE TABLE modifiers (
+    item_key INTEGER NOT NULL REFERENCES items,
+    attribute TEXT NOT NULL,
+    mod_type TEXT NOT NULL,
+    value REAL
+);
+CREATE TABLE special_effects (item_key INTEGER NOT NULL REFERENCES items, effect TEXT NOT NULL, value);
+CREATE TABLE effects (item_key INTEGER NOT NULL REFERENCES items, position INTEGER NOT NULL, text TEXT NOT NULL);
+CREATE TABLE compatibility (
+    weapon_key INTEGER NOT NULL REFERENCES items,
+    slot TEXT NOT NULL,
+    attachment_key INTEGER NOT NULL REFERENCES items
+);
+CREATE TABLE calibers (caliber TEXT PRIMARY KEY, base_ammo_damage REAL);
+CREATE TABLE caliber_stats (caliber TEXT NOT NULL, stat TEXT NOT NULL, value REAL);
+"""
+
+# Created after the bulk load, which is faster than maintaining them per row
+INDEXES = """
+CREATE INDEX items_kind_id ON items (kind, id);
+CREATE INDEX items_name ON items (name);
+CREATE INDEX base_stats_item ON base_stats (item_key);
+CREATE INDEX base_stats_stat ON base_stats (stat, value);
+CREATE INDEX modifiers_item ON modifiers (item_key);
+CREATE INDEX modifiers_attribute ON modifiers (attribute, mod_type, value);
+CREATE INDEX special_effects_item ON special_effects (item_key);
+CREATE INDEX special_effects_effect ON special_effects (effect);
+CREATE INDEX effects_item ON effects (item_key);
+CREATE INDEX compatibility_weapon ON compatibility (weapon_key, slot);
+CREATE INDEX compatibility_attachment ON compatibility (attachment_key);
+CREATE INDEX caliber_stats_caliber ON caliber_stats (caliber);
+"""
+
+
+def _statements(script: str) -> List[str]:
+    return [statement.strip() for statement in script.split(";") if statement.strip()]
+
+
+def _load(data_dir: str, filename: str, default):
+    path = os.path.join(data_dir, filename)
+    if not os.path.exists(path):
+        return default
+    return load_json(path)
+
+
+def _effect_value(value):
+    """Special effect value as SQLite binds it: scalars as is, dicts and lists as JSON text."""
+    if isinstance(value, (dict, list)):
+        return dumps(value).decode("utf-8")
+    return value
+
+
+def collect_rows(data_dir: str) -> Dict[str, List[Tuple]]:
+    """Turn the data files into row tuples per table."""
+    weapons = _load(data_dir, "weapons.json", [])
+    attachments_by_slot = load_attachments_by_slot(data_dir)
+    sources = [("weapon", None, item) for item in weapons]
+    sources += [("oil", None, item) for item in _load(data_dir, "enchantments.json", [])]
+    sources += [("scroll", None, item) for item in _load(data_dir, "scrolls.json", [])]
+    for slot, items in attachments_by_slot.items():
+        sources += [("attachment", slot, item) for item in items]
+
+    rows: Dict[str, List[Tuple]] = {table: [] for table in (
+        "items", "base_stats", "modifiers", "special_effects", "effects",
+        "compatibility", "calibers", "caliber_stats")}
+    keys: Dict[Tuple[str, Optional[str], str], int] = {}
+
+    for item_key, (kind, slot, item) in enumerate(sources, start=1):
+        keys[(kind, slot, item["id"])] = item_key
+        rows["items"].append((
+            item_key, kind, item["id"], item["name"], item.get("type"), slot,
+            item.get("ammoType"), item.get("rarity"), item.get("description"), item.get("image"),
+        ))
+        stats = item.get("baseStats") or {}
+        rows["base_stats"].extend((item_key, stat, value) for stat, value in stats.items())
+        rows["modifiers"].extend((item_key, stat, label, value) for stat, label, value in item_modifiers(kind, item))
+        effects = item.get("specialEffects") or {}
+        rows["special_effects"].extend((item_key, effect, _effect_value(value)) for effect, value in effects.items())
+        rows["effects"].extend((item_key, position, text) for position, text in enumerate(item.get("effects") or []))
+
+    compatibility = _load(data_dir, COMPATIBILITY_FILENAME, None)
+    if compatibility is None:
+        compatibility = build_compatibility_index(weapons, attachments_by_slot)
+    for weapon_id, slots in compatibility.items():
+        weapon_key = keys.get(("weapon", None, weapon_id))
+        if weapon_key is None:
+            continue
+        for slot, attachment_ids in slots.items():
+            rows["compatibility"].extend(
+                (weapon_key, slot, keys[("attachment", slot, attachment_id)])
+                for attachment_id in attachment_ids if ("attachment", slot, attachment_id) in keys
+            )
+
+    calibers = _load(data_dir, "caliber-modifiers.json", {})
+    base_damage = calibers.get("baseAmmoDamage") or {}
+    caliber_stats = calibers.get("calibers") or {}
+    for caliber in list(base_damage) + [c for c in caliber_stats if c not in base_damage]:
+        rows["calibers"].append((caliber, base_damage.get(caliber)))
+        rows["caliber_stats"].extend((caliber, stat, value) for stat, value in (caliber_stats.get(caliber) or {}).items())
+
+    return rows
+
+
+def export_sqlite(data_dir: str, db_path: str) -> Dict[str, int]:
+    """Write every data file in ``data_dir`` into a fresh SQLite database.
+
+    Args:
+        data_dir: Directory containing the extracted data files.
+        db_path: Database file to create (replaced if it exists).
+
+    Returns:
+        Row count per table.
+    """
+    rows = collect_rows(data_dir)
+
+    # Built in a temp file that replaces db_path only once complete.
+    # Autocommit mode with an explicit BEGIN: executescript() would commit
+    # early, so schema, rows and indexes go through execute() in one transaction
+    with atomic_path(db_path) as tmp_path:
+        conn = sqlite3.connect(tmp_path, isolation_level=None)
+        try:
+            conn.execute("BEGIN")
+            for statement in _statements(SCHEMA):
+                conn.execute(statement)
+            for table, table_rows in rows.items():
+                if table_rows:
+                    placeholders = ", ".join("?" * len(table_rows[0]))
+                    conn.executemany(f"INSERT INTO {table} VALUES ({placeholders})", table_rows)
+            for statement in _statements(INDEXES):
+                conn.execute(statement)
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    counts = {table: len(table_rows) for table, table_rows in rows.items()}
+    print(f"Exported {counts['items']} items, {counts['modifiers']} modifiers, "
+          f"{counts['compatibility']} compatibility rows -> {db_path}")
+    return counts
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: python3 -m scripts.export_sqlite <data_dir> <db_path>")
+        sys.exit(1)
+
+    export_sqlite(sys.argv[1], sys.argv[2])
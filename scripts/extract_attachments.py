@@ -8,17 +8,17 @@ Handles three kinds of items:
 Output is written as per-slot JSON files.
 """
 
-import json
 import re
 import sys
 from pathlib import Path
 from typing import Dict, List, Optional, Union
 
+from scripts.data_io import OutputWriter, write_json
+from scripts.page_cache import ClassifiedPages
 from scripts.wiki_parser import (
     extract_section,
     extract_wikilink_text,
     extract_wikilinks,
-    iterate_pages,
     parse_infobox,
     parse_modifier_value,
 )
@@ -592,7 +592,11 @@ def parse_chisel_page(title: str, wikitext: str) -> Optional[Dict]:
 # ---------------------------------------------------------------------------
 
 
-def extract_attachments(dump_path: str, output_dir: str) -> Dict[str, List[str]]:
+def extract_attachments(
+    dump_path: str,
+    output_dir: str,
+    writer: Optional[OutputWriter] = None,
+) -> Dict[str, List[str]]:
     """Extract all attachment and chisel entries from a MediaWiki XML dump.
 
     Writes one JSON file per slot type into output_dir.
@@ -600,6 +604,8 @@ def extract_attachments(dump_path: str, output_dir: str) -> Dict[str, List[str]]
     Args:
         dump_path: Absolute path to the MediaWiki XML dump file.
         output_dir: Directory where the per-slot JSON files will be written.
+        writer: Optional OutputWriter; if given, the files are written on its
+            thread pool (call ``writer.flush()`` before reading it back).
 
     Returns:
         Dict mapping slot name to list of attachment names written for that slot.
@@ -610,7 +616,8 @@ def extract_attachments(dump_path: str, output_dir: str) -> Dict[str, List[str]]
     # Collect items by slot
     by_slot: Dict[str, List[Dict]] = {slot: [] for slot in SLOT_TO_FILENAME}
 
-    for title, wikitext in iterate_pages(dump_path):
+    pages = ClassifiedPages(dump_path, "attachment")
+    for title, wikitext in pages:
         # Try old Item Infobox format first
         params = parse_infobox(wikitext)
         kind = params.get("kind", "").strip().lower()
@@ -618,11 +625,13 @@ def extract_attachments(dump_path: str, output_dir: str) -> Dict[str, List[str]]
         if kind == "chisel":
             item = parse_chisel_page(title, wikitext)
             if item is not None:
+                pages.mark(title)
                 by_slot["chisel"].append(item)
                 continue
         elif kind == "attachment":
             item = parse_attachment_page(title, wikitext)
             if item is not None:
+                pages.mark(title)
                 slot = item["type"]
                 if slot in by_slot:
                     by_slot[slot].append(item)
@@ -630,6 +639,8 @@ def extract_attachments(dump_path: str, output_dir: str) -> Dict[str, List[str]]
 
         # Try new Equipment Infobox format
         equip_items = parse_equipment_attachment(title, wikitext)
+        if equip_items:
+            pages.mark(title)
         for item in equip_items:
             slot = item["type"]
             if slot in by_slot:
@@ -639,6 +650,7 @@ def extract_attachments(dump_path: str, output_dir: str) -> Dict[str, List[str]]
         if not equip_items:
             chisel = parse_chisel_from_misc_infobox(title, wikitext)
             if chisel is not None:
+                pages.mark(title)
                 by_slot["chisel"].append(chisel)
 
     # Write files and build summary
@@ -659,8 +671,7 @@ def extract_attachments(dump_path: str, output_dir: str) -> Dict[str, List[str]]
                 deduped.append(item)
         items = deduped
         output_path = out / filename
-        with open(output_path, "w", encoding="utf-8") as fh:
-            json.dump(items, fh, indent=2, ensure_ascii=False)
+        write_json(output_path, items, writer)
         names = [item["name"] for item in items]
         summary[slot] = names
         print(f"Extracted {len(items)} {slot} attachments -> {output_path}")
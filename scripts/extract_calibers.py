@@ -1,14 +1,14 @@
 """Extract caliber/ammo data from a MediaWiki XML dump for the SULFUR calculator."""
 
-import json
 import re
 import sys
 from typing import Dict, Optional, Tuple
 
+from scripts.data_io import OutputWriter, write_json
+from scripts.page_cache import ClassifiedPages
 from scripts.wiki_parser import (
     extract_section,
     extract_wikilink_text,
-    iterate_pages,
     parse_infobox,
 )
 
@@ -190,7 +190,7 @@ def parse_caliber_table(table_text: str) -> Dict[str, Dict]:
 # ---------------------------------------------------------------------------
 
 
-def extract_calibers(dump_path: str, output_path: str) -> Dict:
+def extract_calibers(dump_path: str, output_path: str, writer: Optional[OutputWriter] = None) -> Dict:
     """Extract caliber data from a MediaWiki XML dump and write to JSON.
 
     Two data sources are combined:
@@ -206,6 +206,8 @@ def extract_calibers(dump_path: str, output_path: str) -> Dict:
     Args:
         dump_path: Path to the MediaWiki XML dump file.
         output_path: Path where the output JSON will be written.
+        writer: Optional OutputWriter; if given, the file is written on its
+            thread pool (call ``writer.flush()`` before reading it back).
 
     Returns:
         The output dict that was written (with keys ``baseAmmoDamage`` and
@@ -215,10 +217,12 @@ def extract_calibers(dump_path: str, output_path: str) -> Dict:
     calibers: Dict[str, Dict] = {}
     caliber_table_found = False
 
-    for title, wikitext in iterate_pages(dump_path):
+    pages = ClassifiedPages(dump_path, "ammo")
+    for title, wikitext in pages:
         # --- Ammo pages ---
         ammo_result = parse_ammo_page(title, wikitext)
         if ammo_result is not None:
+            pages.mark(title)
             caliber_name, base_damage = ammo_result
             base_ammo_damage[caliber_name] = base_damage
             continue
@@ -239,6 +243,7 @@ def extract_calibers(dump_path: str, output_path: str) -> Dict:
         table_text = table_match.group(0)
         parsed = parse_caliber_table(table_text)
         if len(parsed) >= 3:
+            pages.mark(title)
             calibers = parsed
             caliber_table_found = True
 
@@ -247,8 +252,7 @@ def extract_calibers(dump_path: str, output_path: str) -> Dict:
         "calibers": calibers,
     }
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
+    write_json(output_path, output, writer)
 
     print(f"Extracted {len(base_ammo_damage)} ammo entries and "
           f"{len(calibers)} caliber stats -> {output_path}")
@@ -1,12 +1,14 @@
 """Extract oil/enchantment data from a MediaWiki XML dump for the SULFUR calculator."""
 
 import re
+import sys
 from typing import Dict, List, Optional, Tuple
 
+from scripts.data_io import OutputWriter, write_json
+from scripts.page_cache import ClassifiedPages
 from scripts.wiki_parser import (
     extract_section,
     extract_wikilink_text,
-    iterate_pages,
     parse_infobox,
     parse_modifier_value,
 )
@@ -235,36 +237,49 @@ def parse_oil_from_equipment_infobox(title: str, wikitext: str) -> Optional[Dict
     return result
 
 
-def extract_enchantments(dump_path: str, output_path: str) -> List[Dict]:
+def extract_enchantments(dump_path: str, output_path: str, writer: Optional[OutputWriter] = None) -> List[Dict]:
     """Extract all oil/enchantment entries from a MediaWiki XML dump and write JSON.
 
     Args:
         dump_path: Absolute path to the MediaWiki XML dump file.
         output_path: Absolute path for the output JSON file.
+        writer: Optional OutputWriter; if given, the file is written on its
+            thread pool (call ``writer.flush()`` before reading it back).
 
     Returns:
         List of parsed oil dicts that were written to output_path.
     """
-    import json
-
     oils: List[Dict] = []
     seen_names: set = set()
 
-    for title, wikitext in iterate_pages(dump_path):
+    pages = ClassifiedPages(dump_path, "oil")
+    for title, wikitext in pages:
         # Try Item Infobox (kind=oil) first
         oil = parse_oil_page(title, wikitext)
         if oil is not None:
+            pages.mark(title)
             oils.append(oil)
             seen_names.add(title)
             continue
 
         # Try Equipment/Enchantment Infobox with Type=Oil
         oil = parse_oil_from_equipment_infobox(title, wikitext)
+        if oil is not None:
+            pages.mark(title)
         if oil is not None and title not in seen_names:
             oils.append(oil)
             seen_names.add(title)
 
-    with open(output_path, "w", encoding="utf-8") as fh:
-        json.dump(oils, fh, indent=2, ensure_ascii=False)
+    write_json(output_path, oils, writer)
 
     return oils
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python3 -m scripts.extract_enchantments <dump_path> [output_path]")
+        sys.exit(1)
+
+    dump = sys.argv[1]
+    out = sys.argv[2] if len(sys.argv) > 2 else "enchantments.json"
+    extract_enchantments(dump, out)
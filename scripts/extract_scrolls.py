@@ -1,15 +1,16 @@
 """Extract scroll data from a MediaWiki XML dump for the SULFUR calculator."""
 
 import html
-import json
 import re
+import sys
 from typing import Dict, List, Optional
 
+from scripts.data_io import OutputWriter, write_json
+from scripts.page_cache import ClassifiedPages
 from scripts.wiki_parser import (
     extract_bullet_points,
     extract_section,
     extract_wikilink_text,
-    iterate_pages,
     parse_infobox,
     parse_modifier_value,
 )
@@ -217,12 +218,14 @@ def parse_scroll_from_equipment_infobox(title: str, wikitext: str) -> Optional[D
     return result
 
 
-def extract_scrolls(dump_path: str, output_path: str) -> List[Dict]:
+def extract_scrolls(dump_path: str, output_path: str, writer: Optional[OutputWriter] = None) -> List[Dict]:
     """Extract all scroll entries from a MediaWiki XML dump and write JSON.
 
     Args:
         dump_path: Absolute path to the MediaWiki XML dump file.
         output_path: Absolute path for the output JSON file.
+        writer: Optional OutputWriter; if given, the file is written on its
+            thread pool (call ``writer.flush()`` before reading it back).
 
     Returns:
         List of parsed scroll dicts that were written to output_path.
@@ -230,21 +233,34 @@ def extract_scrolls(dump_path: str, output_path: str) -> List[Dict]:
     scrolls: List[Dict] = []
     seen_names: set = set()
 
-    for title, wikitext in iterate_pages(dump_path):
+    pages = ClassifiedPages(dump_path, "scroll")
+    for title, wikitext in pages:
         # Try Item Infobox (kind=scroll) first
         scroll = parse_scroll_page(title, wikitext)
         if scroll is not None:
+            pages.mark(title)
             scrolls.append(scroll)
             seen_names.add(title)
             continue
 
         # Try Equipment/Enchantment Infobox with Type=Scroll Enchantment
         scroll = parse_scroll_from_equipment_infobox(title, wikitext)
+        if scroll is not None:
+            pages.mark(title)
         if scroll is not None and title not in seen_names:
             scrolls.append(scroll)
             seen_names.add(title)
 
-    with open(output_path, "w", encoding="utf-8") as fh:
-        json.dump(scrolls, fh, indent=2, ensure_ascii=False)
+    write_json(output_path, scrolls, writer)
 
     return scrolls
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python3 -m scripts.extract_scrolls <dump_path> [output_path]")
+        sys.exit(1)
+
+    dump = sys.argv[1]
+    out = sys.argv[2] if len(sys.argv) > 2 else "scrolls.json"
+    extract_scrolls(dump, out)
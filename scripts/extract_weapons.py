@@ -1,15 +1,16 @@
 """Extract weapon data from a MediaWiki XML dump for the SULFUR calculator."""
 
-import json
 import re
 import sys
 from typing import Dict, List, Optional, Set
 
+from scripts.attachment_views import AttachmentViews, extract_attachments_section
+from scripts.data_io import OutputWriter, write_json
+from scripts.page_cache import ClassifiedPages
 from scripts.wiki_parser import (
     extract_section,
     extract_wikilink_text,
     extract_wikilinks,
-    iterate_pages,
     parse_damage_field,
     parse_infobox,
     parse_weapon_infobox,
@@ -34,27 +35,6 @@ ATTACHMENT_CATEGORY_TO_SLOT: Dict[str, str] = {
 INDIVIDUAL_ATTACHMENTS: Set[str] = {"Gun Crank", "Priming Bolt", "Insurance"}
 
 
-def _extract_attachments_section(wikitext: str) -> Optional[str]:
-    """
-    Extract the ==Available Attachments== section including all === sub-sections.
-
-    Unlike extract_section from wiki_parser, this stops only at the next true
-    == (level-2) heading, not at === (level-3) sub-headings.
-
-    Args:
-        wikitext: Full page wikitext.
-
-    Returns:
-        Section content string, or None if the heading is absent.
-    """
-    # Stop at a newline followed by == that is NOT === (negative lookahead for =)
-    pattern = r'==Available Attachments==\s*(.*?)(?=\n==[^=]|\Z)'
-    match = re.search(pattern, wikitext, re.DOTALL | re.IGNORECASE)
-    if match:
-        return match.group(1).strip()
-    return None
-
-
 def _parse_attachments_section(
     section_text: str, attachment_data: Optional[Dict[str, List[str]]] = None
 ) -> tuple[List[str], List[str]]:
@@ -212,7 +192,7 @@ def parse_weapon_page(title: str, wikitext: str) -> Optional[Dict]:
     allowed_attachments: List[str] = []
     specific_attachments: List[str] = []
 
-    attachments_section = _extract_attachments_section(wikitext)
+    attachments_section = extract_attachments_section(wikitext)
     if attachments_section:
         allowed_attachments, specific_attachments = _parse_attachments_section(
             attachments_section
@@ -238,6 +218,8 @@ def extract_weapons(
     dump_path: str,
     output_path: str,
     attachment_data: Optional[Dict[str, List[str]]] = None,
+    writer: Optional[OutputWriter] = None,
+    views: Optional[AttachmentViews] = None,
 ) -> List[Dict]:
     """
     Extract all weapon entries from a MediaWiki XML dump and write to JSON.
@@ -247,19 +229,28 @@ def extract_weapons(
         output_path: Path where the output JSON will be written.
         attachment_data: Optional dict mapping slot IDs to lists of attachment
             names, used for resolving attachment slots.
+        writer: Optional OutputWriter; if given, the file is written on its
+            thread pool (call ``writer.flush()`` before reading it back).
+        views: Optional AttachmentViews collector; every page and revision
+            read is also passed to it, so the attachment views need no pass
+            of their own.
 
     Returns:
         List of weapon dicts that were written to the output file.
     """
     weapons: List[Dict] = []
 
-    for title, wikitext in iterate_pages(dump_path):
+    # The views look at every page and revision, so they need a full pass
+    pages = ClassifiedPages(dump_path, "weapon", on_revision=views.add_revision if views is not None else None)
+    for title, wikitext in pages:
+        if views is not None:
+            views.add_page(title, wikitext)
         weapon = parse_weapon_page(title, wikitext)
         if weapon is not None:
+            pages.mark(title)
             weapons.append(weapon)
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(weapons, f, indent=2, ensure_ascii=False)
+    write_json(output_path, weapons, writer)
 
     print(f"Extracted {len(weapons)} weapons -> {output_path}")
     return weapons
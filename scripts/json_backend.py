@@ -0,0 +1,180 @@
+"""JSON serialization with an optional fast backend.
+
+Uses `orjson <https://github.com/ijl/orjson>`_ when it is installed and the
+stdlib :mod:`json` otherwise. Output is byte-identical to the stdlib calls
+the pipeline has always used::
+
+    dumps(data, pretty=True)   == json.dumps(data, indent=2, ensure_ascii=False).encode()
+    dumps(data)                == json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+orjson formats some floats differently (``1e-05`` vs ``0.00001``,
+``1e+16`` vs ``1e16``) and rejects integers beyond 64 bits and non-string
+keys. Output containing a number in exponent or small-fraction form, and
+data orjson refuses, is re-encoded with the stdlib, so the fast path never
+changes bytes on disk. (Non-finite floats are not valid JSON and are not
+supported by either path.)
+
+Benchmark both backends over a data directory::
+
+    python -m scripts.json_backend docs/data
+"""
+
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Union
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+# Maps every digit to "0", so digit-then-"e" is a single substring search
+_MASK_DIGITS = bytes.maketrans(b"123456789", b"000000000")
+_NUMBER_START = b" \n:[,-"
+
+
+def _stdlib_dumps(data: Any, pretty: bool = False, sort_keys: bool = False) -> bytes:
+    if pretty:
+        text = json.dumps(data, indent=2, ensure_ascii=False, sort_keys=sort_keys)
+    else:
+        text = json.dumps(data, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys)
+    return text.encode("utf-8")
+
+
+def _has_float_forms(payload: bytes) -> bool:
+    """Whether orjson output may contain a float that repr() formats differently.
+
+    That is any number in exponent form (``1e16``) or a small fraction
+    (``0.00001``). A regex over the whole payload costs more than the orjson
+    encode itself, so this uses substring searches; a match inside a string
+    only costs an unnecessary stdlib re-encode.
+    """
+    if b"0.0000" in payload:
+        return True
+    masked = payload.translate(_MASK_DIGITS)
+    pos = masked.find(b"0e")
+    while pos != -1:
+        # Walk back over the mantissa; a number token starts after a separator
+        start = pos
+        while start > 0 and masked[start - 1] in b"0.":
+            start -= 1
+        if start == 0 or masked[start - 1] in _NUMBER_START:
+            return True
+        pos = masked.find(b"0e", pos + 2)
+    return False
+
+
+def _orjson_dumps(data: Any, pretty: bool = False, sort_keys: bool = False) -> bytes:
+    option = (orjson.OPT_INDENT_2 if pretty else 0) | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+    try:
+        payload = orjson.dumps(data, option=option)
+    except TypeError:
+        return _stdlib_dumps(data, pretty, sort_keys)
+    if _has_float_forms(payload):
+        return _stdlib_dumps(data, pretty, sort_keys)
+    return payload
+
+
+def dumps(data: Any, pretty: bool = False, sort_keys: bool = False) -> bytes:
+    """Encode ``data`` as UTF-8 JSON bytes.
+
+    Args:
+        data: JSON-serializable value.
+        pretty: ``indent=2`` layout (the data files); compact otherwise.
+        sort_keys: Sort object keys (for canonical hashing).
+    """
+    if orjson is not None:
+        return _orjson_dumps(data, pretty, sort_keys)
+    return _stdlib_dumps(data, pretty, sort_keys)
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode JSON from bytes or str."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # e.g. integers beyond 64 bits; let the stdlib decide
+            pass
+    return json.loads(data)
+
+
+def load_json(path: str) -> Any:
+    """Read and decode a JSON file."""
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+
+def _best_of(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark(data_dir: str, repeat: int = 5) -> List[Dict[str, Any]]:
+    """Time load and pretty dump of every ``.json`` file in ``data_dir``.
+
+    Returns:
+        Per-file ``{"file", "bytes", "json_load", "json_dump"}`` (best of
+        ``repeat``, seconds), plus ``orjson_load``/``orjson_dump`` and
+        ``identical`` (orjson path output == stdlib output) when orjson is
+        installed.
+    """
+    results = []
+    for filename in sorted(os.listdir(data_dir)):
+        if not filename.endswith(".json"):
+            continue
+        with open(os.path.join(data_dir, filename), "rb") as f:
+            raw = f.read()
+        data = json.loads(raw)
+        entry: Dict[str, Any] = {
+            "file": filename,
+            "bytes": len(raw),
+            "json_load": _best_of(lambda: json.loads(raw), repeat),
+            "json_dump": _best_of(lambda: _stdlib_dumps(data, pretty=True), repeat),
+        }
+        if orjson is not None:
+            entry["orjson_load"] = _best_of(lambda: orjson.loads(raw), repeat)
+            entry["orjson_dump"] = _best_of(lambda: _orjson_dumps(data, pretty=True), repeat)
+            entry["identical"] = _orjson_dumps(data, pretty=True) == _stdlib_dumps(data, pretty=True)
+        results.append(entry)
+    return results
+
+
+def print_benchmark(results: List[Dict[str, Any]]) -> None:
+    ms = 1000
+    columns = ["json_load", "json_dump"] + (["orjson_load", "orjson_dump"] if orjson is not None else [])
+    print(f"{'file':<42} {'bytes':>9} " + " ".join(f"{c:>12}" for c in columns))
+    for entry in results:
+        print(f"{entry['file']:<42} {entry['bytes']:>9,} "
+              + " ".join(f"{entry[c] * ms:>10.3f}ms" for c in columns)
+              + ("" if entry.get("identical", True) else "  (differs, stdlib used)"))
+    totals = {c: sum(entry[c] for entry in results) for c in columns}
+    print(f"{'total':<42} {sum(e['bytes'] for e in results):>9,} "
+          + " ".join(f"{totals[c] * ms:>10.3f}ms" for c in columns))
+    if orjson is not None:
+        print(f"speedup: load {totals['json_load'] / totals['orjson_load']:.1f}x, "
+              f"dump {totals['json_dump'] / totals['orjson_dump']:.1f}x")
+    else:
+        print("orjson not installed; only the stdlib backend was measured")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python3 -m scripts.json_backend <data_dir> [repeat]")
+        sys.exit(1)
+
+    print(f"Backend: {BACKEND}")
+    print_benchmark(benchmark(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 5))
@@ -0,0 +1,130 @@
+"""Content-addressed copies of the data files plus a manifest.json index.
+
+Every logical data file (``weapons.json``, ``catalog.json``, ...) is also
+written as ``<stem>.<hash>.json``, where ``hash`` is a prefix of the SHA-256
+of its bytes. A file that did not change keeps its name, so hashed files can
+be served with immutable, long-lived cache headers, e.g.::
+
+    Cache-Control: public, max-age=31536000, immutable
+
+Only ``manifest.json`` itself must be revalidated:
+
+    {
+      "format": 1,
+      "files": {"weapons.json": "weapons.1a2b3c4d5e6f7a8b.json", ...}
+    }
+
+Precompressed ``.gz`` twins get the hash of the file they compress, e.g.
+``catalog.<hash>.json.gz`` next to ``catalog.<hash>.json``.
+
+Old hashed files are pruned, except those the previous manifest referenced:
+clients that loaded the previous manifest can still fetch its files.
+"""
+
+import hashlib
+import os
+import re
+import sys
+from typing import Dict, List, Optional
+
+from scripts.attribute_index import ATTRIBUTE_INDEX_FILENAME
+from scripts.catalog import CATALOG_FILENAME, HASH_LENGTH
+from scripts.compatibility import COMPATIBILITY_FILENAME
+from scripts.data_io import copy_file, write_json
+from scripts.extract_attachments import SLOT_TO_FILENAME
+from scripts.json_backend import load_json
+from scripts.search_index import SEARCH_INDEX_FILENAME
+
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_FORMAT = 1
+
+# Logical data files that get content-addressed copies
+MANIFEST_FILES: List[str] = [
+    "weapons.json",
+    "enchantments.json",
+    "scrolls.json",
+    *SLOT_TO_FILENAME.values(),
+    "caliber-modifiers.json",
+    COMPATIBILITY_FILENAME,
+    SEARCH_INDEX_FILENAME,
+    ATTRIBUTE_INDEX_FILENAME,
+    CATALOG_FILENAME,
+]
+
+_HASHED_NAME = re.compile(r"^(?P<stem>.+)\.(?P<hash>[0-9a-f]{%d})\.json(?:\.gz)?$" % HASH_LENGTH)
+
+
+def file_hash(path: str) -> str:
+    """SHA-256 prefix of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:HASH_LENGTH]
+
+
+def hashed_name(filename: str, digest: str) -> str:
+    """``weapons.json`` -> ``weapons.<digest>.json``."""
+    stem, ext = os.path.splitext(filename)
+    return f"{stem}.{digest}{ext}"
+
+
+def is_hashed_name(filename: str) -> bool:
+    """Whether ``filename`` is a content-addressed copy written by this module."""
+    return _HASHED_NAME.match(filename) is not None
+
+
+def load_manifest(data_dir: str) -> Optional[Dict]:
+    path = os.path.join(data_dir, MANIFEST_FILENAME)
+    if not os.path.exists(path):
+        return None
+    return load_json(path)
+
+
+def write_manifest(data_dir: str) -> Dict:
+    """Write hashed copies of every data file in ``data_dir`` and its manifest.
+
+    Returns:
+        The manifest that was written.
+    """
+    previous = load_manifest(data_dir) or {"files": {}}
+    files: Dict[str, str] = {}
+    changed = 0
+
+    for filename in MANIFEST_FILES:
+        source = os.path.join(data_dir, filename)
+        if not os.path.exists(source):
+            continue
+        target = hashed_name(filename, file_hash(source))
+        files[filename] = target
+        if not os.path.exists(os.path.join(data_dir, target)):
+            copy_file(source, os.path.join(data_dir, target))
+            changed += 1
+        if os.path.exists(source + ".gz"):
+            gz_target = os.path.join(data_dir, target + ".gz")
+            if not os.path.exists(gz_target):
+                copy_file(source + ".gz", gz_target)
+
+    manifest = {"format": MANIFEST_FORMAT, "files": files}
+    write_json(os.path.join(data_dir, MANIFEST_FILENAME), manifest)
+
+    # Keep the current and the previous generation of hashed files
+    keep = set(files.values()) | set(previous.get("files", {}).values())
+    keep |= {name + ".gz" for name in keep}
+    removed = 0
+    for name in os.listdir(data_dir):
+        if is_hashed_name(name) and name not in keep:
+            os.remove(os.path.join(data_dir, name))
+            removed += 1
+
+    print(f"Manifest: {len(files)} files, {changed} new hashed copies, "
+          f"{removed} stale removed -> {os.path.join(data_dir, MANIFEST_FILENAME)}")
+    return manifest
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python3 -m scripts.manifest <data_dir>")
+        sys.exit(1)
+
+    write_manifest(sys.argv[1])
@@ -0,0 +1,237 @@
+"""Per-dump cache of which pages each extractor needs.
+
+Every extractor reads the whole dump and throws most pages away: only a few
+hundred of the dump's pages are weapons, oils, scrolls, ammo or attachments.
+With a cache directory configured, the first run of an extractor over a
+dump records the pages it actually used (those its parsers returned a
+result for) together with their byte ranges in the dump. Later runs over the
+same dump, including single-extractor CLI runs such as
+``python -m scripts.extract_scrolls``, seek to those pages and parse only
+them (:func:`scripts.wiki_parser.iterate_pages_at`).
+
+One JSON file per dump, named by :func:`dump_fingerprint`::
+
+    {
+      "format": 2, "dump": "sulfur-history.xml", "size": 123456789,
+      "classified": {"scroll": "3f2a...", "weapon": "9b1c..."},
+      "pages": {"Scroll of Haste": {"spans": [[1234, 5678]], "types": ["scroll"]}, ...}
+    }
+
+``classified`` maps the page types whose pages are complete to the
+:func:`parser_version` that classified them. A type that is missing (never
+run, or the run was interrupted) or was classified by other parser code
+falls back to a full pass: a fixed parser may accept pages the old one
+rejected.
+
+Cached spans are checked against the dump
+(:func:`scripts.wiki_parser.page_spans_match`) before they are read. A dump
+edited in place can keep its fingerprint while its pages move; when a span
+no longer holds its page, the cache file is reset and the extractor does a
+full pass.
+
+The cache is off unless ``SULFUR_PAGE_CACHE`` names a directory (or
+``update_all --page-cache DIR`` / :func:`set_page_cache` sets one).
+"""
+
+import hashlib
+import importlib.util
+import os
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from scripts.data_io import atomic_write
+from scripts.json_backend import dumps, load_json
+from scripts.wiki_parser import iterate_pages, iterate_pages_at, page_spans_match, scan_page_offsets
+
+CACHE_FORMAT = 2
+
+# Directory for cache files; unset (or empty) disables the cache
+PAGE_CACHE_ENV = "SULFUR_PAGE_CACHE"
+
+# Bytes hashed from each end of the dump for its fingerprint
+_FINGERPRINT_BYTES = 1 << 20
+
+# Modules whose code decides which pages of a type are used, besides
+# scripts.wiki_parser (see parser_version)
+PARSER_MODULES: Dict[str, Tuple[str, ...]] = {
+    "attachment": ("scripts.extract_attachments",),
+    "weapon": ("scripts.extract_weapons", "scripts.attachment_views"),
+    "oil": ("scripts.extract_enchantments",),
+    "scroll": ("scripts.extract_scrolls",),
+    "ammo": ("scripts.extract_calibers",),
+}
+
+_cache_override: Optional[str] = None
+
+
+def set_page_cache(directory: Optional[str]) -> None:
+    """Use ``directory`` as the page cache for every extractor (``""``: off, ``None``: per environment)."""
+    global _cache_override
+    _cache_override = directory
+
+
+def page_cache_dir() -> Optional[str]:
+    if _cache_override is not None:
+        return _cache_override or None
+    return os.environ.get(PAGE_CACHE_ENV) or None
+
+
+def dump_fingerprint(dump_path: str) -> str:
+    """Hash of the dump's size and first and last MiB (the whole dump up to 2 MiB).
+
+    Hashing a multi-GB dump in full would cost a good part of what the cache
+    saves; a new dump differs in its size, its header (dump date) or its
+    final pages.
+    """
+    size = os.path.getsize(dump_path)
+    digest = hashlib.blake2b(str(size).encode("ascii"), digest_size=16)
+    with open(dump_path, "rb") as f:
+        if size <= 2 * _FINGERPRINT_BYTES:
+            digest.update(f.read())
+        else:
+            digest.update(f.read(_FINGERPRINT_BYTES))
+            f.seek(-_FINGERPRINT_BYTES, os.SEEK_END)
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def parser_version(page_type: str) -> str:
+    """Hash of the source of the modules that select ``page_type`` pages.
+
+    Part of the cache key of a page type, so a warm run after a parser
+    change does a full pass instead of reading the old parser's pages.
+    """
+    digest = hashlib.blake2b(page_type.encode("utf-8"), digest_size=16)
+    for module in ("scripts.wiki_parser",) + PARSER_MODULES.get(page_type, ()):
+        spec = importlib.util.find_spec(module)
+        with open(spec.origin, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+class PageCache:
+    """The cache file of one dump.
+
+    Args:
+        dump_path: Path to the MediaWiki XML dump file.
+        directory: Cache directory (created on first save).
+    """
+
+    def __init__(self, dump_path: str, directory: str):
+        self.dump_path = dump_path
+        self.path = os.path.join(directory, f"{dump_fingerprint(dump_path)}.json")
+        self.data: Dict[str, Any] = {
+            "format": CACHE_FORMAT,
+            "dump": os.path.basename(dump_path),
+            "size": os.path.getsize(dump_path),
+            "classified": {},
+            "pages": {},
+        }
+        if os.path.exists(self.path):
+            data = load_json(self.path)
+            if data.get("format") == CACHE_FORMAT:
+                self.data = data
+
+    def is_classified(self, page_type: str, version: Optional[str] = None) -> bool:
+        """Whether ``page_type`` is complete (and classified by parser ``version``, if given)."""
+        classified = self.data["classified"].get(page_type)
+        return classified is not None and (version is None or classified == version)
+
+    def spans(self, page_type: str) -> List[Tuple[int, int, str]]:
+        """``(offset, length, title)`` of the pages of ``page_type``, in dump order."""
+        return sorted(
+            (offset, length, title)
+            for title, page in self.data["pages"].items() if page_type in page["types"]
+            for offset, length in page["spans"]
+        )
+
+    def reset(self) -> None:
+        """Forget every page and classification (the dump changed under its fingerprint)."""
+        self.data["classified"] = {}
+        self.data["pages"] = {}
+        self.save()
+
+    def record(self, page_type: str, titles: Set[str], version: str) -> None:
+        """Store the complete set of ``page_type`` pages, found by parser ``version``, and save the file."""
+        pages = self.data["pages"]
+        missing = {title for title in titles if title not in pages}
+        found = scan_page_offsets(self.dump_path, missing) if missing else {}
+        if len(found) < len(missing):
+            # A title the raw scan cannot place: leave the type unclassified
+            return
+        for title, spans in found.items():
+            pages[title] = {"spans": [list(span) for span in spans], "types": []}
+        for page in pages.values():
+            if page_type in page["types"]:
+                page["types"].remove(page_type)
+        for title in titles:
+            pages[title]["types"].append(page_type)
+        self.data["pages"] = {title: page for title, page in pages.items() if page["types"]}
+        self.data["classified"][page_type] = version
+        self.save()
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with atomic_write(self.path, "wb") as f:
+            f.write(dumps(self.data))
+
+
+class ClassifiedPages:
+    """The pages one extractor needs, from the cache when it can.
+
+    Iterate it like :func:`scripts.wiki_parser.iterate_pages` and call
+    :meth:`mark` for every page the extractor used. With the cache off, or
+    ``page_type`` not yet classified for this dump by the current parser
+    code (:func:`parser_version`), iteration is a full pass; when that pass
+    completes, the marked pages become the cached set. With ``page_type``
+    classified, only those pages are read.
+
+    Args:
+        dump_path: Path to the MediaWiki XML dump file.
+        page_type: Cache key of the extractor's pages, e.g. ``"scroll"``.
+        full_pass: Read every page even when cached (for callers that look at
+            all pages); the classification is still recorded.
+        cache_dir: Cache directory (default: :func:`page_cache_dir`).
+        on_revision: Passed to :func:`scripts.wiki_parser.iterate_pages`;
+            implies ``full_pass``.
+    """
+
+    def __init__(
+        self,
+        dump_path: str,
+        page_type: str,
+        full_pass: bool = False,
+        cache_dir: Optional[str] = None,
+        on_revision: Optional[Callable[[str, str], None]] = None,
+    ):
+        self.dump_path = dump_path
+        self.page_type = page_type
+        self.full_pass = full_pass or on_revision is not None
+        self.on_revision = on_revision
+        cache_dir = cache_dir or page_cache_dir()
+        self.cache = PageCache(dump_path, cache_dir) if cache_dir else None
+        self.version = parser_version(page_type) if self.cache is not None else None
+        self.marked: Set[str] = set()
+
+    @property
+    def cached(self) -> bool:
+        """True when iteration reads only the cached pages."""
+        return (self.cache is not None and not self.full_pass
+                and self.cache.is_classified(self.page_type, self.version))
+
+    def mark(self, title: str) -> None:
+        """Record that the extractor used page ``title``."""
+        self.marked.add(title)
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        if self.cached:
+            spans = self.cache.spans(self.page_type)
+            # Checked before the first page is yielded, so a stale cache
+            # can still fall back to a full pass
+            if page_spans_match(self.dump_path, spans):
+                yield from iterate_pages_at(self.dump_path, [(offset, length) for offset, length, _ in spans])
+                return
+            self.cache.reset()
+        yield from iterate_pages(self.dump_path, on_revision=self.on_revision)
+        # Only a completed pass is a complete classification
+        if self.cache is not None:
+            self.cache.record(self.page_type, self.marked, self.version)
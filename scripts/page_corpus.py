@@ -0,0 +1,304 @@
+"""Compact on-disk corpus of item pages from a wiki dump.
+
+Parser tests and micro-benchmarks replay real pages from a corpus instead of
+re-reading the full XML dump. A corpus keeps only item pages (pages with an
+``Item``, ``Weapon``, ``Equipment`` or ``Misc Item`` infobox), each
+compressed as its own record so any page can be read without decompressing
+the rest::
+
+    header      b"SULFURPC" | u8 format | u8 codec | u32 dictionary length
+    dictionary  the first pages' text, shared by every record
+    records     compressed UTF-8 "title\\0wikitext", back to back
+    index       compressed JSON: [[title, offset, length, template, kind], ...]
+    footer      u64 index offset | u64 index length | b"SULFURPC"
+
+Item pages are small and repeat the same template markup, so records are
+compressed against a preset dictionary (zlib ``zdict``, or a zstd raw-content
+dictionary): records come out about 3x smaller than with each page
+compressed on its own.
+``codec`` is zstd (``zstandard`` package) when it is installed and zlib
+otherwise; a zstd corpus needs ``zstandard`` to read. ``template`` is the
+infobox template name and ``kind`` the ``kind =`` value of an Item Infobox
+(empty otherwise).
+
+Usage:
+    python -m scripts.page_corpus build <dump.xml> <pages.corpus> [--codec zlib|zstd] [--all-pages]
+    python -m scripts.page_corpus info <pages.corpus>
+"""
+
+import argparse
+import os
+import re
+import struct
+import zlib
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from scripts.data_io import atomic_write
+from scripts.json_backend import dumps, loads
+from scripts.wiki_parser import iterate_pages
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+CORPUS_FORMAT = 1
+MAGIC = b"SULFURPC"
+
+CODEC_ZLIB = 0
+CODEC_ZSTD = 1
+CODECS = {"zlib": CODEC_ZLIB, "zstd": CODEC_ZSTD}
+
+_HEADER = struct.Struct("<8sBBI")
+_FOOTER = struct.Struct("<QQ8s")
+
+_INFOBOX_PATTERN = re.compile(r"\{\{\s*(Item|Weapon|Equipment|Misc Item)[ _]Infobox")
+_KIND_PATTERN = re.compile(r"\|\s*kind\s*=\s*([^\n|}]*)")
+
+# zlib's window; a longer zstd dictionary would not pay off on item pages
+DICTIONARY_SIZE = 32 * 1024
+
+
+def default_codec() -> str:
+    """``"zstd"`` when zstandard is installed, else ``"zlib"``."""
+    return "zstd" if zstandard is not None else "zlib"
+
+
+def _zstd_dictionary(dictionary: bytes):
+    if zstandard is None:
+        raise ImportError("zstd corpora require zstandard (pip install zstandard)")
+    return zstandard.ZstdCompressionDict(dictionary, dict_type=zstandard.DICT_TYPE_RAWCONTENT)
+
+
+def _compressor(codec: int, dictionary: bytes) -> Callable[[bytes], bytes]:
+    if codec == CODEC_ZSTD:
+        return zstandard.ZstdCompressor(level=19, dict_data=_zstd_dictionary(dictionary)).compress
+
+    def compress(data: bytes) -> bytes:
+        compressor = zlib.compressobj(9, zdict=dictionary) if dictionary else zlib.compressobj(9)
+        return compressor.compress(data) + compressor.flush()
+    return compress
+
+
+def _decompressor(codec: int, dictionary: bytes) -> Callable[[bytes], bytes]:
+    if codec == CODEC_ZSTD:
+        return zstandard.ZstdDecompressor(dict_data=_zstd_dictionary(dictionary)).decompress
+    if codec != CODEC_ZLIB:
+        raise ValueError(f"Unknown corpus codec: {codec}")
+
+    def decompress(data: bytes) -> bytes:
+        decompressor = zlib.decompressobj(zdict=dictionary) if dictionary else zlib.decompressobj()
+        return decompressor.decompress(data) + decompressor.flush()
+    return decompress
+
+
+def classify_page(wikitext: str) -> Optional[Tuple[str, str]]:
+    """``(template, kind)`` of an item page, or None for other pages."""
+    match = _INFOBOX_PATTERN.search(wikitext)
+    if match is None:
+        return None
+    template = f"{match.group(1)} Infobox"
+    kind = ""
+    if template == "Item Infobox":
+        kind_match = _KIND_PATTERN.search(wikitext, match.end())
+        if kind_match:
+            kind = kind_match.group(1).strip().lower()
+    return template, kind
+
+
+# ---------------------------------------------------------------------------
+# Writing
+# ---------------------------------------------------------------------------
+
+
+def build_corpus(
+    dump_path: str,
+    corpus_path: str,
+    codec: Optional[str] = None,
+    all_pages: bool = False,
+) -> Dict[str, Any]:
+    """Write the item pages of a dump to a corpus file.
+
+    Args:
+        dump_path: Path to the MediaWiki XML dump file.
+        corpus_path: Corpus file to create (replaced only once complete).
+        codec: ``"zlib"`` or ``"zstd"`` (default: :func:`default_codec`).
+        all_pages: Keep every page :func:`scripts.wiki_parser.iterate_pages`
+            yields, not only item pages.
+
+    Returns:
+        ``{"pages", "codec", "text_bytes", "bytes"}``.
+    """
+    codec = codec or default_codec()
+    if codec not in CODECS:
+        raise ValueError(f"Unknown codec {codec!r} (expected one of {sorted(CODECS)})")
+    if codec == "zstd" and zstandard is None:
+        raise ImportError("zstd corpora require zstandard (pip install zstandard)")
+
+    index: List[List[Any]] = []
+    text_bytes = 0
+    # Pages are held back until the dictionary sample is complete
+    pending: List[Tuple[str, bytes, Tuple[str, str]]] = []
+    sample_bytes = 0
+    compress: Optional[Callable[[bytes], bytes]] = None
+
+    # A failed or interrupted build leaves any previous corpus in place
+    with atomic_write(corpus_path, "wb") as f:
+        def write_record(title: str, raw: bytes, classified: Tuple[str, str]) -> None:
+            record = compress(raw)
+            index.append([title, f.tell(), len(record), *classified])
+            f.write(record)
+
+        def start_records() -> None:
+            nonlocal compress
+            dictionary = b"".join(raw for _, raw, _ in pending)[-DICTIONARY_SIZE:]
+            compress = _compressor(CODECS[codec], dictionary)
+            f.write(_HEADER.pack(MAGIC, CORPUS_FORMAT, CODECS[codec], len(dictionary)))
+            f.write(dictionary)
+            for page in pending:
+                write_record(*page)
+            pending.clear()
+
+        for title, wikitext in iterate_pages(dump_path):
+            classified = classify_page(wikitext)
+            if classified is None:
+                if not all_pages:
+                    continue
+                classified = ("", "")
+            raw = f"{title}\0{wikitext}".encode("utf-8")
+            text_bytes += len(raw)
+            if compress is not None:
+                write_record(title, raw, classified)
+                continue
+            pending.append((title, raw, classified))
+            sample_bytes += len(raw)
+            if sample_bytes >= DICTIONARY_SIZE:
+                start_records()
+        if compress is None:
+            start_records()
+
+        index_offset = f.tell()
+        index_record = compress(dumps(index))
+        f.write(index_record)
+        f.write(_FOOTER.pack(index_offset, len(index_record), MAGIC))
+        size = f.tell()
+
+    return {"pages": len(index), "codec": codec, "text_bytes": text_bytes, "bytes": size}
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+
+class PageCorpus:
+    """Random and sequential access to the pages of a corpus file.
+
+    Iterating yields ``(title, wikitext)`` in dump order, like
+    :func:`scripts.wiki_parser.iterate_pages`, so page parsers can be
+    replayed over it directly.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._f = open(path, "rb")
+        try:
+            magic, version, codec, dictionary_length = _HEADER.unpack(self._f.read(_HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a page corpus")
+            if version != CORPUS_FORMAT:
+                raise ValueError(f"{path}: unsupported corpus format {version}")
+            self.codec = codec
+            self._decompress = _decompressor(codec, self._f.read(dictionary_length))
+            self._f.seek(-_FOOTER.size, os.SEEK_END)
+            index_offset, index_length, magic = _FOOTER.unpack(self._f.read(_FOOTER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path}: truncated corpus (no footer)")
+            self._f.seek(index_offset)
+            self.index: List[List[Any]] = loads(self._decompress(self._f.read(index_length)))
+        except BaseException:
+            self._f.close()
+            raise
+        self._by_title = {entry[0]: entry for entry in self.index}
+
+    def __enter__(self) -> "PageCorpus":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._f.close()
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, title: str) -> bool:
+        return title in self._by_title
+
+    def titles(self, template: Optional[str] = None, kind: Optional[str] = None) -> List[str]:
+        """Page titles in dump order, optionally only one infobox template/kind."""
+        return [entry[0] for entry in self._select(template, kind)]
+
+    def _select(self, template: Optional[str], kind: Optional[str]) -> List[List[Any]]:
+        return [
+            entry for entry in self.index
+            if (template is None or entry[3] == template) and (kind is None or entry[4] == kind)
+        ]
+
+    def _read(self, entry: List[Any]) -> Tuple[str, str]:
+        self._f.seek(entry[1])
+        title, _, wikitext = self._decompress(self._f.read(entry[2])).decode("utf-8").partition("\0")
+        return title, wikitext
+
+    def get(self, title: str) -> str:
+        """Wikitext of one page (``KeyError`` if it is not in the corpus)."""
+        return self._read(self._by_title[title])[1]
+
+    def pages(self, template: Optional[str] = None, kind: Optional[str] = None) -> Iterator[Tuple[str, str]]:
+        """Yield ``(title, wikitext)``, optionally only one infobox template/kind."""
+        for entry in self._select(template, kind):
+            yield self._read(entry)
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        return self.pages()
+
+    def summary(self) -> Dict[str, Any]:
+        """Page counts per template and kind, codec and file size."""
+        counts: Dict[str, int] = {}
+        for entry in self.index:
+            key = f"{entry[3] or '(other)'}{' / ' + entry[4] if entry[4] else ''}"
+            counts[key] = counts.get(key, 0) + 1
+        codec = {value: name for name, value in CODECS.items()}[self.codec]
+        return {"pages": len(self.index), "codec": codec, "bytes": os.path.getsize(self.path),
+                "counts": dict(sorted(counts.items()))}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Build or inspect a page corpus for parser tests and benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Extract item pages from a dump")
+    build.add_argument("dump_path")
+    build.add_argument("corpus_path")
+    build.add_argument("--codec", choices=sorted(CODECS), default=None,
+                       help=f"Record compression (default: {default_codec()})")
+    build.add_argument("--all-pages", action="store_true", help="Keep every article page, not only item pages")
+    info = commands.add_parser("info", help="Print page counts of a corpus")
+    info.add_argument("corpus_path")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        result = build_corpus(args.dump_path, args.corpus_path, args.codec, args.all_pages)
+        ratio = result["text_bytes"] / result["bytes"] if result["bytes"] else 0
+        print(f"Wrote {result['pages']} pages ({result['codec']}, {result['bytes']:,} bytes, "
+              f"{ratio:.1f}x smaller than the wikitext) -> {args.corpus_path}")
+    else:
+        with PageCorpus(args.corpus_path) as corpus:
+            summary = corpus.summary()
+        print(f"{args.corpus_path}: {summary['pages']} pages, {summary['codec']}, {summary['bytes']:,} bytes")
+        for key, count in summary["counts"].items():
+            print(f"  {key:<32} {count:>6}")
+
+
+if __name__ == "__main__":
+    main()
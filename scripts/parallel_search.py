@@ -0,0 +1,199 @@
+"""Parallel Pareto-front search across a process pool.
+
+Searches for different weapons are independent, and within a weapon every
+scroll choice is an independent slice of the build space. This module shards
+the work of :mod:`scripts.pareto` by (weapon, scroll) across a
+``ProcessPoolExecutor``:
+
+- The per-item modifier tables cover the whole catalog and are identical for
+  every task, so they are copied once into ``multiprocessing.shared_memory``
+  blocks; workers map them as NumPy views instead of receiving a pickled copy
+  with each task.
+- Each task carries only its small per-weapon plan (weapon base stats and the
+  pruned candidate combinations) and returns its shard's front.
+- Shard fronts are merged per weapon in the parent, and a weapon's result is
+  yielded as soon as its last shard completes.
+
+Requires NumPy.
+"""
+
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from scripts.pareto import (
+    DEFAULT_OBJECTIVES,
+    MAX_ENCHANTMENTS,
+    FrontAccumulator,
+    format_front,
+    plan_weapon,
+    search_plan,
+    search_space,
+)
+
+# Plan keys a worker needs; the rest (slot names) stays in the parent
+_PLAN_KEYS = ("weapon", "oil_combos", "scrolls", "attachment_combos")
+
+# Space keys a worker needs; item dicts and tables are left out
+_SPACE_KEYS = ("objectives", "stats", "columns", "senses")
+
+ProgressCallback = Callable[[int, int, str], None]
+
+
+# ---------------------------------------------------------------------------
+# Shared-memory tables
+# ---------------------------------------------------------------------------
+
+
+class SharedTables:
+    """Copies a dict of NumPy arrays into shared memory for the lifetime of a pool.
+
+    ``spec`` is a small picklable description (block name, shape, dtype per
+    array) that workers pass to :func:`attach_tables`. The blocks are
+    unlinked by :meth:`close`, or on leaving a ``with`` block.
+    """
+
+    def __init__(self, tables: Dict[str, np.ndarray]):
+        self._blocks: List[shared_memory.SharedMemory] = []
+        self.spec: Dict[str, Tuple[str, Tuple[int, ...], str]] = {}
+        try:
+            for name, array in tables.items():
+                array = np.ascontiguousarray(array)
+                block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+                self._blocks.append(block)
+                np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+                self.spec[name] = (block.name, array.shape, array.dtype.str)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self) -> "SharedTables":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def attach_tables(
+    spec: Dict[str, Tuple[str, Tuple[int, ...], str]],
+) -> Tuple[Dict[str, np.ndarray], List[shared_memory.SharedMemory]]:
+    """Map the arrays described by ``spec`` without copying them.
+
+    Returns the arrays and the open blocks; the blocks must stay referenced
+    for as long as the arrays are used.
+    """
+    tables: Dict[str, np.ndarray] = {}
+    blocks: List[shared_memory.SharedMemory] = []
+    for name, (block_name, shape, dtype) in spec.items():
+        # Pool workers share the parent's resource tracker, so attaching here
+        # does not hand ownership over; the parent still unlinks the block.
+        block = shared_memory.SharedMemory(name=block_name)
+        blocks.append(block)
+        array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        array.flags.writeable = False
+        tables[name] = array
+    return tables, blocks
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+
+_worker_state: Dict = {}
+
+
+def _init_worker(spec: Dict, space: Dict) -> None:
+    tables, blocks = attach_tables(spec)
+    _worker_state.update(tables=tables, blocks=blocks, space=space)
+
+
+def _search_shard(plan: Dict, scrolls: Sequence[int], chunk_size: int) -> Tuple[np.ndarray, np.ndarray, int]:
+    front = search_plan(_worker_state["space"], _worker_state["tables"], plan, scrolls, chunk_size)
+    if front.values is None:
+        n_payload = MAX_ENCHANTMENTS + 1 + plan["attachment_combos"].shape[1]
+        return np.zeros((0, len(front.senses))), np.zeros((0, n_payload), dtype=np.int64), front.count
+    return front.values, front.payload, front.count
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+
+def print_progress(done: int, total: int, weapon_name: str) -> None:
+    """Default progress callback: one line per finished shard on stderr."""
+    print(f"  [{done}/{total}] {weapon_name}", file=sys.stderr, flush=True)
+
+
+def search_weapons(
+    weapons: Sequence[Dict],
+    catalog: Dict,
+    objectives: Sequence[Tuple[str, str]] = DEFAULT_OBJECTIVES,
+    pool_size: int = 4,
+    max_oils: int = MAX_ENCHANTMENTS,
+    chunk_size: int = 1 << 18,
+    workers: Optional[int] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> Iterator[Dict]:
+    """Search many weapons in parallel, yielding each result as it completes.
+
+    Results are the same dicts :func:`scripts.pareto.explore_weapon` returns,
+    in completion order rather than input order.
+
+    Args:
+        weapons: Weapon entries from weapons.json.
+        catalog: Output of :func:`scripts.pareto.load_catalog`.
+        objectives: (stat, "max" | "min") pairs.
+        pool_size: Candidates kept per objective and item category.
+        max_oils: Maximum number of oils in a build.
+        chunk_size: Builds evaluated per batch inside a worker.
+        workers: Worker processes (default: ``os.cpu_count()``).
+        progress: Called as ``progress(done, total, weapon_name)`` after each
+            shard finishes.
+    """
+    space = search_space(catalog, objectives)
+    worker_space = {key: space[key] for key in _SPACE_KEYS}
+    workers = workers or os.cpu_count() or 1
+
+    with SharedTables(space["tables"]) as shared:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                   initargs=(shared.spec, worker_space))
+        try:
+            plans: Dict[int, Dict] = {}
+            fronts: Dict[int, FrontAccumulator] = {}
+            remaining: Dict[int, int] = {}
+            pending: Dict[Future, int] = {}
+            for index, weapon in enumerate(weapons):
+                plan = plan_weapon(weapon, catalog, space, pool_size, max_oils)
+                plans[index] = plan
+                fronts[index] = FrontAccumulator(space["senses"])
+                remaining[index] = len(plan["scrolls"])
+                task_plan = {key: plan[key] for key in _PLAN_KEYS}
+                for scroll in plan["scrolls"]:
+                    pending[pool.submit(_search_shard, task_plan, [scroll], chunk_size)] = index
+
+            total, done = len(pending), 0
+            while pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    index = pending.pop(future)
+                    values, payload, count = future.result()
+                    fronts[index].add(values, payload, count)
+                    done += 1
+                    if progress:
+                        progress(done, total, weapons[index]["name"])
+                    remaining[index] -= 1
+                    if not remaining[index]:
+                        yield format_front(weapons[index], space, plans.pop(index), fronts.pop(index))
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
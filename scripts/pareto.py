@@ -0,0 +1,477 @@
+"""Pareto-front explorer for multi-objective weapon builds.
+
+For each weapon, enumerates oil/scroll/attachment builds, evaluates them with
+the vectorized stacking rules and keeps only the non-dominated builds over a
+user-chosen set of stats (e.g. maximize Damage, minimize Spread and Recoil).
+
+Usage:
+    python -m scripts.pareto <data_dir> <output_dir> [--weapon NAME ...]
+        [--objective Damage:max --objective Spread:min ...]
+        [--pool-size 4] [--max-oils 5] [--chunk-size 262144] [--workers N]
+
+Writes one compact ``<weapon id>.json`` per weapon into output_dir. Items are
+first cut to the ``--pool-size`` best per objective; a file whose
+``approximate`` is true lost items to that cut, and its ``front`` is the
+front over the kept items only.
+
+Requires NumPy.
+"""
+
+import argparse
+import itertools
+import os
+import sys
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from scripts.calculator import CALIBER_STATS, round_stat
+from scripts.compatibility import compatible_attachments
+from scripts.data_io import write_json
+from scripts.extract_attachments import SLOT_TO_FILENAME
+from scripts.json_backend import load_json
+from scripts.vector_calculator import evaluate_builds, modifier_tables, stat_list, weapon_table
+
+DEFAULT_OBJECTIVES: List[Tuple[str, str]] = [
+    ("Damage", "max"),
+    ("Spread", "min"),
+    ("Recoil", "min"),
+    ("MoveSpeed", "max"),
+    ("Weight", "min"),
+]
+
+# Game limit: 5 oils, or 4 oils + 1 scroll
+MAX_ENCHANTMENTS = 5
+
+# Rows compared at once inside the non-dominated filter
+_BLOCK = 128
+
+
+# ---------------------------------------------------------------------------
+# Non-dominated sorting
+# ---------------------------------------------------------------------------
+
+
+def _dominated_by(candidates: np.ndarray, front: np.ndarray) -> np.ndarray:
+    """Mask of candidate rows weakly dominated by (or equal to) any front row."""
+    mask = np.zeros(len(candidates), dtype=bool)
+    if not len(front):
+        return mask
+    step = max(1, (1 << 22) // max(1, len(candidates) * candidates.shape[1]))
+    for start in range(0, len(front), step):
+        block = front[start:start + step]
+        mask |= (block[None, :, :] >= candidates[:, None, :]).all(axis=2).any(axis=1)
+    return mask
+
+
+def pareto_front(values: np.ndarray) -> np.ndarray:
+    """Return indices of the non-dominated rows of ``values`` (all objectives maximized).
+
+    Rows are visited in descending order of their objective sum, so a row can
+    only be dominated by rows visited before it. Each block of rows is reduced
+    to its own front, and the rows still unvisited are then filtered against
+    those new front members. Duplicate objective vectors are collapsed to
+    their first occurrence.
+
+    Args:
+        values: ``[N, d]`` objective matrix, larger is better in every column.
+
+    Returns:
+        Sorted array of row indices on the Pareto front.
+    """
+    if not len(values):
+        return np.zeros(0, dtype=np.int64)
+    remaining = np.argsort(-values.sum(axis=1), kind="stable")
+    front_rows: List[np.ndarray] = []
+
+    while len(remaining):
+        idx, remaining = remaining[:_BLOCK], remaining[_BLOCK:]
+        block = values[idx]
+        ge = (block[None, :, :] >= block[:, None, :]).all(axis=2)   # ge[i, j]: row j >= row i
+        gt = (block[None, :, :] > block[:, None, :]).any(axis=2)
+        dominated = (ge & gt).any(axis=1) | np.tril(ge & ~gt, -1).any(axis=1)
+        idx = idx[~dominated]
+        front_rows.append(idx)
+        # Drop every later row the new front members dominate before visiting it
+        if len(remaining):
+            remaining = remaining[~_dominated_by(values[remaining], values[idx])]
+
+    return np.sort(np.concatenate(front_rows)) if front_rows else np.zeros(0, dtype=np.int64)
+
+
+class FrontAccumulator:
+    """Streaming Pareto front over chunks of builds.
+
+    Each chunk is reduced to its own front and merged with the running front,
+    so memory stays proportional to the front size, not the candidate count.
+    """
+
+    def __init__(self, senses: np.ndarray):
+        self.senses = senses
+        self.values: Optional[np.ndarray] = None
+        self.payload: Optional[np.ndarray] = None
+        self.count = 0
+
+    def add(self, values: np.ndarray, payload: np.ndarray, count: Optional[int] = None) -> None:
+        """Add ``[B, d]`` objective values with matching ``[B, p]`` payload rows.
+
+        ``count`` is the number of builds the rows stand for, when they are
+        already a front (e.g. a shard's result); it defaults to ``B``.
+        """
+        self.count += len(values) if count is None else count
+        if not len(values):
+            return
+        scored = values * self.senses
+        _, first = np.unique(scored, axis=0, return_index=True)
+        chunk_front = first[pareto_front(scored[first])]
+        values, payload = values[chunk_front], payload[chunk_front]
+        if self.values is not None:
+            values = np.concatenate([self.values, values])
+            payload = np.concatenate([self.payload, payload])
+        merged = pareto_front(values * self.senses)
+        self.values, self.payload = values[merged], payload[merged]
+
+
+# ---------------------------------------------------------------------------
+# Catalog and candidates
+# ---------------------------------------------------------------------------
+
+
+def load_catalog(data_dir: str) -> Dict:
+    """Load the extracted JSON data files needed for build search."""
+    def _load(name: str):
+        return load_json(os.path.join(data_dir, name))
+
+    return {
+        "weapons": _load("weapons.json"),
+        "oils": _load("enchantments.json"),
+        "scrolls": _load("scrolls.json"),
+        "attachments": {slot: _load(filename) for slot, filename in SLOT_TO_FILENAME.items()},
+        "calibers": _load("caliber-modifiers.json"),
+    }
+
+
+def _pool(improvement: np.ndarray, pool_size: int) -> List[int]:
+    """Pick, per objective, the ``pool_size`` rows with the largest positive improvement."""
+    chosen: Dict[int, None] = {}
+    for col in range(improvement.shape[1]):
+        ranked = np.argsort(-improvement[:, col], kind="stable")[:pool_size]
+        chosen.update((int(row), None) for row in ranked if improvement[row, col] > 0)
+    return sorted(chosen)
+
+
+def _pool_truncated(improvement: np.ndarray, pool: Sequence[int]) -> bool:
+    """Whether :func:`_pool` dropped a row that improves some objective."""
+    return int((improvement > 0).any(axis=1).sum()) > len(pool)
+
+
+def _combinations(pool: Sequence[int], max_size: int, width: int) -> np.ndarray:
+    """All combinations of ``pool`` with up to ``max_size`` members, zero padded to ``width``."""
+    rows = [combo + (0,) * (width - len(combo))
+            for size in range(max_size + 1)
+            for combo in itertools.combinations(pool, size)]
+    return np.array(rows, dtype=np.int64).reshape(len(rows), width)
+
+
+def _build_chunks(
+    oil_combos: np.ndarray,
+    scroll_options: Sequence[int],
+    attachment_combos: np.ndarray,
+    chunk_size: int,
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Yield (enchantment_idx, attachment_idx) batches covering the whole build space."""
+    oil_counts = (oil_combos > 0).sum(axis=1)
+    n_att = len(attachment_combos)
+    att_step = min(n_att, chunk_size)
+    for scroll in scroll_options:
+        combos = oil_combos if scroll == 0 else oil_combos[oil_counts < MAX_ENCHANTMENTS]
+        oil_step = max(1, chunk_size // att_step)
+        for a0 in range(0, n_att, att_step):
+            atts = attachment_combos[a0:a0 + att_step]
+            for o0 in range(0, len(combos), oil_step):
+                oils = combos[o0:o0 + oil_step]
+                ench = np.repeat(oils, len(atts), axis=0)
+                ench = np.concatenate([ench, np.full((len(ench), 1), scroll, dtype=np.int64)], axis=1)
+                yield ench, np.tile(atts, (len(oils), 1))
+
+
+# ---------------------------------------------------------------------------
+# Per-weapon exploration
+# ---------------------------------------------------------------------------
+
+
+def search_space(catalog: Dict, objectives: Sequence[Tuple[str, str]] = DEFAULT_OBJECTIVES) -> Dict:
+    """Index every oil, scroll and attachment of the catalog for one set of objectives.
+
+    The modifier tables cover the whole catalog, so a single set of tables
+    serves every weapon; weapons differ only in which rows they may use.
+
+    Returns:
+        Dict with ``objectives``, ``stats`` (evaluated columns), ``columns``
+        (objective positions in ``stats``), ``senses`` (+1 max / -1 min),
+        ``enchantments`` and ``attachments`` (row lists, row 0 empty),
+        ``n_oils``, ``slot_rows`` (attachment rows per slot) and ``tables``
+        (output of :func:`modifier_tables`).
+    """
+    objective_stats = [stat for stat, _ in objectives]
+    stats = stat_list(objective_stats)
+    enchantments = [None] + catalog["oils"] + catalog["scrolls"]
+    attachments: List[Optional[Dict]] = [None]
+    slot_rows: Dict[str, List[int]] = {}
+    for slot, items in catalog["attachments"].items():
+        slot_rows[slot] = list(range(len(attachments), len(attachments) + len(items)))
+        attachments.extend(items)
+
+    return {
+        "objectives": list(objectives),
+        "stats": stats,
+        "columns": [stats.index(stat) for stat in objective_stats],
+        "senses": np.array([1.0 if goal == "max" else -1.0 for _, goal in objectives]),
+        "enchantments": enchantments,
+        "attachments": attachments,
+        "n_oils": len(catalog["oils"]),
+        "slot_rows": slot_rows,
+        "tables": modifier_tables(enchantments, attachments, stats, catalog["calibers"]),
+    }
+
+
+def _objective_values(space: Dict, tables: Dict, wtable: Dict, ench_idx: np.ndarray, att_idx: np.ndarray) -> np.ndarray:
+    return evaluate_builds(tables, wtable, space["stats"], ench_idx, att_idx)[:, space["columns"]]
+
+
+def plan_weapon(
+    weapon: Dict,
+    catalog: Dict,
+    space: Dict,
+    pool_size: int = 4,
+    max_oils: int = MAX_ENCHANTMENTS,
+) -> Dict:
+    """Prune the candidate items for one weapon.
+
+    Candidate items are pruned to those that improve at least one objective
+    when applied alone; per objective, only the ``pool_size`` best oils,
+    scrolls and attachments of each slot are kept. The second cut is a
+    heuristic: an item that is second best on several objectives can be
+    dropped, so the front is then exact only over the kept items.
+
+    Returns:
+        Dict with ``weapon`` (output of :func:`weapon_table`), ``slot_names``,
+        ``oil_combos`` ``[O, 5]``, ``scrolls`` (scroll rows, 0 = no scroll),
+        ``attachment_combos`` ``[A, len(slot_names)]``, ``pool_size`` and
+        ``approximate`` (True when the ``pool_size`` cut dropped an item).
+    """
+    objective_stats = [stat for stat, _ in space["objectives"]]
+    senses = space["senses"]
+    tables = space["tables"]
+    wtable = weapon_table(weapon, space["stats"], catalog["calibers"])
+
+    compatible = compatible_attachments(weapon, catalog["attachments"])
+    if not any(stat in CALIBER_STATS for stat in objective_stats):
+        compatible.pop("chisel", None)
+    slot_rows: Dict[str, List[int]] = {}
+    for slot, items in compatible.items():
+        allowed = {id(item) for item in items}
+        slot_rows[slot] = [row for row in space["slot_rows"][slot] if id(space["attachments"][row]) in allowed]
+    slot_names = list(slot_rows)
+    width = max(1, len(slot_names))
+
+    baseline = _objective_values(space, tables, wtable, np.zeros((1, 1), dtype=np.int64),
+                                 np.zeros((1, width), dtype=np.int64))
+
+    def _improvement(ench_rows: List[int], att_rows: List[int], att_col: int = 0) -> np.ndarray:
+        n = len(ench_rows) or len(att_rows)
+        ench_idx = np.array(ench_rows or [0] * n, dtype=np.int64).reshape(n, 1)
+        att_idx = np.zeros((n, width), dtype=np.int64)
+        if att_rows:
+            att_idx[:, att_col] = att_rows
+        return (_objective_values(space, tables, wtable, ench_idx, att_idx) - baseline) * senses
+
+    approximate = False
+
+    def _pick(rows: List[int], improvement: np.ndarray) -> List[int]:
+        nonlocal approximate
+        pool = _pool(improvement, pool_size)
+        approximate = approximate or _pool_truncated(improvement, pool)
+        return [rows[i] for i in pool]
+
+    oil_rows = list(range(1, space["n_oils"] + 1))
+    scroll_rows = list(range(space["n_oils"] + 1, len(space["enchantments"])))
+    oil_pool = _pick(oil_rows, _improvement(oil_rows, [])) if oil_rows else []
+    scroll_pool = _pick(scroll_rows, _improvement(scroll_rows, [])) if scroll_rows else []
+
+    per_slot: List[List[int]] = []
+    for col, slot in enumerate(slot_names):
+        rows = slot_rows[slot]
+        picked = _pick(rows, _improvement([], rows, col)) if rows else []
+        per_slot.append([0] + picked)
+
+    attachment_combos = np.array(list(itertools.product(*per_slot)) or [()], dtype=np.int64)
+    if attachment_combos.shape[1] == 0:
+        attachment_combos = np.zeros((1, 1), dtype=np.int64)
+
+    return {
+        "weapon": wtable,
+        "slot_names": slot_names,
+        "oil_combos": _combinations(oil_pool, min(max_oils, MAX_ENCHANTMENTS), MAX_ENCHANTMENTS),
+        "scrolls": [0] + scroll_pool,
+        "attachment_combos": attachment_combos,
+        "pool_size": pool_size,
+        "approximate": approximate,
+    }
+
+
+def search_plan(
+    space: Dict,
+    tables: Dict,
+    plan: Dict,
+    scrolls: Optional[Sequence[int]] = None,
+    chunk_size: int = 1 << 18,
+) -> FrontAccumulator:
+    """Evaluate every build of a plan and return the accumulated front.
+
+    Args:
+        space: Output of :func:`search_space`.
+        tables: Modifier tables to evaluate with (``space["tables"]`` or a
+            shared-memory view of them).
+        plan: Output of :func:`plan_weapon`.
+        scrolls: Subset of ``plan["scrolls"]`` to search (default: all).
+        chunk_size: Builds evaluated per batch.
+    """
+    front = FrontAccumulator(space["senses"])
+    chunks = _build_chunks(plan["oil_combos"], plan["scrolls"] if scrolls is None else scrolls,
+                           plan["attachment_combos"], chunk_size)
+    for ench_idx, att_idx in chunks:
+        values = _objective_values(space, tables, plan["weapon"], ench_idx, att_idx)
+        front.add(values, np.concatenate([ench_idx, att_idx], axis=1))
+    return front
+
+
+def format_front(weapon: Dict, space: Dict, plan: Dict, front: FrontAccumulator) -> Dict:
+    """Turn an accumulated front into the JSON result for one weapon.
+
+    ``approximate`` is True when :func:`plan_weapon` cut candidates to
+    ``pool_size``, so ``front`` may miss trade-off builds of the full space.
+    """
+    objective_stats = [stat for stat, _ in space["objectives"]]
+    senses = space["senses"]
+    enchantments = space["enchantments"]
+    attachments = space["attachments"]
+
+    builds = []
+    if front.values is not None:
+        order = np.argsort(-front.values[:, 0] * senses[0], kind="stable")
+        for row in order:
+            payload = front.payload[row]
+            oils = [enchantments[i]["id"] for i in payload[:MAX_ENCHANTMENTS] if i]
+            scroll = int(payload[MAX_ENCHANTMENTS])
+            picked = {slot: attachments[i]["id"]
+                      for slot, i in zip(plan["slot_names"], payload[MAX_ENCHANTMENTS + 1:]) if i}
+            builds.append({
+                "scroll": enchantments[scroll]["id"] if scroll else None,
+                "oils": oils,
+                "attachments": picked,
+                "stats": {stat: round_stat(float(v)) for stat, v in zip(objective_stats, front.values[row])},
+            })
+
+    return {
+        "weapon": weapon["id"],
+        "name": weapon["name"],
+        "objectives": [{"stat": stat, "goal": goal} for stat, goal in space["objectives"]],
+        "candidates": front.count,
+        "pool_size": plan["pool_size"],
+        "approximate": plan["approximate"],
+        "front": builds,
+    }
+
+
+def explore_weapon(
+    weapon: Dict,
+    catalog: Dict,
+    objectives: Sequence[Tuple[str, str]] = DEFAULT_OBJECTIVES,
+    pool_size: int = 4,
+    max_oils: int = MAX_ENCHANTMENTS,
+    chunk_size: int = 1 << 18,
+    space: Optional[Dict] = None,
+) -> Dict:
+    """Compute the Pareto front of builds for one weapon.
+
+    Candidates are pruned by :func:`plan_weapon`; every combination of the
+    remaining candidates is then evaluated.
+
+    Args:
+        weapon: A weapon entry from weapons.json.
+        catalog: Output of :func:`load_catalog`.
+        objectives: (stat, "max" | "min") pairs.
+        pool_size: Candidates kept per objective and item category.
+        max_oils: Maximum number of oils in a build.
+        chunk_size: Builds evaluated per batch.
+        space: Precomputed :func:`search_space` for ``objectives``, reused
+            across weapons.
+
+    Returns:
+        A JSON-serializable dict with the objectives, candidate count, the
+        pruning (``pool_size``, ``approximate``) and the front builds (item
+        ids plus rounded objective values).
+    """
+    space = space or search_space(catalog, objectives)
+    plan = plan_weapon(weapon, catalog, space, pool_size, max_oils)
+    front = search_plan(space, space["tables"], plan, chunk_size=chunk_size)
+    return format_front(weapon, space, plan, front)
+
+
+def _parse_objective(raw: str) -> Tuple[str, str]:
+    stat, _, goal = raw.partition(":")
+    goal = goal.lower() or "max"
+    if goal not in ("max", "min"):
+        raise argparse.ArgumentTypeError(f"objective goal must be 'max' or 'min': {raw}")
+    return stat, goal
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compute Pareto fronts of weapon builds")
+    parser.add_argument("data_dir", help="Directory with the extracted JSON data")
+    parser.add_argument("output_dir", help="Directory for per-weapon front JSON files")
+    parser.add_argument("--weapon", action="append", help="Weapon name or id (default: all)")
+    parser.add_argument("--objective", action="append", type=_parse_objective,
+                        help="Stat:max or Stat:min (default: Damage, Spread, Recoil, MoveSpeed, Weight)")
+    parser.add_argument("--pool-size", type=int, default=4, help="Candidates kept per objective and category")
+    parser.add_argument("--max-oils", type=int, default=MAX_ENCHANTMENTS, help="Maximum oils per build")
+    parser.add_argument("--chunk-size", type=int, default=1 << 18, help="Builds evaluated per batch")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes; 0 uses every CPU (default: 1, no pool)")
+    args = parser.parse_args(argv)
+
+    catalog = load_catalog(args.data_dir)
+    weapons = catalog["weapons"]
+    if args.weapon:
+        wanted = set(args.weapon)
+        weapons = [w for w in weapons if w["name"] in wanted or w["id"] in wanted]
+        if not weapons:
+            print(f"Error: no weapons match {sorted(wanted)}")
+            sys.exit(1)
+
+    objectives = args.objective or DEFAULT_OBJECTIVES
+    os.makedirs(args.output_dir, exist_ok=True)
+    if args.workers == 1:
+        space = search_space(catalog, objectives)
+        results = (
+            explore_weapon(weapon, catalog, objectives, pool_size=args.pool_size, max_oils=args.max_oils,
+                           chunk_size=args.chunk_size, space=space)
+            for weapon in weapons
+        )
+    else:
+        # Imported here: scripts.parallel_search builds on this module
+        from scripts.parallel_search import print_progress, search_weapons
+        results = search_weapons(
+            weapons, catalog, objectives, pool_size=args.pool_size, max_oils=args.max_oils,
+            chunk_size=args.chunk_size, workers=args.workers or None, progress=print_progress,
+        )
+
+    for result in results:
+        path = os.path.join(args.output_dir, f"{result['weapon']}.json")
+        write_json(path, result, pretty=False)
+        print(f"{result['name']}: {len(result['front'])} front builds of {result['candidates']:,} -> {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""Timing instrumentation for ``update_all --profile``.
+
+A :class:`Profiler` records, per named stage:
+
+- wall and CPU seconds (``time.process_time``, all threads of the process);
+- ``<page>`` elements read and pages yielded by
+  :func:`scripts.wiki_parser.iterate_pages`, and the seconds spent inside it
+  (XML parsing and page filtering). The rest of an extractor stage is
+  wikitext parsing (infobox regexes, description parsing) in the extractor;
+- calls to the module-level :mod:`re` functions (``re.search``,
+  ``re.finditer``, ...) with their total seconds, per calling module and
+  pattern.
+
+Regex counting wraps those functions for the duration of the run, which
+makes each call a little slower; calls on precompiled patterns are not
+counted. Optionally the whole run is also recorded with :mod:`cProfile` and
+dumped for ``pstats``/snakeviz.
+
+Disabled profilers cost nothing: :meth:`Profiler.stage` is a no-op.
+"""
+
+import contextlib
+import cProfile
+import functools
+import pstats
+import re
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from scripts import wiki_parser
+
+REPORT_FORMAT = 1
+
+# Module-level re functions that are wrapped while counting
+_REGEX_FUNCTIONS = ("search", "match", "fullmatch", "finditer", "findall", "sub", "subn", "split")
+
+# Longest pattern text kept in the report
+_PATTERN_CHARS = 80
+
+
+class Profiler:
+    """Collects per-stage timings for one pipeline run.
+
+    Args:
+        enabled: When False every method is a no-op.
+        count_regex: Count module-level ``re`` calls while :meth:`running`.
+        cprofile_path: Also run cProfile and dump its stats here.
+    """
+
+    def __init__(self, enabled: bool = True, count_regex: bool = True, cprofile_path: Optional[str] = None):
+        self.enabled = enabled
+        self.count_regex = count_regex and enabled
+        self.cprofile_path = cprofile_path if enabled else None
+        self.stages: List[Dict[str, Any]] = []
+        self.regex: Dict[Tuple[str, str, str], List[float]] = {}
+        self.extra: Dict[str, Any] = {}
+        self._wall = 0.0
+        self._cpu = 0.0
+
+    # -- recording ---------------------------------------------------------
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the block as stage ``name``."""
+        if not self.enabled:
+            yield
+            return
+        parse_before = dict(wiki_parser.PARSE_STATS)
+        regex_before = self._regex_totals()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            regex_calls, regex_seconds = self._regex_totals()
+            self.stages.append({
+                "name": name,
+                "wall": time.perf_counter() - wall,
+                "cpu": time.process_time() - cpu,
+                "pages_read": wiki_parser.PARSE_STATS["pages"] - parse_before["pages"],
+                "pages_yielded": wiki_parser.PARSE_STATS["yielded"] - parse_before["yielded"],
+                "xml_seconds": wiki_parser.PARSE_STATS["seconds"] - parse_before["seconds"],
+                "regex_calls": regex_calls - regex_before[0],
+                "regex_seconds": regex_seconds - regex_before[1],
+            })
+
+    @contextlib.contextmanager
+    def running(self) -> Iterator[None]:
+        """Wrap the whole run: total timers, regex counting and cProfile."""
+        if not self.enabled:
+            yield
+            return
+        profile = cProfile.Profile() if self.cprofile_path else None
+        wall, cpu = time.perf_counter(), time.process_time()
+        with contextlib.ExitStack() as stack:
+            if self.count_regex:
+                stack.enter_context(self._counting_regex())
+            if profile is not None:
+                profile.enable()
+                stack.callback(profile.disable)
+            try:
+                yield
+            finally:
+                self._wall = time.perf_counter() - wall
+                self._cpu = time.process_time() - cpu
+        if profile is not None:
+            profile.dump_stats(self.cprofile_path)
+
+    def _regex_totals(self) -> Tuple[int, float]:
+        return (int(sum(calls for calls, _ in self.regex.values())),
+                sum(seconds for _, seconds in self.regex.values()))
+
+    @contextlib.contextmanager
+    def _counting_regex(self) -> Iterator[None]:
+        originals = {name: getattr(re, name) for name in _REGEX_FUNCTIONS}
+
+        def _wrap(name: str, func):
+            @functools.wraps(func)
+            def counted(pattern, *args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(pattern, *args, **kwargs)
+                finally:
+                    elapsed = time.perf_counter() - start
+                    caller = sys._getframe(1).f_globals.get("__name__", "?")
+                    text = pattern.pattern if isinstance(pattern, re.Pattern) else pattern
+                    if isinstance(text, bytes):
+                        text = text.decode("latin-1")
+                    entry = self.regex.setdefault((caller, name, text[:_PATTERN_CHARS]), [0, 0.0])
+                    entry[0] += 1
+                    entry[1] += elapsed
+            return counted
+
+        for name, func in originals.items():
+            setattr(re, name, _wrap(name, func))
+        try:
+            yield
+        finally:
+            for name, func in originals.items():
+                setattr(re, name, func)
+
+    # -- reporting ---------------------------------------------------------
+
+    def report(self, top: int = 20) -> Dict[str, Any]:
+        """Machine-readable report (also what ``--profile-report`` writes)."""
+        regex = sorted(self.regex.items(), key=lambda item: item[1][1], reverse=True)
+        return {
+            "format": REPORT_FORMAT,
+            "wall": self._wall,
+            "cpu": self._cpu,
+            "stages": self.stages,
+            "regex": [
+                {"module": module, "function": function, "pattern": pattern, "calls": calls, "seconds": seconds}
+                for (module, function, pattern), (calls, seconds) in regex[:top]
+            ],
+            **self.extra,
+        }
+
+    def print_report(self, top: int = 10) -> None:
+        """Print the stage table, the costliest regexes and the cProfile top functions."""
+        print(f"  {'stage':<26} {'wall s':>8} {'cpu s':>8} {'xml s':>8} {'pages':>8} {'pages/s':>9} {'regex':>9}")
+        for stage in self.stages:
+            rate = stage["pages_read"] / stage["wall"] if stage["pages_read"] and stage["wall"] else 0
+            print(f"  {stage['name']:<26} {stage['wall']:8.3f} {stage['cpu']:8.3f} {stage['xml_seconds']:8.3f} "
+                  f"{stage['pages_read']:>8} {rate:>9,.0f} {stage['regex_calls']:>9,}")
+        print(f"  {'total':<26} {self._wall:8.3f} {self._cpu:8.3f}")
+
+        if self.regex:
+            print(f"\n  Costliest regex calls (of {self._regex_totals()[0]:,}):")
+            for entry in self.report(top)["regex"]:
+                print(f"  {entry['seconds']:8.3f} s {entry['calls']:>9,}  {entry['module']}.{entry['function']} "
+                      f"{entry['pattern']!r}")
+
+        if self.cprofile_path:
+            print(f"\n  cProfile stats -> {self.cprofile_path}; top functions by cumulative time:")
+            pstats.Stats(self.cprofile_path, stream=sys.stdout).sort_stats("cumulative").print_stats(top)
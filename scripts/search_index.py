@@ -0,0 +1,300 @@
+"""Prebuilt search index over weapons, oils, scrolls and attachments.
+
+The frontend selectors otherwise filter their full lists with substring
+matching on every keystroke. ``search-index.json`` lets both the frontend and
+Python tooling answer queries from posting lists instead:
+
+    {
+      "format": 1,
+      "documents": [["oil", "Action_Oil", "Action Oil"], ...],
+      "tokens": ["0.8", "action", ...],
+      "postings": [[12, 40], [0], ...],
+      "trigrams": {"act": [1, 57], ...},
+      "modifiers": {"Damage:PercentAdd": [[3, 0.2], ...], ...}
+    }
+
+- ``documents`` lists (kind, id, name) with kind one of ``weapon``, ``oil``,
+  ``scroll`` and ``attachment``; postings refer to documents by position.
+- ``tokens`` is the sorted vocabulary of the searchable text (name, type,
+  stats, modifiers, effects, description) and ``postings[i]`` the documents
+  containing ``tokens[i]``. Terms shorter than three characters are matched
+  as token prefixes by bisecting ``tokens``.
+- ``trigrams`` maps every trigram of the vocabulary to the tokens containing
+  it, so longer terms match anywhere inside a token ("amage" -> "damage").
+- ``modifiers`` maps ``Stat:Type`` to (document, value) pairs. Oils and
+  scrolls use their modType name (Flat, PercentAdd, PercentMult); attachments
+  use ``Flat`` or ``Percent``.
+
+Query from Python::
+
+    index = load_search_index("public/data")
+    index.search("silencer", kind="attachment")
+    index.with_modifier("Damage", "PercentAdd", sign="+", kind="oil")
+    index.query("kind:oil +Damage:PercentAdd")
+"""
+
+import bisect
+import os
+import re
+import sys
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from scripts.calculator import MOD_TYPE_NAMES, attachment_modifiers, enchantment_modifiers
+from scripts.compatibility import load_attachments_by_slot
+from scripts.data_io import atomic_write
+from scripts.json_backend import dumps, load_json
+
+SEARCH_INDEX_FILENAME = "search-index.json"
+SEARCH_INDEX_FORMAT = 1
+
+KINDS = ("weapon", "oil", "scroll", "attachment")
+
+# Words, numbers and dotted calibers ("7.62mm") - must match src/searchIndex.js
+_TOKEN = re.compile(r"[a-z0-9]+(?:\.[a-z0-9]+)*")
+
+_MOD_TYPE_LABELS: Dict[Optional[int], str] = {value: name for name, value in MOD_TYPE_NAMES.items()}
+
+# "+Damage:PercentAdd", "-Recoil", "Spread:Flat" in query strings
+_MODIFIER_TERM = re.compile(r"^(?P<sign>[+-]?)(?P<stat>[A-Za-z][A-Za-z0-9]*):?(?P<type>[A-Za-z]*)$")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase search tokens."""
+    return _TOKEN.findall(text.lower())
+
+
+def trigrams(token: str) -> Set[str]:
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+# ---------------------------------------------------------------------------
+# Documents
+# ---------------------------------------------------------------------------
+
+
+def item_modifiers(kind: str, item: Dict) -> List[Tuple[str, str, float]]:
+    """(stat, type label, value) for every modifier of an item."""
+    if kind == "attachment":
+        return [(stat, "Percent" if is_percent else "Flat", value)
+                for stat, value, is_percent in attachment_modifiers(item)]
+    if kind in ("oil", "scroll"):
+        return [(stat, _MOD_TYPE_LABELS.get(mod_type, "Unknown"), value)
+                for stat, mod_type, value in enchantment_modifiers(item)]
+    return []
+
+
+def _search_text(kind: str, item: Dict) -> str:
+    """The text the frontend selectors match against, as one string."""
+    parts = [item.get("name", ""), item.get("type") or "", item.get("ammoType") or "", item.get("rarity") or ""]
+    stats = item.get("baseStats") or item.get("base_stats") or {}
+    parts.extend(f"{stat} {value}" for stat, value in stats.items())
+    parts.extend(f"{stat} {label} {value}" for stat, label, value in item_modifiers(kind, item))
+    parts.extend(f"{key} {value}" for key, value in (item.get("specialEffects") or {}).items())
+    parts.extend(item.get("effects") or [])
+    parts.append(item.get("description") or "")
+    return " ".join(str(part) for part in parts)
+
+
+def load_documents(data_dir: str) -> List[Tuple[str, Dict]]:
+    """Read (kind, item) pairs from the extracted data files (missing files are skipped)."""
+    def _load(filename: str) -> List[Dict]:
+        path = os.path.join(data_dir, filename)
+        if not os.path.exists(path):
+            return []
+        return load_json(path)
+
+    documents = [("weapon", item) for item in _load("weapons.json")]
+    documents += [("oil", item) for item in _load("enchantments.json")]
+    documents += [("scroll", item) for item in _load("scrolls.json")]
+    for items in load_attachments_by_slot(data_dir).values():
+        documents += [("attachment", item) for item in items]
+    return documents
+
+
+# ---------------------------------------------------------------------------
+# Build
+# ---------------------------------------------------------------------------
+
+
+def build_search_index(documents: Iterable[Tuple[str, Dict]]) -> Dict:
+    """Build the serializable index from (kind, item) pairs."""
+    entries: List[List[str]] = []
+    token_docs: Dict[str, Set[int]] = {}
+    modifiers: Dict[str, List[List]] = {}
+
+    for doc, (kind, item) in enumerate(documents):
+        entries.append([kind, item["id"], item["name"]])
+        for token in tokenize(_search_text(kind, item)):
+            token_docs.setdefault(token, set()).add(doc)
+        for stat, label, value in item_modifiers(kind, item):
+            modifiers.setdefault(f"{stat}:{label}", []).append([doc, value])
+
+    tokens = sorted(token_docs)
+    grams: Dict[str, List[int]] = {}
+    for position, token in enumerate(tokens):
+        for gram in sorted(trigrams(token)):
+            grams.setdefault(gram, []).append(position)
+
+    return {
+        "format": SEARCH_INDEX_FORMAT,
+        "documents": entries,
+        "tokens": tokens,
+        "postings": [sorted(token_docs[token]) for token in tokens],
+        "trigrams": dict(sorted(grams.items())),
+        "modifiers": dict(sorted(modifiers.items())),
+    }
+
+
+def write_search_index(data_dir: str, output_path: Optional[str] = None) -> Dict:
+    """Build the index from the data files in ``data_dir`` and write it.
+
+    Args:
+        data_dir: Directory containing the extracted data files.
+        output_path: Destination (default: ``data_dir/search-index.json``).
+
+    Returns:
+        The index that was written.
+    """
+    index = build_search_index(load_documents(data_dir))
+    output_path = output_path or os.path.join(data_dir, SEARCH_INDEX_FILENAME)
+    payload = dumps(index)
+    with atomic_write(output_path, "wb") as f:
+        f.write(payload)
+
+    print(f"Indexed {len(index['documents'])} items, {len(index['tokens'])} tokens, "
+          f"{len(index['modifiers'])} modifier keys -> {output_path}")
+    return index
+
+
+# ---------------------------------------------------------------------------
+# Query
+# ---------------------------------------------------------------------------
+
+
+class SearchIndex:
+    """Query API over a built or loaded index.
+
+    Results are document dicts ``{"kind", "id", "name"}`` in index order
+    (weapons, oils, scrolls, then attachments, each in file order).
+    """
+
+    def __init__(self, index: Dict):
+        self.documents = [{"kind": kind, "id": id_, "name": name} for kind, id_, name in index["documents"]]
+        self.tokens: List[str] = index["tokens"]
+        self._postings = [frozenset(docs) for docs in index["postings"]]
+        self._trigrams = {gram: frozenset(positions) for gram, positions in index["trigrams"].items()}
+        self._modifiers: Dict[str, List[List]] = index["modifiers"]
+        self._by_kind = {kind: frozenset(i for i, doc in enumerate(self.documents) if doc["kind"] == kind)
+                         for kind in KINDS}
+
+    def _term_docs(self, term: str) -> Set[int]:
+        """Documents with a token containing ``term`` (a token prefix for short terms)."""
+        if len(term) < 3:
+            start = bisect.bisect_left(self.tokens, term)
+            end = bisect.bisect_left(self.tokens, term + "\uffff", start)
+            positions: Iterable[int] = range(start, end)
+        else:
+            gram_sets = sorted((self._trigrams.get(gram, frozenset()) for gram in trigrams(term)), key=len)
+            candidates = gram_sets[0].intersection(*gram_sets[1:])
+            positions = (p for p in candidates if term in self.tokens[p])
+        docs: Set[int] = set()
+        for position in positions:
+            docs |= self._postings[position]
+        return docs
+
+    def _match(self, text: str, kind: Optional[str]) -> Optional[Set[int]]:
+        docs: Optional[Set[int]] = set(self._by_kind[kind]) if kind else None
+        for term in tokenize(text):
+            term_docs = self._term_docs(term)
+            docs = term_docs if docs is None else docs & term_docs
+            if not docs:
+                break
+        return docs
+
+    def search_ids(self, text: str, kind: Optional[str] = None) -> Optional[Set[str]]:
+        """Ids of the items matching every term of ``text``, or None for an empty query."""
+        docs = self._match(text, None)
+        if docs is None:
+            return None
+        return {self.documents[doc]["id"] for doc in docs if not kind or self.documents[doc]["kind"] == kind}
+
+    def search(self, text: str, kind: Optional[str] = None) -> List[Dict]:
+        """Items whose text contains every term of ``text`` (all items of ``kind`` for an empty query)."""
+        docs = self._match(text, kind)
+        if docs is None:
+            docs = set(range(len(self.documents)))
+        return [self.documents[doc] for doc in sorted(docs)]
+
+    def with_modifier(
+        self,
+        stat: str,
+        mod_type: Optional[str] = None,
+        sign: Optional[str] = None,
+        kind: Optional[str] = None,
+    ) -> List[Dict]:
+        """Items with a modifier on ``stat``.
+
+        Args:
+            stat: Attribute name, e.g. ``Damage``.
+            mod_type: ``Flat``, ``PercentAdd``, ``PercentMult`` or ``Percent``
+                (attachments); any type if omitted.
+            sign: ``+`` for positive values, ``-`` for negative ones.
+            kind: Restrict to one document kind.
+
+        Returns:
+            Document dicts with an added ``value`` (one entry per matching
+            modifier), in index order.
+        """
+        keys = [f"{stat}:{mod_type}"] if mod_type else [key for key in self._modifiers if key.split(":")[0] == stat]
+        matches = []
+        for key in keys:
+            for doc, value in self._modifiers.get(key, []):
+                if sign == "+" and value <= 0 or sign == "-" and value >= 0:
+                    continue
+                if kind and self.documents[doc]["kind"] != kind:
+                    continue
+                matches.append((doc, {**self.documents[doc], "modifier": key, "value": value}))
+        return [match for _, match in sorted(matches, key=lambda m: m[0])]
+
+    def query(self, text: str) -> List[Dict]:
+        """Combined query string: ``kind:<kind>``, ``[+|-]Stat[:Type]`` filters and free text.
+
+        A term counts as a modifier filter when it names a modifier key of the
+        index (case-sensitive, e.g. ``+Damage:PercentAdd``); other terms are
+        free text. Example: ``"kind:oil +Damage:PercentAdd reload"``.
+        """
+        kind = None
+        filters: List[Tuple[str, str, str]] = []
+        words = []
+        stats = {key.split(":")[0] for key in self._modifiers}
+        for term in text.split():
+            if term.startswith("kind:"):
+                kind = term[5:]
+                continue
+            match = _MODIFIER_TERM.match(term)
+            if match and match["stat"] in stats:
+                filters.append((match["stat"], match["type"], match["sign"]))
+            else:
+                words.append(term)
+
+        results = self.search(" ".join(words), kind)
+        for stat, mod_type, sign in filters:
+            allowed = {doc["id"] for doc in self.with_modifier(stat, mod_type or None, sign or None, kind)}
+            results = [doc for doc in results if doc["id"] in allowed]
+        return results
+
+
+def load_search_index(data_dir: str) -> SearchIndex:
+    return SearchIndex(load_json(os.path.join(data_dir, SEARCH_INDEX_FILENAME)))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python3 -m scripts.search_index <data_dir> [query ...]")
+        sys.exit(1)
+
+    if len(sys.argv) > 2:
+        for doc in load_search_index(sys.argv[1]).query(" ".join(sys.argv[2:])):
+            print(f"  {doc['kind']:<10} {doc['id']:<40} {doc['name']}")
+    else:
+        write_search_index(sys.argv[1])
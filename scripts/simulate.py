@@ -0,0 +1,545 @@
+"""Monte Carlo time-to-kill and sustained-DPS simulator for resolved builds.
+
+Takes a resolved stat vector (weapon base stats with oils, scrolls and
+attachments applied by :mod:`scripts.calculator`) and estimates expected and
+percentile time-to-kill and sustained DPS against a configurable target.
+
+Model:
+
+- ``Damage`` is per projectile; every shot fires ``ProjectileCount`` pellets.
+- Pellets land uniformly inside a cone of half-angle ``Spread`` degrees. A
+  pellet hits when it lands within ``radius`` of the target centre at
+  ``distance``; a hit is a headshot with probability ``head_fraction``.
+- Each hitting pellet crits independently with ``CritChance`` (or the ADS
+  total when ``ads`` is set). Crit and headshot multipliers stack.
+- Shots are ``60 / RPM`` seconds apart. A shot uses a round with probability
+  ``AmmoConsumeChance``; an empty ``MagazineSize`` magazine costs
+  ``reload_time / ReloadSpeed`` seconds.
+- For DPS, each hitting pellet also damages up to ``BulletPenetrations``
+  further enemies when ``targets`` enemies are lined up.
+
+Stats the weapon data does not carry (ReloadSpeed, AmmoConsumeChance,
+CritChance, BulletPenetrations) start from SIMULATION_DEFAULTS, so oil
+percentages apply to a neutral base instead of zero.
+
+Shots to kill are drawn from the exact distribution of the damaging shots
+needed (a first-passage table over the lattice convolution of
+:func:`cycle_distribution`) plus a negative binomial number of misses, and
+per-cycle damage from the exact joint distribution of shots and damage per
+magazine. Each trial costs a few draws however many shots it takes, so 10^6
+trials run in under a second on one core. Multipliers without a small common
+unit fall back to drawing the damaging shots one by one.
+
+Usage:
+    python -m scripts.simulate <data_dir> --weapon NAME [--oil ID ...]
+        [--scroll ID] [--attachment ID ...] [--trials 1000000]
+        [--health 500] [--distance 10] [--radius 0.5] [--ads] ...
+
+Requires NumPy.
+"""
+
+import argparse
+import json
+import math
+import sys
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from scripts.calculator import calculate_modified_stats
+from scripts.pareto import load_catalog
+
+# Neutral values for stats that only exist as modifiers
+SIMULATION_DEFAULTS: Dict[str, float] = {
+    "ReloadSpeed": 1.0,
+    "AmmoConsumeChance": 1.0,
+    "CritChance": 0.0,
+    "BulletPenetrations": 0.0,
+}
+
+DEFAULT_TARGET: Dict[str, float] = {
+    "health": 500.0,          # hit points
+    "distance": 10.0,         # metres
+    "radius": 0.5,            # effective hitbox radius in metres
+    "head_fraction": 0.1,     # share of hits that are headshots
+    "head_multiplier": 2.0,
+    "crit_multiplier": 2.0,
+    "reload_time": 2.0,       # seconds at ReloadSpeed 1
+    "targets": 1,             # enemies lined up, for penetration
+    "ads": False,             # use ADSCritChance instead of CritChance
+}
+
+DEFAULT_PERCENTILES: Tuple[float, ...] = (10, 50, 90, 99)
+
+# Shots after which a trial counts as never killing
+MAX_SHOTS = 100_000
+
+# Upper bound on values drawn per TTK step
+_BATCH = 1 << 22
+
+# Resolution of the per-shot sampling table
+_TABLE_BITS = 16
+
+# Size limits of the exact per-cycle table (see cycle_distribution)
+_MAX_CYCLE_ROWS = 4096
+_MAX_CYCLE_CELLS = 1 << 24
+
+# Cost limit (multiply-adds) of the exact hits-to-kill table
+_MAX_KILL_WORK = 1 << 28
+
+
+# ---------------------------------------------------------------------------
+# Stat resolution
+# ---------------------------------------------------------------------------
+
+
+def resolve_stats(
+    weapon: Dict,
+    attachments: Sequence[Dict] = (),
+    enchantments: Sequence[Dict] = (),
+    caliber_modifiers: Optional[Dict] = None,
+) -> Dict[str, float]:
+    """Apply a build to a weapon and return the full stat vector for simulation."""
+    base = dict(SIMULATION_DEFAULTS)
+    base.update(weapon.get("baseStats") or {})
+    rows = calculate_modified_stats(dict(weapon, baseStats=base), list(attachments), list(enchantments),
+                                    caliber_modifiers)
+    stats = dict(base)
+    for row in rows or []:
+        stats[row["stat"]] = row["modifiedValue"]
+    return stats
+
+
+# ---------------------------------------------------------------------------
+# Per-shot damage distribution
+# ---------------------------------------------------------------------------
+
+
+def hit_probability(spread: float, distance: float, radius: float) -> float:
+    """Chance that one pellet lands within ``radius`` of the aim point."""
+    if spread <= 0 or distance <= 0:
+        return 1.0
+    cone = distance * math.tan(math.radians(min(spread, 89.0)))
+    return min(1.0, (radius / cone) ** 2)
+
+
+def _pellet_outcomes(stats: Dict[str, float], target: Dict) -> Tuple[np.ndarray, np.ndarray]:
+    """Probabilities and damage multipliers of miss / body / body crit / head / head crit."""
+    p_hit = hit_probability(stats.get("Spread", 0.0), target["distance"], target["radius"])
+    crit = stats.get("ADSCritChance", stats.get("CritChance", 0.0)) if target["ads"] else stats.get("CritChance", 0.0)
+    crit = min(max(crit, 0.0), 1.0)
+    head = min(max(target["head_fraction"], 0.0), 1.0)
+    cm, hm = target["crit_multiplier"], target["head_multiplier"]
+    probs = np.array([
+        1.0 - p_hit,
+        p_hit * (1 - head) * (1 - crit),
+        p_hit * (1 - head) * crit,
+        p_hit * head * (1 - crit),
+        p_hit * head * crit,
+    ])
+    return probs, np.array([0.0, 1.0, cm, hm, hm * cm])
+
+
+def shot_distribution(stats: Dict[str, float], target: Dict) -> Tuple[np.ndarray, np.ndarray]:
+    """Exact distribution of the damage one shot deals to the primary target.
+
+    Returns:
+        (values, cdf): sorted distinct damage values and their cumulative
+        probabilities.
+    """
+    probs, multipliers = _pellet_outcomes(stats, target)
+    pellets = max(1, int(round(stats.get("ProjectileCount", 1.0))))
+    damage = max(stats.get("Damage", 0.0), 0.0)
+
+    dist: Dict[float, float] = {0.0: 1.0}
+    for _ in range(pellets):
+        step: Dict[float, float] = {}
+        for value, p in dist.items():
+            for mult, q in zip(multipliers, probs):
+                if q > 0:
+                    key = round(value + mult, 9)
+                    step[key] = step.get(key, 0.0) + p * q
+        dist = step
+
+    values = np.array(sorted(dist))
+    cdf = np.cumsum([dist[v] for v in values])
+    cdf /= cdf[-1]
+    return values * damage, cdf
+
+
+# ---------------------------------------------------------------------------
+# Sampling
+# ---------------------------------------------------------------------------
+
+
+def _sampler(cdf: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Lookup tables for drawing indices of a discrete distribution.
+
+    The unit interval is split into 2^16 equal cells. ``index[c]`` is the
+    outcome for every uniform in cell ``c`` unless the cell straddles a CDF
+    step (``split[c]``); those rare cells are resolved exactly with a second
+    uniform draw.
+    """
+    cells = np.arange(1 << _TABLE_BITS) / (1 << _TABLE_BITS)
+    index = np.searchsorted(cdf, cells, side="right")
+    upper = np.searchsorted(cdf, cells + 1.0 / (1 << _TABLE_BITS), side="left")
+    return index, index != upper
+
+
+def _draw(cdf: np.ndarray, tables: Tuple[np.ndarray, np.ndarray], shape: Tuple[int, ...],
+          rng: np.random.Generator) -> np.ndarray:
+    index, split = tables
+    cells = rng.integers(0, 1 << _TABLE_BITS, size=shape, dtype=np.uint16)
+    drawn = index[cells]
+    exact = split[cells]
+    if exact.any():
+        u = (cells[exact] + rng.random(int(exact.sum()))) / (1 << _TABLE_BITS)
+        drawn[exact] = np.searchsorted(cdf, u, side="right")
+    return drawn
+
+
+def _hits_to_kill(values: np.ndarray, pmf: np.ndarray, health: float, trials: int,
+                  rng: np.random.Generator) -> np.ndarray:
+    """Sample damaging shots to kill by drawing shots (MAX_SHOTS + 1 = never).
+
+    Fallback for :func:`hits_to_kill_distribution`; ``values``/``pmf`` is the
+    damage distribution of a damaging shot.
+    """
+    hits = np.full(trials, MAX_SHOTS + 1, dtype=np.int64)
+    cdf = np.cumsum(pmf)
+    cdf /= cdf[-1]
+    mean_hit = float(np.dot(values, pmf))
+    tables = _sampler(cdf)
+    active = np.arange(trials)
+    need = np.full(trials, float(health))
+    fired = np.zeros(trials, dtype=np.int64)
+    while len(active):
+        # Aim past the mean so most trials finish in one pass; extra draws are cheap
+        width = int(np.clip(math.ceil(1.5 * need.mean() / mean_hit) + 2, 1, max(1, _BATCH // len(active))))
+        total = np.cumsum(values[_draw(cdf, tables, (len(active), width), rng)], axis=1)
+        killed = total >= need[:, None]
+        done = killed[:, -1]
+        hits[active[done]] = fired[done] + killed[done].argmax(axis=1) + 1
+
+        keep = ~done & (fired + width < MAX_SHOTS)
+        active, need, fired = active[keep], need[keep] - total[keep, -1], fired[keep] + width
+    return hits
+
+
+def _shots_to_kill(values: np.ndarray, cdf: np.ndarray, health: float, trials: int,
+                   rng: np.random.Generator, hits_pmf: Optional[np.ndarray] = None) -> np.ndarray:
+    """Sample the number of shots each trial needs (MAX_SHOTS + 1 = never).
+
+    Shots to kill are the damaging shots needed plus the misses before each
+    of them, a negative binomial. With ``hits_pmf`` (from
+    :func:`hits_to_kill_distribution`) each trial costs two draws however
+    many shots it takes; otherwise the damaging shots are drawn one by one.
+    """
+    shots = np.full(trials, MAX_SHOTS + 1, dtype=np.int64)
+    pmf = np.diff(cdf, prepend=0.0)
+    miss = float(pmf[0]) if values[0] <= 0 else 0.0
+    if health <= 0:
+        shots[:] = 1
+        return shots
+    if miss >= 1 or values[-1] <= 0:
+        return shots
+
+    if hits_pmf is not None:
+        hits_cdf = np.cumsum(hits_pmf)
+        hits_cdf /= hits_cdf[-1]
+        hits = _draw(hits_cdf, _sampler(hits_cdf), (trials,), rng).astype(np.int64)
+    else:
+        damaging = slice(1, None) if miss > 0 else slice(None)
+        hits = _hits_to_kill(values[damaging], pmf[damaging], health, trials, rng)
+    fired = hits + rng.negative_binomial(hits, 1.0 - miss) if miss > 0 else hits
+    shots[:] = np.where(fired <= MAX_SHOTS, fired, MAX_SHOTS + 1)
+    return shots
+
+
+# ---------------------------------------------------------------------------
+# Magazine cycles
+# ---------------------------------------------------------------------------
+
+
+def _pellet_counts(pellets: np.ndarray, probs: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Multinomial split of ``pellets`` into the five pellet outcomes, one row per trial.
+
+    Drawn as a chain of binomials (hit, head, crit), skipping certain
+    outcomes; much faster than ``Generator.multinomial`` with per-row counts.
+    """
+    def binomial(n: np.ndarray, p: float) -> np.ndarray:
+        if p <= 0:
+            return np.zeros_like(n)
+        if p >= 1:
+            return n.copy()
+        return rng.binomial(n, p)
+
+    p_hit = 1.0 - probs[0]
+    hits = binomial(pellets, p_hit)
+    head_share = (probs[3] + probs[4]) / p_hit if p_hit > 0 else 0.0
+    crit = (probs[2] + probs[4]) / p_hit if p_hit > 0 else 0.0
+    heads = binomial(hits, head_share)
+    head_crits = binomial(heads, crit)
+    body_crits = binomial(hits - heads, crit)
+    return np.stack([pellets - hits, hits - heads - body_crits, body_crits, heads - head_crits, head_crits], axis=1)
+
+
+def _lattice_unit(multipliers: np.ndarray) -> Optional[int]:
+    """Smallest ``d`` <= 100 that turns every multiplier into an integer, if any."""
+    for den in range(1, 101):
+        scaled = multipliers * den
+        if np.allclose(scaled, np.round(scaled), rtol=0, atol=1e-9):
+            return den
+    return None
+
+
+def _lattice_shot(probs: np.ndarray, multipliers: np.ndarray, pellets: int) -> Optional[Tuple[np.ndarray, int]]:
+    """Damage pmf of one shot on the integer lattice of :func:`_lattice_unit`, and its unit."""
+    den = _lattice_unit(multipliers)
+    if den is None:
+        return None
+    pellet = np.zeros(int(round(multipliers.max() * den)) + 1)
+    np.add.at(pellet, np.round(multipliers * den).astype(np.int64), probs)
+    shot = np.ones(1)
+    for _ in range(pellets):
+        shot = np.convolve(shot, pellet)
+    return shot, den
+
+
+def hits_to_kill_distribution(
+    probs: np.ndarray,
+    multipliers: np.ndarray,
+    pellets: int,
+    health_units: float,
+) -> Optional[np.ndarray]:
+    """Exact distribution of the damaging shots needed to deal ``health_units``.
+
+    Only shots that deal damage are counted; the misses in between are a
+    negative binomial on top (see :func:`_shots_to_kill`). Every damaging
+    shot adds at least one lattice unit, so the damage left below the kill
+    threshold after ``m`` hits is a truncated ``m``-fold convolution and the
+    loop ends after at most ``health_units * den`` hits.
+
+    Args:
+        health_units: Target health in damage multipliers (health / Damage).
+
+    Returns:
+        ``pmf[m]``: probability that the ``m``-th damaging shot kills, or
+        None when the multipliers share no small common unit, no shot can
+        deal damage, or the table would be too costly to build.
+    """
+    lattice = _lattice_shot(probs, multipliers, pellets)
+    if lattice is None:
+        return None
+    shot, den = lattice
+    hit = shot.copy()
+    hit[0] = 0.0
+    if hit.sum() <= 0:
+        return None
+    hit /= hit.sum()
+
+    need = max(1, math.ceil(health_units * den - 1e-9))
+    below = np.zeros(need)
+    below[0] = 1.0
+    survive = [1.0]  # P(more than m hits needed)
+    while survive[-1] > 1e-15:
+        if len(survive) * need * len(hit) > _MAX_KILL_WORK:
+            return None
+        below = np.convolve(below, hit)[:need]
+        survive.append(float(below.sum()))
+    return np.concatenate([[0.0], -np.diff(survive)])
+
+
+def cycle_distribution(
+    probs: np.ndarray,
+    multipliers: np.ndarray,
+    pellets: int,
+    magazine: int,
+    consume: float,
+) -> Optional[Tuple[np.ndarray, np.ndarray, int]]:
+    """Exact joint distribution of shots and damage over one magazine cycle.
+
+    Pellet multipliers are mapped onto an integer lattice, so the damage of
+    ``n`` shots is an ``n``-fold convolution. Shots per cycle are
+    ``magazine`` plus a negative binomial number of free shots when
+    ``0 < consume < 1``.
+
+    Returns:
+        (shots, pmf, den): ``pmf[i, k]`` is the probability of a cycle of
+        ``shots[i]`` shots dealing ``k / den`` damage multipliers, or None
+        when the multipliers share no small common unit or the table would
+        be too large.
+    """
+    lattice = _lattice_shot(probs, multipliers, pellets)
+    if lattice is None:
+        return None
+    shot, den = lattice
+
+    # Shots per cycle and their probabilities, truncated at a negligible tail
+    if 0 < consume < 1:
+        weights = [consume ** magazine]
+        while sum(weights) < 1 - 1e-12 and len(weights) < _MAX_CYCLE_ROWS:
+            free = len(weights) - 1
+            weights.append(weights[-1] * (free + magazine) / (free + 1) * (1 - consume))
+    else:
+        weights = [1.0]
+    shots = magazine + np.arange(len(weights))
+    if len(weights) * (len(shot) - 1) * shots[-1] > _MAX_CYCLE_CELLS:
+        return None
+
+    cycle = np.ones(1)
+    for _ in range(magazine):
+        cycle = np.convolve(cycle, shot)
+    pmf = np.zeros((len(weights), (len(shot) - 1) * int(shots[-1]) + 1))
+    for row, weight in enumerate(weights):
+        if row:
+            cycle = np.convolve(cycle, shot)
+        pmf[row, :len(cycle)] = weight * cycle
+    return shots, pmf, den
+
+
+# ---------------------------------------------------------------------------
+# Simulation
+# ---------------------------------------------------------------------------
+
+
+def _summary(samples: np.ndarray, percentiles: Sequence[float]) -> Dict[str, float]:
+    result = {"mean": float(samples.mean())}
+    # inverted_cdf never interpolates, so infinite (never-kill) samples stay well-defined
+    for p, value in zip(percentiles, np.percentile(samples, percentiles, method="inverted_cdf")):
+        result[f"p{p:g}"] = float(value)
+    return result
+
+
+def simulate(
+    stats: Dict[str, float],
+    target: Optional[Dict] = None,
+    trials: int = 1_000_000,
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    seed: Optional[int] = None,
+) -> Dict:
+    """Estimate time-to-kill and sustained DPS for one resolved stat vector.
+
+    Args:
+        stats: Output of :func:`resolve_stats` (or any stat dict).
+        target: Overrides for DEFAULT_TARGET.
+        trials: Monte Carlo trials for each estimate.
+        percentiles: Percentiles reported for every distribution.
+        seed: Seed for ``numpy.random.default_rng``.
+
+    Returns:
+        Dict with ``hit_chance``, ``shot_damage`` (expected damage per shot),
+        and ``shots_to_kill``, ``ttk`` (seconds) and ``dps`` summaries (mean
+        plus ``p<N>`` keys). Trials that never kill have infinite TTK.
+    """
+    target = dict(DEFAULT_TARGET, **(target or {}))
+    rng = np.random.default_rng(seed)
+
+    rpm = stats.get("RPM", 0.0)
+    interval = 60.0 / rpm if rpm > 0 else math.inf
+    magazine = max(1, int(round(stats.get("MagazineSize", 1.0))))
+    reload_speed = stats.get("ReloadSpeed", 1.0)
+    reload_time = target["reload_time"] / reload_speed if reload_speed > 0 else math.inf
+    consume = min(max(stats.get("AmmoConsumeChance", 1.0), 0.0), 1.0)
+
+    values, cdf = shot_distribution(stats, target)
+    probs, multipliers = _pellet_outcomes(stats, target)
+    pellets = max(1, int(round(stats.get("ProjectileCount", 1.0))))
+    damage = max(stats.get("Damage", 0.0), 0.0)
+
+    # Time to kill: shots fired before the killing one, plus the reloads they forced
+    hits_pmf = None
+    if damage > 0 and target["health"] > 0:
+        hits_pmf = hits_to_kill_distribution(probs, multipliers, pellets, target["health"] / damage)
+    shots = _shots_to_kill(values, cdf, target["health"], trials, rng, hits_pmf)
+    killed = shots <= MAX_SHOTS
+    before = shots - 1
+    if consume >= 1:
+        consumed = before
+    elif consume > 0:
+        consumed = rng.binomial(before, consume)
+    else:
+        consumed = np.zeros_like(before)
+    with np.errstate(invalid="ignore"):
+        ttk = before * interval + (consumed // magazine) * reload_time
+    # 0 * inf (no shots between, or no reloads, with an infinite interval) is no time at all
+    ttk = np.where(killed, np.nan_to_num(ttk, nan=0.0, posinf=math.inf), math.inf)
+
+    # Sustained DPS: one magazine cycle per trial, firing until the magazine is empty
+    exact = cycle_distribution(probs, multipliers, pellets, magazine, consume)
+    if exact is not None:
+        shot_counts, pmf, den = exact
+        cdf_cycle = np.cumsum(pmf.ravel())
+        cdf_cycle /= cdf_cycle[-1]
+        cells = _draw(cdf_cycle, _sampler(cdf_cycle), (trials,), rng)
+        rows, units = np.divmod(cells, pmf.shape[1])
+        cycle_shots = shot_counts[rows]
+        cycle_units = units / den
+    else:
+        cycle_shots = np.full(trials, magazine, dtype=np.int64)
+        if 0 < consume < 1:
+            cycle_shots += rng.negative_binomial(magazine, consume, size=trials)
+        cycle_units = _pellet_counts(cycle_shots * pellets, probs, rng) @ multipliers
+    cycle_reload = reload_time if consume > 0 else 0.0
+    per_target = min(max(int(target["targets"]), 1), 1 + max(int(stats.get("BulletPenetrations", 0.0)), 0))
+    cycle_damage = cycle_units * (damage * per_target)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dps = np.nan_to_num(cycle_damage / (cycle_shots * interval + cycle_reload))
+
+    return {
+        "trials": trials,
+        "hit_chance": hit_probability(stats.get("Spread", 0.0), target["distance"], target["radius"]),
+        "shot_damage": float(np.dot(values, np.diff(cdf, prepend=0.0))),
+        "kill_rate": float(killed.mean()),
+        "shots_to_kill": _summary(np.where(killed, shots, math.inf).astype(float), percentiles),
+        "ttk": _summary(ttk, percentiles),
+        "dps": _summary(dps, percentiles),
+    }
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def _find(items: List[Dict], key: str) -> Dict:
+    for item in items:
+        if key in (item.get("id"), item.get("name")):
+            return item
+    print(f"Error: unknown item: {key}")
+    sys.exit(1)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Simulate time-to-kill and DPS for a build")
+    parser.add_argument("data_dir", help="Directory with the extracted JSON data")
+    parser.add_argument("--weapon", required=True, help="Weapon name or id")
+    parser.add_argument("--oil", action="append", default=[], help="Oil name or id (repeatable)")
+    parser.add_argument("--scroll", help="Scroll name or id")
+    parser.add_argument("--attachment", action="append", default=[], help="Attachment name or id (repeatable)")
+    parser.add_argument("--trials", type=int, default=1_000_000, help="Monte Carlo trials")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+    for key, value in DEFAULT_TARGET.items():
+        if isinstance(value, bool):
+            parser.add_argument(f"--{key.replace('_', '-')}", action="store_true", help="Aim down sights")
+        else:
+            parser.add_argument(f"--{key.replace('_', '-')}", type=type(value), default=value,
+                                help=f"Target model {key} (default: {value})")
+    args = parser.parse_args(argv)
+
+    catalog = load_catalog(args.data_dir)
+    weapon = _find(catalog["weapons"], args.weapon)
+    enchantments = [_find(catalog["oils"], oil) for oil in args.oil]
+    if args.scroll:
+        enchantments.append(_find(catalog["scrolls"], args.scroll))
+    all_attachments = [a for items in catalog["attachments"].values() for a in items]
+    attachments = [_find(all_attachments, a) for a in args.attachment]
+
+    stats = resolve_stats(weapon, attachments, enchantments, catalog["calibers"])
+    target = {key: getattr(args, key) for key in DEFAULT_TARGET}
+    result = simulate(stats, target, trials=args.trials, seed=args.seed)
+    print(json.dumps(dict(result, weapon=weapon["id"], stats=stats), indent=2))
+
+
+if __name__ == "__main__":
+    main()
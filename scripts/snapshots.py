@@ -0,0 +1,263 @@
+"""Content-addressed snapshot store for extracted data sets.
+
+``update_all --backup`` keeps a single previous generation. A snapshot store
+keeps every refresh while storing each distinct item only once::
+
+    <store>/objects/ab/abcdef....json      one item (or whole file), compact JSON
+    <store>/snapshots/<name>.json          per-snapshot index
+
+A snapshot index lists, per data file, the items in file order as
+``[name, object hash]`` pairs (whole-file objects for caliber-modifiers.json)::
+
+    {
+      "format": 1,
+      "name": "20240601T120000Z",
+      "created": "2024-06-01T12:00:00Z",
+      "files": {
+        "weapons.json": {"items": [["Beck 8", "3f2a..."], ...]},
+        "caliber-modifiers.json": {"object": "9b1c..."}
+      }
+    }
+
+A refresh that changes three items adds three objects and one index.
+:func:`diff_snapshots` compares the hash lists and loads only the items whose
+hash differs, so its cost is proportional to the number of changed items.
+Results use the :mod:`scripts.diff_data` formats and printers.
+"""
+
+import hashlib
+import os
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from scripts.data_io import atomic_write, write_json
+from scripts.diff_data import (
+    ARRAY_FILES,
+    CALIBER_FILE,
+    _print_array_diff,
+    _print_caliber_diff,
+    diff_json_arrays,
+)
+from scripts.json_backend import dumps, load_json
+
+SNAPSHOT_FORMAT = 1
+
+# Array files are stored per item, keyed like diff_data
+ITEM_KEY = "name"
+
+
+def _encode(value: Any) -> bytes:
+    """Compact JSON that keeps key order, so restored files match the originals."""
+    return dumps(value)
+
+
+def _object_path(store_dir: str, digest: str) -> str:
+    return os.path.join(store_dir, "objects", digest[:2], digest + ".json")
+
+
+def _snapshot_path(store_dir: str, name: str) -> str:
+    return os.path.join(store_dir, "snapshots", name + ".json")
+
+
+def put_object(store_dir: str, value: Any) -> Tuple[str, bool]:
+    """Store ``value`` once.
+
+    Returns:
+        ``(digest, created)``: its SHA-256 hex digest, and whether this call
+        added the object to the store.
+    """
+    payload = _encode(value)
+    digest = hashlib.sha256(payload).hexdigest()
+    path = _object_path(store_dir, digest)
+    if os.path.exists(path):
+        return digest, False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with atomic_write(path, "wb") as f:
+        f.write(payload)
+    return digest, True
+
+
+def get_object(store_dir: str, digest: str) -> Any:
+    return load_json(_object_path(store_dir, digest))
+
+
+# ---------------------------------------------------------------------------
+# Snapshots
+# ---------------------------------------------------------------------------
+
+
+def create_snapshot(store_dir: str, data_dir: str, name: Optional[str] = None) -> Dict:
+    """Add the tracked data files of ``data_dir`` to the store as a new snapshot.
+
+    Args:
+        store_dir: Snapshot store directory (created if missing).
+        data_dir: Directory containing the extracted data files.
+        name: Snapshot name (default: the UTC time, e.g. ``20240601T120000Z``).
+            An existing snapshot of the same name is replaced.
+
+    Returns:
+        The snapshot index that was written.
+    """
+    now = datetime.now(timezone.utc)
+    name = name or now.strftime("%Y%m%dT%H%M%SZ")
+    new_objects = 0
+
+    def put(value: Any) -> str:
+        nonlocal new_objects
+        digest, created = put_object(store_dir, value)
+        new_objects += created
+        return digest
+
+    files: Dict[str, Dict] = {}
+    for filename in ARRAY_FILES:
+        path = os.path.join(data_dir, filename)
+        if os.path.exists(path):
+            items = load_json(path)
+            files[filename] = {"items": [[item.get(ITEM_KEY), put(item)] for item in items]}
+    path = os.path.join(data_dir, CALIBER_FILE)
+    if os.path.exists(path):
+        files[CALIBER_FILE] = {"object": put(load_json(path))}
+
+    snapshot = {
+        "format": SNAPSHOT_FORMAT,
+        "name": name,
+        "created": now.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "files": files,
+    }
+    index_path = _snapshot_path(store_dir, name)
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    write_json(index_path, snapshot)
+
+    print(f"Snapshot {name}: {len(files)} files, {new_objects} new objects -> {store_dir}")
+    return snapshot
+
+
+def load_snapshot(store_dir: str, name: str) -> Dict:
+    return load_json(_snapshot_path(store_dir, name))
+
+
+def list_snapshots(store_dir: str) -> List[Dict]:
+    """``{"name", "created"}`` for every snapshot, oldest first."""
+    snapshots_dir = os.path.join(store_dir, "snapshots")
+    if not os.path.isdir(snapshots_dir):
+        return []
+    entries = []
+    for filename in os.listdir(snapshots_dir):
+        if filename.endswith(".json"):
+            snapshot = load_snapshot(store_dir, filename[:-len(".json")])
+            entries.append({"name": snapshot["name"], "created": snapshot["created"]})
+    return sorted(entries, key=lambda entry: (entry["created"], entry["name"]))
+
+
+def restore_snapshot(store_dir: str, name: str, output_dir: str) -> List[str]:
+    """Write the data files of a snapshot to ``output_dir``.
+
+    Files are written the way the extractors write them (``indent=2``).
+    Derived files (compatibility index, catalog, manifest) are not part of
+    snapshots; rebuild them with their modules afterwards.
+
+    Returns:
+        The filenames written.
+    """
+    snapshot = load_snapshot(store_dir, name)
+    os.makedirs(output_dir, exist_ok=True)
+    written = []
+    for filename, entry in snapshot["files"].items():
+        if "object" in entry:
+            data = get_object(store_dir, entry["object"])
+        else:
+            data = [get_object(store_dir, digest) for _, digest in entry["items"]]
+        write_json(os.path.join(output_dir, filename), data)
+        written.append(filename)
+    return written
+
+
+# ---------------------------------------------------------------------------
+# Diff
+# ---------------------------------------------------------------------------
+
+
+ArrayDiff = Tuple[List[str], List[str], List[Tuple[str, Dict[str, Tuple[Any, Any]]]]]
+
+
+def _diff_items(store_dir: str, old_items: List[List[str]], new_items: List[List[str]]) -> ArrayDiff:
+    """diff_json_arrays over only the items whose object hash differs."""
+    old_by_key = dict((key, digest) for key, digest in old_items)
+    new_by_key = dict((key, digest) for key, digest in new_items)
+    changed_keys = {key for key in old_by_key.keys() & new_by_key.keys() if old_by_key[key] != new_by_key[key]}
+
+    def _load(by_key: Dict[str, str], keys) -> List[Dict]:
+        return [get_object(store_dir, by_key[key]) for key in keys]
+
+    old_subset = _load(old_by_key, changed_keys | (old_by_key.keys() - new_by_key.keys()))
+    new_subset = _load(new_by_key, changed_keys | (new_by_key.keys() - old_by_key.keys()))
+    return diff_json_arrays(old_subset, new_subset, key=ITEM_KEY)
+
+
+def diff_snapshots(store_dir: str, old_name: str, new_name: str) -> Dict[str, Any]:
+    """Compare two snapshots, loading only the items that differ.
+
+    Returns:
+        Filename -> ``(added, removed, changed)`` as returned by
+        :func:`scripts.diff_data.diff_json_arrays` for array files, or
+        ``(old, new)`` caliber data for caliber-modifiers.json when it
+        changed. Unchanged files map to empty results; files present in only
+        one snapshot are reported as ``"added"`` or ``"removed"``.
+    """
+    old_files = load_snapshot(store_dir, old_name)["files"]
+    new_files = load_snapshot(store_dir, new_name)["files"]
+
+    result: Dict[str, Any] = {}
+    for filename in [f for f in ARRAY_FILES + [CALIBER_FILE] if f in old_files or f in new_files]:
+        old_entry, new_entry = old_files.get(filename), new_files.get(filename)
+        if old_entry is None or new_entry is None:
+            result[filename] = "added" if old_entry is None else "removed"
+        elif filename == CALIBER_FILE:
+            same = old_entry["object"] == new_entry["object"]
+            result[filename] = None if same else (get_object(store_dir, old_entry["object"]),
+                                                  get_object(store_dir, new_entry["object"]))
+        else:
+            result[filename] = _diff_items(store_dir, old_entry["items"], new_entry["items"])
+    return result
+
+
+def print_snapshot_diff(store_dir: str, old_name: str, new_name: str) -> None:
+    """Print a diff between two snapshots in the diff_data format."""
+    for filename, diff in diff_snapshots(store_dir, old_name, new_name).items():
+        if diff in ("added", "removed"):
+            print(f"\n{'=' * 60}")
+            print(f"  {filename}  [{'NEW FILE' if diff == 'added' else 'FILE REMOVED'}]")
+            print(f"{'=' * 60}")
+        elif filename == CALIBER_FILE:
+            print(f"\n{'=' * 60}")
+            print(f"  {CALIBER_FILE}")
+            print(f"{'=' * 60}")
+            if diff is None:
+                print("  (no changes)")
+            else:
+                _print_caliber_diff(*diff)
+        else:
+            _print_array_diff(filename, *diff)
+
+
+if __name__ == "__main__":
+    usage = ("Usage: python3 -m scripts.snapshots create <store_dir> <data_dir> [name]\n"
+             "       python3 -m scripts.snapshots list <store_dir>\n"
+             "       python3 -m scripts.snapshots restore <store_dir> <name> <output_dir>\n"
+             "       python3 -m scripts.snapshots diff <store_dir> <old_name> <new_name>")
+    command, args = (sys.argv[1], sys.argv[2:]) if len(sys.argv) > 1 else (None, [])
+
+    if command == "create" and len(args) in (2, 3):
+        create_snapshot(args[0], args[1], args[2] if len(args) > 2 else None)
+    elif command == "list" and len(args) == 1:
+        for entry in list_snapshots(args[0]):
+            print(f"  {entry['created']}  {entry['name']}")
+    elif command == "restore" and len(args) == 3:
+        for filename in restore_snapshot(*args):
+            print(f"  {filename}")
+    elif command == "diff" and len(args) == 3:
+        print_snapshot_diff(*args)
+    else:
+        print(usage)
+        sys.exit(1)
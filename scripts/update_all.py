@@ -4,30 +4,62 @@ Master runner: extract all data from a SULFUR wiki dump.
 Usage:
     python -m scripts.update_all <dump_xml_path> [--output-dir public/data] [--backup]
     python -m scripts.update_all <dump_xml_path> --output-dir public/data --old-dir docs/data
+    python -m scripts.update_all <dump_xml_path> --sqlite sulfur.db
+    python -m scripts.update_all <dump_xml_path> --attachment-views .
+    python -m scripts.update_all <dump_xml_path> --page-cache ~/.cache/sulfur-pages
+    python -m scripts.update_all <dump_xml_path> --parquet exports/2024-06 [--snapshot 2024-06]
+    python -m scripts.update_all <dump_xml_path> --arrow exports/2024-06-ipc [--snapshot 2024-06]
+    python -m scripts.update_all <dump_xml_path> --snapshot-store snapshots [--snapshot 2024-06]
+    python -m scripts.update_all <dump_xml_path> --profile [--profile-report timing.json] [--cprofile run.pstats]
 
 Steps:
 1. Back up existing data (if --backup)
+   Steps 2-12 write into <output-dir>.staging, which replaces <output-dir>
+   only after all of them succeed (see scripts/data_io.py)
 2. Extract attachments (needed by weapon extractor for specificAttachments)
-3. Extract weapons (uses attachment names)
+3. Extract weapons (uses attachment names), collecting the attachment
+   compatibility views from the same pass (if --attachment-views)
 4. Extract enchantments
 5. Extract scrolls
 6. Extract calibers
 7. Merge with old data (if --old-dir provided) to fill gaps
-8. Print summary
+8. Build the weapon -> slot -> attachment-ids compatibility index
+9. Build the weapon/oil/scroll/attachment search index
+10. Build the stat -> modifying items attribute index
+11. Bundle everything into catalog.json (+ .gz) for the frontend
+12. Write content-hashed copies and manifest.json
+13. Export everything to SQLite (if --sqlite)
+14. Export everything to Parquet and/or Arrow IPC (if --parquet / --arrow,
+    requires pyarrow; the tables mirror the SQLite tables, not the JSON files)
+15. Add the data files to a snapshot store (if --snapshot-store)
+16. Print summary
+17. Print the per-stage timing report (if --profile; see scripts/profiling.py)
 """
 
 import argparse
-import json
 import os
 import shutil
 import sys
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
+from scripts.data_io import OutputWriter, staged_output, write_json
+from scripts.json_backend import load_json
 from scripts.extract_attachments import extract_attachments
 from scripts.extract_weapons import extract_weapons
 from scripts.extract_enchantments import extract_enchantments
 from scripts.extract_scrolls import extract_scrolls
 from scripts.extract_calibers import extract_calibers
+from scripts.attachment_views import AttachmentViews
+from scripts.compatibility import write_compatibility_index
+from scripts.search_index import write_search_index
+from scripts.attribute_index import write_attribute_index
+from scripts.catalog import write_catalog
+from scripts.manifest import is_hashed_name, write_manifest
+from scripts.page_cache import PAGE_CACHE_ENV, set_page_cache
+from scripts.profiling import Profiler
+from scripts.wiki_parser import PROGRESS_ENV, set_progress
+from scripts.export_sqlite import export_sqlite
+from scripts.snapshots import create_snapshot
 
 
 def _merge_array_data(
@@ -76,12 +108,159 @@ def _merge_array_data(
     return merged
 
 
+def _build_data(
+    dump_path: str,
+    output_dir: str,
+    old_dir: Optional[str],
+    profiler: Optional[Profiler] = None,
+    attachment_views_dir: Optional[str] = None,
+) -> None:
+    """Extract, merge and index everything into ``output_dir`` (steps 2-12 above).
+
+    Extractor outputs are encoded and written on an :class:`OutputWriter`
+    thread pool while the next extractor parses the dump. Each step is timed
+    as a ``profiler`` stage when one is given. With ``attachment_views_dir``,
+    the attachment compatibility views (scripts/attachment_views.py) are
+    collected during the weapon pass and written there.
+    """
+    profiler = profiler or Profiler(enabled=False)
+    with OutputWriter() as writer:
+        # Step 1: Extract attachments first (weapon extractor needs the names)
+        print("\n=== Extracting Attachments ===")
+        with profiler.stage("extract_attachments"):
+            attachment_names = extract_attachments(dump_path, output_dir, writer=writer)
+
+        # Step 2: Extract weapons with attachment data
+        print("\n=== Extracting Weapons ===")
+        weapons_path = os.path.join(output_dir, 'weapons.json')
+        views = AttachmentViews() if attachment_views_dir else None
+        with profiler.stage("extract_weapons"):
+            extract_weapons(dump_path, weapons_path, attachment_data=attachment_names, writer=writer, views=views)
+        if views is not None:
+            with profiler.stage("attachment_views"):
+                views.write(attachment_views_dir, writer)
+
+        # Step 3: Extract enchantments
+        print("\n=== Extracting Enchantments ===")
+        enchantments_path = os.path.join(output_dir, 'enchantments.json')
+        with profiler.stage("extract_enchantments"):
+            extract_enchantments(dump_path, enchantments_path, writer=writer)
+
+        # Step 4: Extract scrolls
+        print("\n=== Extracting Scrolls ===")
+        scrolls_path = os.path.join(output_dir, 'scrolls.json')
+        with profiler.stage("extract_scrolls"):
+            extract_scrolls(dump_path, scrolls_path, writer=writer)
+
+        # Step 5: Extract calibers
+        print("\n=== Extracting Calibers ===")
+        calibers_path = os.path.join(output_dir, 'caliber-modifiers.json')
+        with profiler.stage("extract_calibers"):
+            extract_calibers(dump_path, calibers_path, writer=writer)
+
+        # Step 6: Merge with old data if --old-dir provided
+        if old_dir and os.path.isdir(old_dir):
+            # The merge reads the extractor outputs back
+            with profiler.stage("flush_before_merge"):
+                writer.flush()
+            print(f"\n=== Merging with old data from {old_dir} ===")
+            with profiler.stage("merge"):
+                _merge_old_data(output_dir, old_dir, writer)
+
+        # The index steps read the files back
+        with profiler.stage("flush_writes"):
+            writer.flush()
+    print("\n=== Output Writes ===")
+    writer.report()
+    profiler.extra["writes"] = writer.timings
+
+    # Step 7: Compatibility index from the final (merged) weapon and attachment files
+    print("\n=== Building Attachment Compatibility Index ===")
+    with profiler.stage("compatibility_index"):
+        write_compatibility_index(output_dir)
+
+    # Step 8: Search index over the final data files
+    print("\n=== Building Search Index ===")
+    with profiler.stage("search_index"):
+        write_search_index(output_dir)
+
+    # Step 9: Stat -> items inverted index
+    print("\n=== Building Attribute Index ===")
+    with profiler.stage("attribute_index"):
+        write_attribute_index(output_dir)
+
+    # Step 10: Single bundled catalog, written last so it covers every other file
+    print("\n=== Bundling Catalog ===")
+    with profiler.stage("catalog"):
+        write_catalog(output_dir)
+
+    # Step 11: Content-addressed copies for cache-forever hosting
+    print("\n=== Writing Manifest ===")
+    with profiler.stage("manifest"):
+        write_manifest(output_dir)
+
+
+def _merge_old_data(output_dir: str, old_dir: str, writer: OutputWriter) -> None:
+    """Fill gaps in the freshly extracted files from ``old_dir`` (step 7 above)."""
+    merge_files = [
+        'weapons.json', 'enchantments.json', 'scrolls.json',
+        'attachments-muzzle.json', 'attachments-sights.json',
+        'attachments-lasers.json', 'attachments-chamber.json',
+        'attachments-chisels.json', 'attachments-insurance.json',
+    ]
+    for filename in merge_files:
+        new_path = os.path.join(output_dir, filename)
+        old_path = os.path.join(old_dir, filename)
+        if not os.path.exists(old_path) or not os.path.exists(new_path):
+            continue
+        new_data = load_json(new_path)
+        old_data = load_json(old_path)
+        if isinstance(new_data, list) and isinstance(old_data, list):
+            before = len(new_data)
+            merged = _merge_array_data(new_data, old_data)
+            write_json(new_path, merged, writer)
+            added = len(merged) - before
+            if added > 0:
+                print(f"  {filename}: merged {before} new + {added} old-only = {len(merged)} total")
+            else:
+                print(f"  {filename}: {len(merged)} entries (no old-only items to add)")
+
+
 def main():
     parser = argparse.ArgumentParser(description='Extract all SULFUR data from wiki dump')
     parser.add_argument('dump_path', help='Path to the wiki XML dump file')
     parser.add_argument('--output-dir', default='public/data', help='Output directory for JSON files')
     parser.add_argument('--old-dir', default=None, help='Directory with old JSON data for merge fallback')
     parser.add_argument('--backup', action='store_true', help='Back up existing data before overwriting')
+    parser.add_argument('--attachment-views', default=None, metavar='DIR',
+                        help='Also write the weapon attachment compatibility views '
+                             '(weapon_attachments_compatibility.json, weapon_attachments_from_wiki.json, '
+                             'weapon_specific_attachments.json) to this directory')
+    parser.add_argument('--sqlite', default=None, metavar='DB_PATH', help='Also export all data to this SQLite database')
+    parser.add_argument('--parquet', default=None, metavar='DIR',
+                        help='Also export all data as Parquet tables to this directory (requires pyarrow)')
+    parser.add_argument('--arrow', default=None, metavar='DIR',
+                        help='Also export all data as memory-mappable Arrow IPC tables to this directory '
+                             '(requires pyarrow)')
+    parser.add_argument('--snapshot-store', default=None, metavar='DIR',
+                        help='Keep this refresh in a content-addressed snapshot store')
+    parser.add_argument('--snapshot', default=None,
+                        help='Snapshot label, e.g. the dump date: names the snapshot store entry and '
+                             'fills the snapshot column of the Parquet/Arrow tables')
+    parser.add_argument('--profile', action='store_true',
+                        help='Time every stage (wall/CPU, pages, regex calls) and print a report')
+    parser.add_argument('--profile-report', default=None, metavar='JSON_PATH',
+                        help='Write the timing report as JSON (implies --profile)')
+    parser.add_argument('--cprofile', default=None, metavar='PSTATS_PATH',
+                        help='Also record the run with cProfile and dump pstats here (implies --profile)')
+    parser.add_argument('--no-regex-count', action='store_true',
+                        help='With --profile, do not wrap re functions to count calls')
+    parser.add_argument('--no-progress', action='store_true',
+                        help='Do not show dump scan progress (default: shown when stderr is a terminal, '
+                             f'or per {PROGRESS_ENV}=0/1)')
+    parser.add_argument('--page-cache', default=None, metavar='DIR',
+                        help='Remember which pages each extractor needs, so later runs on the same dump '
+                             f'read only those (default: {PAGE_CACHE_ENV}, off when unset)')
     args = parser.parse_args()
 
     dump_path = args.dump_path
@@ -92,79 +271,77 @@ def main():
         print(f"Error: Dump file not found: {dump_path}")
         sys.exit(1)
 
-    # Step 0: Backup
-    if args.backup and os.path.exists(output_dir):
-        backup_dir = output_dir + '.bak'
-        if os.path.exists(backup_dir):
-            shutil.rmtree(backup_dir)
-        shutil.copytree(output_dir, backup_dir)
-        print(f"Backed up {output_dir} -> {backup_dir}")
-
-    # Step 1: Extract attachments first (weapon extractor needs the names)
-    print("\n=== Extracting Attachments ===")
-    attachment_names = extract_attachments(dump_path, output_dir)
-
-    # Step 2: Extract weapons with attachment data
-    print("\n=== Extracting Weapons ===")
-    weapons_path = os.path.join(output_dir, 'weapons.json')
-    extract_weapons(dump_path, weapons_path, attachment_data=attachment_names)
-
-    # Step 3: Extract enchantments
-    print("\n=== Extracting Enchantments ===")
-    enchantments_path = os.path.join(output_dir, 'enchantments.json')
-    extract_enchantments(dump_path, enchantments_path)
-
-    # Step 4: Extract scrolls
-    print("\n=== Extracting Scrolls ===")
-    scrolls_path = os.path.join(output_dir, 'scrolls.json')
-    extract_scrolls(dump_path, scrolls_path)
-
-    # Step 5: Extract calibers
-    print("\n=== Extracting Calibers ===")
-    calibers_path = os.path.join(output_dir, 'caliber-modifiers.json')
-    extract_calibers(dump_path, calibers_path)
-
-    # Step 6: Merge with old data if --old-dir provided
-    if old_dir and os.path.isdir(old_dir):
-        print(f"\n=== Merging with old data from {old_dir} ===")
-        merge_files = [
-            'weapons.json', 'enchantments.json', 'scrolls.json',
-            'attachments-muzzle.json', 'attachments-sights.json',
-            'attachments-lasers.json', 'attachments-chamber.json',
-            'attachments-chisels.json', 'attachments-insurance.json',
-        ]
-        for filename in merge_files:
-            new_path = os.path.join(output_dir, filename)
-            old_path = os.path.join(old_dir, filename)
-            if not os.path.exists(old_path) or not os.path.exists(new_path):
-                continue
-            with open(new_path, encoding='utf-8') as f:
-                new_data = json.load(f)
-            with open(old_path, encoding='utf-8') as f:
-                old_data = json.load(f)
-            if isinstance(new_data, list) and isinstance(old_data, list):
-                before = len(new_data)
-                merged = _merge_array_data(new_data, old_data)
-                with open(new_path, 'w', encoding='utf-8') as f:
-                    json.dump(merged, f, indent=2, ensure_ascii=False)
-                added = len(merged) - before
-                if added > 0:
-                    print(f"  {filename}: merged {before} new + {added} old-only = {len(merged)} total")
-                else:
-                    print(f"  {filename}: {len(merged)} entries (no old-only items to add)")
+    if args.no_progress:
+        set_progress(False)
+    if args.page_cache:
+        set_page_cache(args.page_cache)
+
+    # Optional dependency: fail before extracting rather than at the last step
+    columnar = [(fmt, path) for fmt, path in (("parquet", args.parquet), ("arrow", args.arrow)) if path]
+    if columnar:
+        try:
+            from scripts.export_arrow import export_arrow
+        except ImportError:
+            print(f"Error: --{columnar[0][0]} requires pyarrow (pip install pyarrow)")
+            sys.exit(1)
+
+    profiler = Profiler(
+        enabled=bool(args.profile or args.profile_report or args.cprofile),
+        count_regex=not args.no_regex_count,
+        cprofile_path=args.cprofile,
+    )
+    with profiler.running():
+        # Step 0: Backup
+        if args.backup and os.path.exists(output_dir):
+            backup_dir = output_dir + '.bak'
+            if os.path.exists(backup_dir):
+                shutil.rmtree(backup_dir)
+            with profiler.stage("backup"):
+                shutil.copytree(output_dir, backup_dir)
+            print(f"Backed up {output_dir} -> {backup_dir}")
+
+        # Extraction writes into a staging copy that replaces output_dir only
+        # once every file is complete, so a crash never leaves partial data
+        with staged_output(output_dir) as staging_dir:
+            _build_data(dump_path, staging_dir, old_dir, profiler, args.attachment_views)
+
+        # Step 12: Optional SQLite export for ad-hoc queries
+        if args.sqlite:
+            print("\n=== Exporting SQLite ===")
+            with profiler.stage("sqlite"):
+                export_sqlite(output_dir, args.sqlite)
+
+        # Step 13: Optional columnar export for notebooks
+        for fmt, path in columnar:
+            print(f"\n=== Exporting {'Parquet' if fmt == 'parquet' else 'Arrow IPC'} ===")
+            with profiler.stage(fmt):
+                export_arrow(output_dir, path, fmt=fmt, snapshot=args.snapshot)
+
+        # Step 14: Every refresh kept, each distinct item stored once
+        if args.snapshot_store:
+            print("\n=== Writing Snapshot ===")
+            with profiler.stage("snapshot"):
+                create_snapshot(args.snapshot_store, output_dir, args.snapshot)
 
     print("\n=== Extraction Complete ===")
     print(f"All data written to {output_dir}/")
 
     # Summary counts
     for filename in sorted(os.listdir(output_dir)):
-        if filename.endswith('.json'):
+        if filename.endswith('.json') and not is_hashed_name(filename):
             filepath = os.path.join(output_dir, filename)
-            with open(filepath) as f:
-                data = json.load(f)
+            data = load_json(filepath)
             count = len(data) if isinstance(data, list) else len(data.keys())
             print(f"  {filename}: {count} entries")
 
+    # Step 16: Timing report
+    if profiler.enabled:
+        print("\n=== Profile ===")
+        profiler.print_report()
+        if args.profile_report:
+            write_json(args.profile_report, profiler.report())
+            print(f"Timing report -> {args.profile_report}")
+
 
 if __name__ == '__main__':
     main()
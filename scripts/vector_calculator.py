@@ -0,0 +1,230 @@
+"""Vectorized NumPy port of the stat stacking rules for batch build evaluation.
+
+Evaluates many oil/scroll/attachment builds for one weapon at once using the
+same pipeline as :mod:`scripts.calculator` (and ``src/utils/calculator.js``).
+Items are turned into per-item modifier arrays once; a batch of builds is then
+a pair of integer index matrices into those arrays.
+
+Requires NumPy.
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from scripts.calculator import (
+    ADDITIVE_STATS,
+    FLAT,
+    PERCENT_ADD,
+    PERCENT_MULT,
+    apply_caliber_conversion,
+    attachment_modifiers,
+    chisel_caliber,
+    enchantment_modifiers,
+    is_bypass_scroll,
+    is_convert_scroll,
+)
+
+# Arrays in an enchantment table, one row per item (row 0 is the empty slot)
+ENCHANTMENT_ARRAYS = (
+    "convert_flat", "convert_pa", "convert_pm", "convert_sum",
+    "oil_flat", "oil_pa", "oil_pa_prod", "oil_pm", "oil_sum",
+)
+
+# Arrays that start at 1.0 because they are combined by multiplication
+_PRODUCT_ARRAYS = {"convert_pm", "oil_pa_prod", "oil_pm", "attach_pct"}
+
+
+def stat_list(stats: Sequence[str]) -> List[str]:
+    """Return ``stats`` with CritChance added when ADSCritChance needs it for its total."""
+    result = list(dict.fromkeys(stats))
+    if "ADSCritChance" in result and "CritChance" not in result:
+        result.append("CritChance")
+    return result
+
+
+def modifier_tables(
+    enchantments: Sequence[Optional[Dict]],
+    attachments: Sequence[Optional[Dict]],
+    stats: Sequence[str],
+    caliber_modifiers: Optional[Dict] = None,
+) -> Dict[str, np.ndarray]:
+    """Build per-item modifier arrays for a candidate set of items.
+
+    Row 0 of every table is reserved for "no item"; pass ``None`` as the
+    first element of ``enchantments``/``attachments`` or let this function
+    insert it.
+
+    Args:
+        enchantments: Candidate oils and scrolls.
+        attachments: Candidate attachments (chisels included).
+        stats: Stat columns to evaluate (see :func:`stat_list`).
+        caliber_modifiers: Contents of caliber-modifiers.json, used to index
+            chisel calibers.
+
+    Returns:
+        Dict of arrays: ``[E, S]`` enchantment arrays named in
+        ENCHANTMENT_ARRAYS, ``per_bullet`` ``[E]``, ``attach_flat`` and
+        ``attach_pct`` ``[A, S]``, and ``caliber`` ``[A]`` (index into the
+        caliber list, -1 for non-chisels).
+    """
+    enchantments = list(enchantments)
+    attachments = list(attachments)
+    if not enchantments or enchantments[0] is not None:
+        enchantments.insert(0, None)
+    if not attachments or attachments[0] is not None:
+        attachments.insert(0, None)
+
+    columns = {stat: i for i, stat in enumerate(stats)}
+    calibers = list((caliber_modifiers or {}).get("calibers") or {})
+
+    tables: Dict[str, np.ndarray] = {}
+    for name in ENCHANTMENT_ARRAYS:
+        tables[name] = np.full((len(enchantments), len(stats)), 1.0 if name in _PRODUCT_ARRAYS else 0.0)
+    tables["per_bullet"] = np.zeros(len(enchantments))
+
+    for row, ench in enumerate(enchantments):
+        if ench is None:
+            continue
+        if is_bypass_scroll(ench):
+            tables["per_bullet"][row] = ench["specialEffects"].get("perBulletDamage") or 0
+        if is_convert_scroll(ench):
+            prefix = "convert"
+        elif is_bypass_scroll(ench):
+            continue
+        else:
+            prefix = "oil"
+        for stat, mod_type, value in enchantment_modifiers(ench):
+            col = columns.get(stat)
+            if col is None or mod_type is None:
+                continue
+            tables[f"{prefix}_sum"][row, col] += value
+            if mod_type == FLAT:
+                tables[f"{prefix}_flat"][row, col] += value
+            elif mod_type == PERCENT_ADD:
+                tables[f"{prefix}_pa"][row, col] += value
+                if prefix == "oil":
+                    tables["oil_pa_prod"][row, col] *= 1 + value
+            elif mod_type == PERCENT_MULT:
+                tables[f"{prefix}_pm"][row, col] *= 1 + value
+
+    tables["attach_flat"] = np.zeros((len(attachments), len(stats)))
+    tables["attach_pct"] = np.ones((len(attachments), len(stats)))
+    tables["caliber"] = np.full(len(attachments), -1, dtype=np.int64)
+    for row, attachment in enumerate(attachments):
+        if attachment is None:
+            continue
+        caliber = chisel_caliber(attachment)
+        if caliber:
+            tables["caliber"][row] = calibers.index(caliber) if caliber in calibers else len(calibers)
+            continue
+        for stat, value, is_percent in attachment_modifiers(attachment):
+            col = columns.get(stat)
+            if col is None:
+                continue
+            if is_percent:
+                tables["attach_pct"][row, col] *= 1 + value
+            else:
+                tables["attach_flat"][row, col] += value
+
+    return tables
+
+
+def weapon_table(
+    weapon: Dict,
+    stats: Sequence[str],
+    caliber_modifiers: Optional[Dict] = None,
+) -> Dict[str, np.ndarray]:
+    """Precompute a weapon's base stats for every chisel caliber.
+
+    Returns:
+        Dict with ``base`` ``[C + 2, S]`` (row 0: no chisel, row c + 1:
+        caliber c, last row: unknown caliber), ``projectile_count`` ``[C + 2]``,
+        ``in_base`` ``[S]`` (stat present in baseStats) and ``additive``
+        ``[S]`` (crit stats).
+    """
+    caliber_modifiers = caliber_modifiers or {}
+    raw_base = weapon.get("baseStats") or weapon.get("base_stats") or {}
+    calibers = list(caliber_modifiers.get("calibers") or {})
+
+    variants = [raw_base]
+    variants += [apply_caliber_conversion(raw_base, c, caliber_modifiers, weapon) for c in calibers]
+    variants.append(raw_base)
+
+    base = np.array([[float(v.get(stat) or 0.0) for stat in stats] for v in variants])
+    projectile_count = np.array([float(v.get("ProjectileCount") or 1) for v in variants])
+    return {
+        "base": base,
+        "projectile_count": projectile_count,
+        "in_base": np.array([stat in raw_base for stat in stats]),
+        "additive": np.array([stat in ADDITIVE_STATS for stat in stats]),
+    }
+
+
+def evaluate_builds(
+    tables: Dict[str, np.ndarray],
+    weapon: Dict[str, np.ndarray],
+    stats: Sequence[str],
+    enchantment_idx: np.ndarray,
+    attachment_idx: np.ndarray,
+) -> np.ndarray:
+    """Evaluate a batch of builds.
+
+    Args:
+        tables: Output of :func:`modifier_tables`.
+        weapon: Output of :func:`weapon_table`.
+        stats: The stat columns both tables were built for.
+        enchantment_idx: ``[B, k]`` rows into the enchantment tables (0 = empty),
+            in selection order.
+        attachment_idx: ``[B, m]`` rows into the attachment tables (0 = empty),
+            in slot order. The first chisel in a row wins.
+
+    Returns:
+        ``[B, S]`` unrounded modified stat values. Stats present in baseStats
+        follow the base-stat path; others follow the modifier-only path.
+        ADSCritChance is reported as the ADS total (CritChance + bonus).
+    """
+    n_builds = enchantment_idx.shape[0]
+
+    calibers = tables["caliber"][attachment_idx]
+    chosen = np.full(n_builds, -1, dtype=np.int64)
+    for col in range(calibers.shape[1] - 1, -1, -1):
+        chosen = np.where(calibers[:, col] >= 0, calibers[:, col], chosen)
+    base = weapon["base"][chosen + 1]
+
+    def total(name: str) -> np.ndarray:
+        gathered = tables[name][enchantment_idx]
+        return gathered.prod(axis=1) if name in _PRODUCT_ARRAYS else gathered.sum(axis=1)
+
+    additive = weapon["additive"]
+    in_base = weapon["in_base"]
+
+    # Stage 1: ConvertWpn scrolls
+    convert_flat = total("convert_flat")
+    convert_pm = total("convert_pm")
+    staged = (base + convert_flat) * (1 + total("convert_pa")) * convert_pm
+    zero_based = convert_flat * convert_pm
+    value = np.where(additive, base + total("convert_sum"), np.where(in_base, staged, zero_based))
+
+    # Stage 2: attachments (flat, then compounding percentages)
+    value = (value + tables["attach_flat"][attachment_idx].sum(axis=1)) * tables["attach_pct"][attachment_idx].prod(axis=1)
+
+    # Stage 3: oils and non-convert scrolls
+    oil_flat = total("oil_flat")
+    oil_pm = total("oil_pm")
+    staged = (value + oil_flat) * (1 + total("oil_pa")) * oil_pm
+    running = (value + oil_flat) * total("oil_pa_prod") * oil_pm
+    value = np.where(additive, value + total("oil_sum"), np.where(in_base, staged, running))
+
+    # Stage 4: bypassPercentages per-bullet damage
+    if "Damage" in stats:
+        col = list(stats).index("Damage")
+        if in_base[col]:
+            per_bullet = tables["per_bullet"][enchantment_idx].sum(axis=1)
+            value[:, col] += per_bullet * weapon["projectile_count"][chosen + 1]
+
+    if "ADSCritChance" in stats and "CritChance" in stats:
+        stats = list(stats)
+        value[:, stats.index("ADSCritChance")] += value[:, stats.index("CritChance")]
+
+    return value
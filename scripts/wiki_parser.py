@@ -1,58 +1,421 @@
 """Shared helpers for parsing MediaWiki XML dumps from sulfur.wiki.gg."""
 
+import os
 import re
+import sys
+import time
 import xml.etree.ElementTree as ET
-from typing import Dict, List, Optional, Tuple
+from typing import IO, Callable, Dict, Iterator, List, Optional, Set, Tuple
 
+# Running totals over every iterate_pages/iterate_page_revisions/iterate_pages_at call: <page> elements read, pages
+# yielded, and seconds spent inside the generator (XML parsing and
+# filtering, excluding the caller's work). Read deltas around a stage to
+# profile it (see scripts/profiling.py).
+PARSE_STATS: Dict[str, float] = {"pages": 0, "yielded": 0, "seconds": 0.0}
 
-def iterate_pages(dump_path: str, namespace: str = 'http://www.mediawiki.org/xml/export-0.11/'):
+
+# ---------------------------------------------------------------------------
+# Progress reporting
+# ---------------------------------------------------------------------------
+
+# "1" forces progress output on, "0" off; unset means on when stderr is a TTY
+PROGRESS_ENV = "SULFUR_PROGRESS"
+
+_progress_override: Optional[bool] = None
+
+
+def set_progress(enabled: Optional[bool]) -> None:
+    """Turn scan progress on or off for every extractor (``None``: automatic)."""
+    global _progress_override
+    _progress_override = enabled
+
+
+def progress_enabled() -> bool:
+    if _progress_override is not None:
+        return _progress_override
+    env = os.environ.get(PROGRESS_ENV)
+    if env is not None:
+        return env.strip().lower() not in ("", "0", "false", "no", "off")
+    return sys.stderr.isatty()
+
+
+def _format_bytes(size: float) -> str:
+    if size < 1024:
+        return f"{size:.0f} B"
+    for unit in ("KB", "MB"):
+        size /= 1024
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+    return f"{size / 1024:.1f} GB"
+
+
+def _format_seconds(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    return f"{seconds // 60}m{seconds % 60:02d}s"
+
+
+class ProgressReporter:
+    """Single-line scan progress from bytes consumed: percentage, rates and ETA.
+
+    Args:
+        total_bytes: Size of the input (0 if unknown; percentage and ETA are
+            then omitted).
+        label: Prefix, e.g. the dump file name.
+        stream: Where to write (default ``sys.stderr``).
+        interval: Minimum seconds between redraws.
+    """
+
+    def __init__(self, total_bytes: int, label: str = "", stream: Optional[IO] = None, interval: float = 0.5):
+        self.total_bytes = total_bytes
+        self.label = label
+        self.stream = stream or sys.stderr
+        self.interval = interval
+        self.bytes_read = 0
+        self.pages = 0
+        self._start = time.monotonic()
+        self._last_draw = self._start
+
+    def line(self) -> str:
+        elapsed = max(time.monotonic() - self._start, 1e-9)
+        byte_rate = self.bytes_read / elapsed
+        parts = [self.label] if self.label else []
+        if self.total_bytes:
+            parts.append(f"{100.0 * self.bytes_read / self.total_bytes:5.1f}%")
+            parts.append(f"{_format_bytes(self.bytes_read)}/{_format_bytes(self.total_bytes)}")
+        else:
+            parts.append(_format_bytes(self.bytes_read))
+        parts.append(f"{self.pages:,} pages")
+        parts.append(f"{self.pages / elapsed:,.0f} pages/s")
+        parts.append(f"{byte_rate / (1024 * 1024):.1f} MB/s")
+        if self.total_bytes and byte_rate > 0:
+            parts.append(f"ETA {_format_seconds(max(self.total_bytes - self.bytes_read, 0) / byte_rate)}")
+        return "  ".join(parts)
+
+    def update(self, bytes_read: int, pages: int) -> None:
+        self.bytes_read = bytes_read
+        self.pages = pages
+        now = time.monotonic()
+        if now - self._last_draw >= self.interval:
+            self._last_draw = now
+            self.stream.write("\r" + self.line())
+            self.stream.flush()
+
+    def finish(self) -> None:
+        """Draw the final state and end the line."""
+        self.stream.write("\r" + self.line() + "\n")
+        self.stream.flush()
+
+
+class _CountingReader:
+    """File wrapper that counts the bytes iterparse has read."""
+
+    def __init__(self, f: IO[bytes]):
+        self._f = f
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._f.read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def iterate_pages(
+    dump_path: str,
+    namespace: str = 'http://www.mediawiki.org/xml/export-0.11/',
+    progress: Optional[bool] = None,
+    on_revision: Optional[Callable[[str, str], None]] = None,
+) -> Iterator[Tuple[str, str]]:
     """
     Yield (title, wikitext) for each page in the XML dump.
 
     Uses iterparse to keep memory low. Only yields the most recent revision
     for each page. Skips namespace pages (those with ':' in the title).
+
+    With ``progress`` (default: :func:`progress_enabled`), a
+    :class:`ProgressReporter` line on stderr tracks the bytes consumed.
+
+    ``on_revision(title, wikitext)`` is called for every revision of every
+    page, oldest first and before the page is yielded, without title or
+    redirect filtering. It lets a caller that also needs older revisions of
+    a history dump (see :meth:`scripts.attachment_views.AttachmentViews.add_revision`)
+    share this pass.
     """
+    if progress is None:
+        progress = progress_enabled()
+    yield from _timed(_iterate_pages(dump_path, namespace, progress, on_revision=on_revision))
+
+
+def iterate_page_revisions(
+    dump_path: str,
+    keep: Callable[[str], bool],
+    namespace: str = 'http://www.mediawiki.org/xml/export-0.11/',
+    progress: Optional[bool] = None,
+) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (title, wikitext) of the latest revision of each page that ``keep`` accepts.
+
+    For history dumps where the newest revision may have lost a section an
+    older one still has. Revisions are tested as they are parsed and only
+    the latest accepted one is kept in memory, so memory is bounded by the
+    largest revision rather than the page's history. Pages without an
+    accepted revision are skipped. Unlike :func:`iterate_pages` no title or
+    redirect filtering is applied.
+    """
+    if progress is None:
+        progress = progress_enabled()
+    yield from _timed(_iterate_pages(dump_path, namespace, progress, keep))
+
+
+def _timed(pages: Iterator[Tuple[str, str]]) -> Iterator[Tuple[str, str]]:
+    """Pass ``pages`` through, adding to :data:`PARSE_STATS`."""
+    resumed: Optional[float] = time.perf_counter()
+    try:
+        for title, text in pages:
+            PARSE_STATS["yielded"] += 1
+            PARSE_STATS["seconds"] += time.perf_counter() - resumed
+            # Suspended at the yield: time until the next resume is the caller's
+            resumed = None
+            yield title, text
+            resumed = time.perf_counter()
+    finally:
+        if resumed is not None:
+            PARSE_STATS["seconds"] += time.perf_counter() - resumed
+
+
+def _iterate_pages(
+    dump_path: str,
+    namespace: str,
+    progress: bool = False,
+    keep: Optional[Callable[[str], bool]] = None,
+    on_revision: Optional[Callable[[str, str], None]] = None,
+):
     ns_prefix = f'{{{namespace}}}'
-    context = ET.iterparse(dump_path, events=('end',))
-
-    for event, elem in context:
-        if elem.tag != f'{ns_prefix}page':
-            continue
-
-        ns_map = {'mw': namespace}
-        title_elem = elem.find('mw:title', ns_map)
-        if title_elem is None or not title_elem.text or ':' in title_elem.text:
-            elem.clear()
-            continue
-
-        title = title_elem.text
-
-        # Get the most recent revision (last in history dumps)
-        revisions = elem.findall('mw:revision', ns_map)
-        if not revisions:
-            elem.clear()
-            continue
-
-        revision = revisions[-1]
-        text_elem = revision.find('mw:text', ns_map)
-        if text_elem is None or not text_elem.text:
-            elem.clear()
-            continue
-
-        text = text_elem.text
-
-        # Skip redirect pages
-        if text.lstrip().startswith('#REDIRECT') or text.lstrip().startswith('#redirect'):
-            elem.clear()
-            continue
-
-        # Skip cut/removed content pages
-        if 'Removed Content' in text or 'Category:Cut Content' in text:
-            elem.clear()
-            continue
-
-        yield title, text
-        elem.clear()
+    page_tag, revision_tag, text_tag = f'{ns_prefix}page', f'{ns_prefix}revision', f'{ns_prefix}text'
+    title_tag = f'{ns_prefix}title'
+    with open(dump_path, 'rb') as f:
+        reader = _CountingReader(f)
+        reporter = None
+        pages = 0
+        if progress:
+            reporter = ProgressReporter(os.fstat(f.fileno()).st_size, os.path.basename(dump_path))
+        context = ET.iterparse(reader, events=('start', 'end'))
+
+        # elem.clear() empties a page but leaves it attached to <mediawiki>,
+        # so the root would still grow by one element per page. Hold the root
+        # and prune it after every page instead (this also drops <siteinfo>).
+        _, root = next(context)
+        page = previous_revision = None
+
+        for event, elem in context:
+            if event == 'start':
+                if elem.tag == page_tag:
+                    page, previous_revision = elem, None
+                continue
+            if elem.tag == revision_tag:
+                if on_revision is not None:
+                    # <title> precedes the revisions
+                    title, text = page.findtext(title_tag), elem.findtext(text_tag)
+                    if title and text:
+                        on_revision(title, text)
+                if keep is not None:
+                    text_elem = elem.find(text_tag)
+                    if text_elem is None or not text_elem.text or not keep(text_elem.text):
+                        page.remove(elem)
+                        continue
+                # Only the latest (accepted) revision is used; drop the
+                # previous one as soon as a newer one is complete
+                if previous_revision is not None:
+                    page.remove(previous_revision)
+                previous_revision = elem
+                continue
+            if elem.tag != page_tag:
+                continue
+            page = previous_revision = None
+            PARSE_STATS["pages"] += 1
+            if reporter is not None:
+                pages += 1
+                reporter.update(reader.bytes_read, pages)
+            if keep is None:
+                page_result = _read_page(elem, namespace)
+            else:
+                page_result = _read_latest_revision(elem, namespace)
+            root.clear()
+            if page_result is not None:
+                yield page_result
+
+        if reporter is not None:
+            reporter.update(reader.bytes_read, pages)
+            reporter.finish()
+
+
+# ---------------------------------------------------------------------------
+# Page offsets (see scripts/page_cache.py)
+# ---------------------------------------------------------------------------
+
+_PAGE_START, _PAGE_END = b'<page>', b'</page>'
+_TITLE_START, _TITLE_END = b'<title>', b'</title>'
+
+
+def _decode_title(raw: bytes) -> str:
+    if b'&' not in raw:
+        return raw.decode('utf-8')
+    # Entity and character references, as the XML parser would resolve them
+    return ET.fromstring(b'<title>' + raw + b'</title>').text or ''
+
+
+def scan_page_offsets(
+    dump_path: str,
+    titles: Optional[Set[str]] = None,
+    chunk_size: int = 1 << 20,
+) -> Dict[str, List[Tuple[int, int]]]:
+    """
+    Find the byte range of every <page> element by scanning the raw bytes.
+
+    Much faster than parsing: ``<`` is always escaped in text, so the tags
+    are found with plain byte searches.
+
+    Args:
+        dump_path: Path to the MediaWiki XML dump file.
+        titles: Only report pages with these titles (default: all pages).
+        chunk_size: Bytes read at a time.
+
+    Returns:
+        Title -> ``[(offset, length), ...]`` in dump order (a title can occur
+        more than once).
+    """
+    offsets: Dict[str, List[Tuple[int, int]]] = {}
+    with open(dump_path, 'rb') as f:
+        buffer = bytearray()
+        base = 0  # file offset of buffer[0]
+        while True:
+            chunk = f.read(chunk_size)
+            buffer += chunk
+            position = 0
+            while True:
+                start = buffer.find(_PAGE_START, position)
+                if start < 0:
+                    position = max(position, len(buffer) - len(_PAGE_START) + 1)
+                    break
+                end = buffer.find(_PAGE_END, start)
+                if end < 0:
+                    # Page continues in the next chunk
+                    position = start
+                    break
+                end += len(_PAGE_END)
+                title_start = buffer.find(_TITLE_START, start, end)
+                title_end = buffer.find(_TITLE_END, title_start, end)
+                if title_start >= 0 and title_end >= 0:
+                    title = _decode_title(bytes(buffer[title_start + len(_TITLE_START):title_end]))
+                    if titles is None or title in titles:
+                        offsets.setdefault(title, []).append((base + start, end - start))
+                position = end
+            if not chunk:
+                break
+            del buffer[:position]
+            base += position
+    return offsets
+
+
+def page_spans_match(dump_path: str, spans: List[Tuple[int, int, str]], head_size: int = 4096) -> bool:
+    """
+    Whether every ``(offset, length, title)`` span still holds that page.
+
+    A dump edited in place can keep its size and fingerprint while pages
+    move; then cached spans point at the wrong bytes. This checks that each
+    span starts with ``<page>`` and the expected ``<title>`` (within the
+    first ``head_size`` bytes) and ends with ``</page>``, reading only those
+    bytes.
+    """
+    with open(dump_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        for offset, length, title in spans:
+            if offset + length > size:
+                return False
+            f.seek(offset)
+            head = f.read(min(length, head_size))
+            title_start = head.find(_TITLE_START)
+            title_end = head.find(_TITLE_END, title_start)
+            if not head.startswith(_PAGE_START) or title_start < 0 or title_end < 0:
+                return False
+            if _decode_title(head[title_start + len(_TITLE_START):title_end]) != title:
+                return False
+            f.seek(offset + length - len(_PAGE_END))
+            if f.read(len(_PAGE_END)) != _PAGE_END:
+                return False
+    return True
+
+
+def iterate_pages_at(
+    dump_path: str,
+    spans: List[Tuple[int, int]],
+    namespace: str = 'http://www.mediawiki.org/xml/export-0.11/',
+) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (title, wikitext) for the <page> elements at the given byte ranges.
+
+    Reads and parses only those ranges, in the order given; pages are
+    filtered like :func:`iterate_pages`. Spans come from
+    :func:`scan_page_offsets`; check stored spans with
+    :func:`page_spans_match` first.
+    """
+    yield from _timed(_iterate_pages_at(dump_path, spans, namespace))
+
+
+def _iterate_pages_at(dump_path: str, spans: List[Tuple[int, int]], namespace: str):
+    # The fragments lack the dump's default namespace declaration
+    wrapper = f'<mediawiki xmlns="{namespace}">'.encode('utf-8'), b'</mediawiki>'
+    with open(dump_path, 'rb') as f:
+        for offset, length in spans:
+            f.seek(offset)
+            page = ET.fromstring(wrapper[0] + f.read(length) + wrapper[1])[0]
+            PARSE_STATS["pages"] += 1
+            page_result = _read_page(page, namespace)
+            if page_result is not None:
+                yield page_result
+
+
+def _read_page(elem: ET.Element, namespace: str) -> Optional[Tuple[str, str]]:
+    """(title, wikitext) of a <page> element, or None for pages iterate_pages skips."""
+    ns_map = {'mw': namespace}
+    title_elem = elem.find('mw:title', ns_map)
+    if title_elem is None or not title_elem.text or ':' in title_elem.text:
+        return None
+
+    title = title_elem.text
+
+    # Get the most recent revision (last in history dumps)
+    revisions = elem.findall('mw:revision', ns_map)
+    if not revisions:
+        return None
+
+    revision = revisions[-1]
+    text_elem = revision.find('mw:text', ns_map)
+    if text_elem is None or not text_elem.text:
+        return None
+
+    text = text_elem.text
+
+    # Skip redirect pages
+    if text.lstrip().startswith('#REDIRECT') or text.lstrip().startswith('#redirect'):
+        return None
+
+    # Skip cut/removed content pages
+    if 'Removed Content' in text or 'Category:Cut Content' in text:
+        return None
+
+    return title, text
+
+
+def _read_latest_revision(elem: ET.Element, namespace: str) -> Optional[Tuple[str, str]]:
+    """(title, wikitext) of a <page> element's last remaining revision, unfiltered."""
+    ns_map = {'mw': namespace}
+    title = elem.findtext('mw:title', None, ns_map)
+    revisions = elem.findall('mw:revision', ns_map)
+    if not title or not revisions:
+        return None
+    return title, revisions[-1].findtext('mw:text', '', ns_map)
 
 
 def _parse_infobox_body(body: str) -> Dict[str, str]:
@@ -36,12 +36,16 @@ function App() {
     insurance: null
   })
   const [caliberModifiers, setCaliberModifiers] = useState({})
+  const [compatibilityIndex, setCompatibilityIndex] = useState(null)
+  const [searchIndex, setSearchIndex] = useState(null)
 
   // Load data on mount
   useEffect(() => {
     const baseUrl = import.meta.env.BASE_URL
     const v = __BUILD_TIME__
-    Promise.all([
+
+    // Fallback for data sets without catalog.json: one request per file
+    const loadFiles = () => Promise.all([
       fetch(`${baseUrl}data/weapons.json?v=${v}`).then(r => r.json()),
       fetch(`${baseUrl}data/enchantments.json?v=${v}`).then(r => r.json()),
       fetch(`${baseUrl}data/scrolls.json?v=${v}`).then(r => r.json()),
@@ -51,35 +55,75 @@ function App() {
       fetch(`${baseUrl}data/attachments-chamber.json?v=${v}`).then(r => r.json()),
       fetch(`${baseUrl}data/attachments-chisels.json?v=${v}`).then(r => r.json()),
       fetch(`${baseUrl}data/attachments-insurance.json?v=${v}`).then(r => r.json()),
-      fetch(`${baseUrl}data/caliber-modifiers.json?v=${v}`).then(r => r.json())
+      fetch(`${baseUrl}data/caliber-modifiers.json?v=${v}`).then(r => r.json()),
+      // Optional: older data sets have no precomputed compatibility index
+      fetch(`${baseUrl}data/weapon-attachments.json?v=${v}`).then(r => (r.ok ? r.json() : null)).catch(() => null)
     ]).then(([
-      weaponData,
-      oilsData,
-      scrollsData,
-      muzzleData,
-      sightData,
-      laserData,
-      chamberData,
-      chiselData,
-      insuranceData,
-      caliberData
-    ]) => {
+      weapons,
+      enchantments,
+      scrolls,
+      muzzle,
+      sight,
+      laser,
+      chamber,
+      chisel,
+      insurance,
+      caliberModifiers,
+      weaponAttachments
+    ]) => ({
+      weapons,
+      enchantments,
+      scrolls,
+      attachments: { muzzle, sight, laser, chamber, chisel, insurance },
+      caliberModifiers,
+      weaponAttachments
+    }))
+
+    // One bundled request (scripts/catalog.py). 'no-cache' revalidates with the
+    // server, so the body is only downloaded again when it changed.
+    const fetchJson = (path, options) => fetch(`${baseUrl}data/${path}`, options)
+      .then(r => (r.ok ? r.json() : Promise.reject(new Error(`${path}: ${r.status}`))))
+
+    // manifest.json (scripts/manifest.py) maps catalog.json to its content-hashed
+    // name; hashed files never change, so the browser may cache them forever.
+    const manifest = fetchJson('manifest.json', { cache: 'no-cache' })
+    const loadHashed = filename => manifest.then(({ files }) => (
+      files && files[filename]
+        ? fetchJson(files[filename])
+        : Promise.reject(new Error(`manifest.json: no ${filename} entry`))
+    ))
+    const loadCatalog = () => loadHashed('catalog.json')
+      .catch(() => fetchJson('catalog.json', { cache: 'no-cache' }))
+      .then(catalog => catalog.data)
+
+    loadCatalog().catch(loadFiles).then(data => {
+      const attachments = data.attachments || {}
+      const weaponData = data.weapons
+      const oilsData = data.enchantments
+      const scrollsData = data.scrolls
       setWeapons(Array.isArray(weaponData) ? weaponData : weaponData.weapons || [])
       setOils(Array.isArray(oilsData) ? oilsData : oilsData.enchantments || [])
       setScrolls(Array.isArray(scrollsData) ? scrollsData : scrollsData.scrolls || [])
       setAttachmentsByType({
-        muzzle: Array.isArray(muzzleData) ? muzzleData : [],
-        sight: Array.isArray(sightData) ? sightData : [],
-        laser: Array.isArray(laserData) ? laserData : [],
-        chamber: Array.isArray(chamberData) ? chamberData : [],
-        chisel: Array.isArray(chiselData) ? chiselData : [],
-        insurance: Array.isArray(insuranceData) ? insuranceData : []
+        muzzle: Array.isArray(attachments.muzzle) ? attachments.muzzle : [],
+        sight: Array.isArray(attachments.sight) ? attachments.sight : [],
+        laser: Array.isArray(attachments.laser) ? attachments.laser : [],
+        chamber: Array.isArray(attachments.chamber) ? attachments.chamber : [],
+        chisel: Array.isArray(attachments.chisel) ? attachments.chisel : [],
+        insurance: Array.isArray(attachments.insurance) ? attachments.insurance : []
       })
-      setCaliberModifiers(caliberData || {})
+      setCaliberModifiers(data.caliberModifiers || {})
+      setCompatibilityIndex(data.weaponAttachments || null)
     }).catch(err => {
       console.error('Error loading data:', err)
     })
 
+    // Optional: without search-index.json the selectors filter their full lists
+    loadHashed('search-index.json')
+      .catch(() => fetchJson('search-index.json', { cache: 'no-cache' }))
+      .then(setSearchIndex)
+      .catch(() => setSearchIndex(null))
+
     // Load saved configs from localStorage
     try {
       const saved = localStorage.getItem(STORAGE_KEY)
@@ -283,6 +327,7 @@ function App() {
               weapons={weapons}
               selectedWeapon={selectedWeapon}
               onSelectWeapon={setSelectedWeapon}
+              searchIndex={searchIndex}
             />
             <EnchantmentSelector
               oils={oils}
@@ -291,6 +336,7 @@ function App() {
               selectedScroll={selectedScroll}
               onSelectOils={setSelectedOils}
               onSelectScroll={setSelectedScroll}
+              searchIndex={searchIndex}
             />
           </div>
         </div>
@@ -301,6 +347,7 @@ function App() {
             attachmentsByType={attachmentsByType}
             selectedAttachments={selectedAttachments}
             selectedWeapon={selectedWeapon}
+            compatibilityIndex={compatibilityIndex}
             onSelectAttachment={handleSelectAttachment}
             onRemoveAttachment={handleRemoveAttachment}
             onRemoveAll={handleRemoveAllAttachments}
@@ -51,6 +51,7 @@ export default function AttachmentSelector({
   attachmentsByType,
   selectedAttachments,
   selectedWeapon,
+  compatibilityIndex,
   onSelectAttachment,
   onRemoveAttachment,
   onRemoveAll
@@ -62,8 +63,13 @@ export default function AttachmentSelector({
     setOpenSlot(openSlot === slotType ? null : slotType)
   }
 
+  // Precomputed slot -> attachment ids for the selected weapon (weapon-attachments.json)
+  const weaponIndex = selectedWeapon && compatibilityIndex ? compatibilityIndex[selectedWeapon.id] : null
+
   // Get allowed attachment types for the selected weapon
-  const allowedTypes = selectedWeapon?.allowedAttachments || ['muzzle', 'sight', 'laser', 'chamber', 'chisel', 'insurance']
+  const allowedTypes = weaponIndex
+    ? Object.keys(weaponIndex)
+    : selectedWeapon?.allowedAttachments || ['muzzle', 'sight', 'laser', 'chamber', 'chisel', 'insurance']
 
   // Filter attachment types to only show allowed ones
   const availableAttachmentTypes = ATTACHMENT_TYPES.filter(({ key }) => allowedTypes.includes(key))
@@ -72,6 +78,11 @@ export default function AttachmentSelector({
   const getFilteredAttachments = (type) => {
     const attachments = attachmentsByType[type] || []
 
+    if (weaponIndex) {
+      const ids = new Set(weaponIndex[type] || [])
+      return attachments.filter(attachment => ids.has(attachment.id))
+    }
+
     if (selectedWeapon?.specificAttachments && selectedWeapon.specificAttachments.length > 0) {
       const typeSpecific = attachments.filter(attachment =>
         selectedWeapon.specificAttachments.includes(attachment.name)
@@ -1,6 +1,7 @@
 import React, { useState } from 'react'
+import { searchIndexIds } from '../searchIndex'
 
-export default function EnchantmentSelector({ oils, scrolls, selectedOils, selectedScroll, onSelectOils, onSelectScroll }) {
+export default function EnchantmentSelector({ oils, scrolls, selectedOils, selectedScroll, onSelectOils, onSelectScroll, searchIndex }) {
   const [oilSearchQuery, setOilSearchQuery] = useState('')
   const [scrollSearchQuery, setScrollSearchQuery] = useState('')
 
@@ -13,9 +14,12 @@ export default function EnchantmentSelector({ oils, scrolls, selectedOils, selec
   const canAddScroll = !selectedScroll && selectedOils.length < 5
 
   // Search filter function for enchantments (oils/scrolls)
-  const searchItems = (items, query) => {
+  const searchItems = (items, query, kind) => {
     if (!query.trim()) return items
 
+    const ids = searchIndexIds(searchIndex, query, kind)
+    if (ids) return items.filter(item => ids.has(item.id))
+
     const lowerQuery = query.toLowerCase()
 
     return items.filter(item => {
@@ -64,8 +68,8 @@ export default function EnchantmentSelector({ oils, scrolls, selectedOils, selec
     })
   }
 
-  const filteredOils = searchItems(validOils, oilSearchQuery)
-  const filteredScrolls = searchItems(validScrolls, scrollSearchQuery)
+  const filteredOils = searchItems(validOils, oilSearchQuery, 'oil')
+  const filteredScrolls = searchItems(validScrolls, scrollSearchQuery, 'scroll')
 
   const addOil = (oilId) => {
     const oil = validOils.find(o => o.id === oilId)
@@ -1,12 +1,16 @@
 import React, { useState } from 'react'
+import { searchIndexIds } from '../searchIndex'
 
-export default function WeaponSelector({ weapons, selectedWeapon, onSelectWeapon }) {
+export default function WeaponSelector({ weapons, selectedWeapon, onSelectWeapon, searchIndex }) {
   const [searchQuery, setSearchQuery] = useState('')
 
   // Search filter function
   const searchWeapons = (weapons, query) => {
     if (!query.trim()) return weapons
 
+    const ids = searchIndexIds(searchIndex, query, 'weapon')
+    if (ids) return weapons.filter(weapon => ids.has(weapon.id))
+
     const lowerQuery = query.toLowerCase()
 
     return weapons.filter(weapon => {
@@ -0,0 +1,73 @@
+// Query helper for search-index.json (built by scripts/search_index.py).
+//
+// Every whitespace/punctuation-separated term of the query must match:
+// terms of three or more characters match anywhere inside an indexed token
+// (via the trigram postings), shorter terms match token prefixes.
+
+// Must match _TOKEN in scripts/search_index.py
+const TOKEN = /[a-z0-9]+(?:\.[a-z0-9]+)*/g
+
+const tokenize = text => text.toLowerCase().match(TOKEN) || []
+
+const trigrams = token => {
+  const grams = new Set()
+  for (let i = 0; i + 3 <= token.length; i++) grams.add(token.slice(i, i + 3))
+  return grams
+}
+
+// First position in the sorted token list that is >= value
+const lowerBound = (tokens, value) => {
+  let lo = 0
+  let hi = tokens.length
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1
+    if (tokens[mid] < value) lo = mid + 1
+    else hi = mid
+  }
+  return lo
+}
+
+const termPositions = (index, term) => {
+  const { tokens } = index
+  if (term.length < 3) {
+    const positions = []
+    for (let p = lowerBound(tokens, term); p < tokens.length && tokens[p].startsWith(term); p++) {
+      positions.push(p)
+    }
+    return positions
+  }
+  const lists = [...trigrams(term)].map(gram => index.trigrams[gram] || [])
+  lists.sort((a, b) => a.length - b.length)
+  const rest = lists.slice(1).map(list => new Set(list))
+  return lists[0].filter(p => rest.every(set => set.has(p)) && tokens[p].includes(term))
+}
+
+/**
+ * Ids of the items of `kind` matching `query`, or null when the index is
+ * unavailable or the query has no terms (callers then fall back to filtering
+ * their full lists).
+ */
+export function searchIndexIds(index, query, kind) {
+  if (!index || !index.tokens) return null
+  const terms = tokenize(query)
+  if (terms.length === 0) return null
+
+  let docs = null
+  for (const term of terms) {
+    const termDocs = new Set()
+    for (const position of termPositions(index, term)) {
+      for (const doc of index.postings[position]) {
+        if (docs === null || docs.has(doc)) termDocs.add(doc)
+      }
+    }
+    docs = termDocs
+    if (docs.size === 0) break
+  }
+
+  const ids = new Set()
+  for (const doc of docs) {
+    const [docKind, id] = index.documents[doc]
+    if (!kind || docKind === kind) ids.add(id)
+  }
+  return ids
+}
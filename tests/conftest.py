@@ -0,0 +1,25 @@
+"""Fixtures shared by the data pipeline tests."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Data directories committed with generated files (indexes, catalog, manifest)
+COMMITTED_DATA_DIRS = ["docs/data", "public/data"]
+
+
+@pytest.fixture
+def write_data():
+    """``write_data(directory, name, data)`` writes ``data`` as JSON to ``directory / name``."""
+    def _write(directory, name, data):
+        (directory / name).write_text(json.dumps(data), encoding="utf-8")
+    return _write
+
+
+@pytest.fixture(params=COMMITTED_DATA_DIRS)
+def committed_data_dir(request):
+    """Each committed data directory; its generated files must match its data files."""
+    return ROOT / request.param
@@ -0,0 +1,154 @@
+"""Tests for scripts/attachment_views.py."""
+
+import json
+
+from parse_weapon_attachments import parse_wiki_xml_simple
+from scripts.attachment_views import (
+    COMPATIBILITY_VIEW,
+    FROM_WIKI_VIEW,
+    SPECIFIC_VIEW,
+    AttachmentViews,
+    attachment_names,
+    attachment_slot_types,
+    attachment_type_links,
+    extract_attachment_views,
+    extract_attachments_section,
+    resolve_specific_attachments,
+)
+from scripts.extract_weapons import extract_weapons
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+WEAPON_TEXT = """{{Item Infobox
+| kind = weapon
+| title = Beck 8
+| Caliber = [[9mm]]
+}}
+Beck 8 is a pistol.
+==Available Attachments==
+• [[Attachments]]
+• [[Sight]]
+• [[Muzzle Attachments|Muzzle]]
+• [[Gun Crank]]
+==Trivia==
+[[Category:Weapons]]"""
+
+OLD_FORMAT_SECTION = """===Sights===
+* [[Red Dot Sight]]
+===Gun Crank===
+* [[Gun Crank]]
+* Priming Bolt, none"""
+
+# The weapon comes before its attachments: the specific view must still resolve
+DUMP = f"""<mediawiki xmlns="http://www.mediawiki.org/xml/export-0.11/">
+<page><title>Beck 8</title><revision><text>{WEAPON_TEXT}</text></revision></page>
+<page><title>Red Dot Sight</title><revision><text>[[Category:Sights]]</text></revision></page>
+<page><title>Compensator</title><revision><text>[[Category:Muzzle Attachments]]</text></revision></page>
+<page><title>Suppressor</title><revision><text>old</text></revision>
+<revision><text>[[Category:Muzzle Attachments]]</text></revision></page>
+<page><title>Laser Pointer</title><revision><text>[[Category:Laser Sights]]</text></revision></page>
+<page><title>Category:Sights</title><revision><text>[[Category:Sights]]</text></revision></page>
+</mediawiki>
+"""
+
+
+# ---------------------------------------------------------------------------
+# Section parsing
+# ---------------------------------------------------------------------------
+
+
+class TestExtractAttachmentsSection:
+    def test_stops_at_next_level_2_heading(self):
+        section = extract_attachments_section(WEAPON_TEXT)
+        assert section.startswith("• [[Attachments]]")
+        assert "Trivia" not in section
+
+    def test_keeps_level_3_subsections(self):
+        text = f"== Available Attachments ==\n{OLD_FORMAT_SECTION}\n==Trivia=="
+        assert extract_attachments_section(text) == OLD_FORMAT_SECTION
+
+    def test_absent(self):
+        assert extract_attachments_section("No attachments here") is None
+
+
+class TestViews:
+    def test_slot_types(self):
+        assert attachment_slot_types(extract_attachments_section(WEAPON_TEXT)) == ["chamber", "muzzle", "sight"]
+
+    def test_names_links_then_plain_bullets(self):
+        assert attachment_names(OLD_FORMAT_SECTION) == ["Red Dot Sight", "Gun Crank", "Priming Bolt"]
+
+    def test_type_links_skip_generic_link(self):
+        section = extract_attachments_section(WEAPON_TEXT)
+        assert attachment_type_links(section) == ["Sight", "Muzzle Attachments", "Gun Crank"]
+
+    def test_resolve_expands_categories_and_keeps_unknown_types(self):
+        result = resolve_specific_attachments(
+            {"Sights": ["B Sight", "A Sight"]},
+            {"Beck 8": ["Sight", "Gun Crank", "Sights"]},
+        )
+        assert result == {"Beck 8": ["A Sight", "B Sight", "Gun Crank"]}
+
+    def test_specific_view_needs_weapons_category(self):
+        collector = AttachmentViews()
+        text = WEAPON_TEXT.replace("[[Category:Weapons]]", "")
+        collector.add_revision("Unlisted", text)
+        collector.add_page("Unlisted", text)
+        views = collector.views()
+        assert "Unlisted" in views[COMPATIBILITY_VIEW] and "Unlisted" in views[FROM_WIKI_VIEW]
+        assert views[SPECIFIC_VIEW] == {}
+
+
+# ---------------------------------------------------------------------------
+# Extraction
+# ---------------------------------------------------------------------------
+
+
+class TestExtractAttachmentViews:
+    def test_one_pass_writes_every_view(self, tmp_path):
+        dump = tmp_path / "dump.xml"
+        dump.write_text(DUMP, encoding="utf-8")
+
+        views = extract_attachment_views(str(dump), str(tmp_path / "views"))
+
+        assert views == {
+            COMPATIBILITY_VIEW: {"Beck 8": ["chamber", "muzzle", "sight"]},
+            FROM_WIKI_VIEW: {"Beck 8": ["Attachments", "Sight", "Muzzle Attachments", "Gun Crank"]},
+            SPECIFIC_VIEW: {"Beck 8": ["Compensator", "Gun Crank", "Red Dot Sight", "Suppressor"]},
+        }
+        for filename, view in views.items():
+            assert json.loads((tmp_path / "views" / filename).read_text(encoding="utf-8")) == view
+
+    def test_collected_during_weapon_pass(self, tmp_path):
+        dump = tmp_path / "dump.xml"
+        dump.write_text(DUMP, encoding="utf-8")
+        collector = AttachmentViews()
+
+        weapons = extract_weapons(str(dump), str(tmp_path / "weapons.json"), views=collector)
+
+        assert [weapon["name"] for weapon in weapons] == ["Beck 8"]
+        assert collector.views() == extract_attachment_views(str(dump), str(tmp_path / "views"))
+
+    def test_compatibility_view_falls_back_to_older_revisions(self, tmp_path):
+        dump = tmp_path / "dump.xml"
+        dump.write_text(DUMP.replace(
+            f"<revision><text>{WEAPON_TEXT}</text></revision>",
+            f"<revision><text>{WEAPON_TEXT}</text></revision><revision><text>Rewritten</text></revision>",
+        ), encoding="utf-8")
+        collector = AttachmentViews()
+
+        extract_weapons(str(dump), str(tmp_path / "weapons.json"), views=collector)
+        views = collector.views()
+
+        assert views[COMPATIBILITY_VIEW] == {"Beck 8": ["chamber", "muzzle", "sight"]}
+        assert views[FROM_WIKI_VIEW] == {}
+        assert parse_wiki_xml_simple(str(dump)) == views[COMPATIBILITY_VIEW]
+
+    def test_latest_section_without_slots_wins(self):
+        collector = AttachmentViews()
+        collector.add_revision("Beck 8", WEAPON_TEXT)
+        collector.add_revision("Beck 8", "==Available Attachments==\nNone yet")
+        assert collector.views()[COMPATIBILITY_VIEW] == {}
@@ -0,0 +1,71 @@
+"""Tests for scripts/attribute_index.py - stat -> modifying items index."""
+
+import json
+
+import pytest
+
+from scripts.attribute_index import (
+    ATTRIBUTE_INDEX_FILENAME,
+    build_attribute_index,
+    candidate_ids,
+    modifiers_of,
+    write_attribute_index,
+)
+from scripts.search_index import load_documents
+
+DOCUMENTS = [
+    ("oil", {"id": "Small_Oil", "name": "Small Oil", "modifiers": [
+        {"attribute": "Damage", "modType": 200, "value": 0.1},
+    ]}),
+    ("oil", {"id": "Big_Oil", "name": "Big Oil", "modifiers": [
+        {"attribute": "Damage", "modType": 200, "value": -0.5},
+        {"attribute": "BulletPenetrations", "modType": 100, "value": 2.0},
+    ]}),
+    ("scroll", {"id": "Scroll_X", "name": "Scroll X", "modifiers": [
+        {"attribute": "Damage", "modType": 100, "value": 5.0},
+    ]}),
+    ("attachment", {"id": "Silencer", "name": "Silencer",
+                    "modifiers": {"Damage": {"value": -0.1, "type": "percent"}}}),
+]
+
+
+@pytest.fixture
+def index():
+    return build_attribute_index(DOCUMENTS)
+
+
+class TestBuildAttributeIndex:
+    def test_groups_by_stat_and_type(self, index):
+        assert list(index) == ["BulletPenetrations", "Damage"]
+        assert list(index["Damage"]) == ["Flat", "PercentAdd", "Percent"]
+
+    def test_sorted_by_magnitude(self, index):
+        assert [entry["id"] for entry in index["Damage"]["PercentAdd"]] == ["Big_Oil", "Small_Oil"]
+
+
+class TestQueries:
+    def test_modifiers_of_filters_type_and_kind(self, index):
+        assert [e["id"] for e in modifiers_of(index, "Damage")] == ["Scroll_X", "Big_Oil", "Small_Oil", "Silencer"]
+        assert modifiers_of(index, "Damage", "Percent") == [
+            {"kind": "attachment", "id": "Silencer", "value": -0.1, "modType": "Percent"},
+        ]
+        assert [e["id"] for e in modifiers_of(index, "Damage", kind="oil")] == ["Big_Oil", "Small_Oil"]
+        assert modifiers_of(index, "Unknown") == []
+
+    def test_candidate_ids(self, index):
+        assert candidate_ids(index, ["BulletPenetrations"]) == {"Big_Oil"}
+        assert candidate_ids(index, ["Damage"], kind="scroll") == {"Scroll_X"}
+
+
+class TestWriteAttributeIndex:
+    def test_reads_extractor_outputs(self, tmp_path):
+        (tmp_path / "enchantments.json").write_text(json.dumps([d[1] for d in DOCUMENTS[:2]]), encoding="utf-8")
+        index = write_attribute_index(str(tmp_path))
+        assert set(index) == {"Damage", "BulletPenetrations"}
+        written = json.loads((tmp_path / ATTRIBUTE_INDEX_FILENAME).read_text(encoding="utf-8"))
+        assert written == index
+
+
+def test_committed_index_matches_data_files(committed_data_dir):
+    written = json.loads((committed_data_dir / ATTRIBUTE_INDEX_FILENAME).read_text(encoding="utf-8"))
+    assert written == build_attribute_index(load_documents(str(committed_data_dir)))
@@ -0,0 +1,62 @@
+"""Tests for benchmarks/ - synthetic dump generator and benchmark runner."""
+
+import pytest
+
+from benchmarks.run import compare_results, run_benchmarks
+from benchmarks.synthetic_dump import generate_dump
+from scripts.extract_calibers import extract_calibers
+from scripts.extract_enchantments import extract_enchantments
+from scripts.extract_weapons import extract_weapons
+from scripts.wiki_parser import iterate_pages
+
+
+class TestGenerateDump:
+    def test_deterministic(self, tmp_path):
+        generate_dump(str(tmp_path / "a.xml"), pages=50, seed=3)
+        generate_dump(str(tmp_path / "b.xml"), pages=50, seed=3)
+        assert (tmp_path / "a.xml").read_bytes() == (tmp_path / "b.xml").read_bytes()
+
+    def test_extractors_find_generated_items(self, tmp_path):
+        dump = str(tmp_path / "dump.xml")
+        stats = generate_dump(dump, pages=300, revisions=2, item_ratio=0.8)
+        assert stats["revisions"] == 600
+        assert stats["bytes"] == (tmp_path / "dump.xml").stat().st_size
+        # Namespace pages and redirects are skipped
+        assert stats["item_pages"] <= sum(1 for _ in iterate_pages(dump)) < 300
+
+        weapons = extract_weapons(dump, str(tmp_path / "weapons.json"))
+        assert weapons and all(w["name"].startswith("Synthetic Gun") for w in weapons)
+        assert extract_enchantments(dump, str(tmp_path / "oils.json"))
+        assert len(extract_calibers(dump, str(tmp_path / "cal.json"))["calibers"]) >= 3
+
+    def test_formats_restrict_item_kinds(self, tmp_path):
+        dump = str(tmp_path / "dump.xml")
+        generate_dump(dump, pages=100, item_ratio=1.0, formats=["weapon"])
+        titles = [title for title, _ in iterate_pages(dump)]
+        assert titles and all(title.startswith("Synthetic Gun") for title in titles)
+
+    def test_unknown_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            generate_dump(str(tmp_path / "dump.xml"), formats=["infobox"])
+
+
+class TestRunBenchmarks:
+    def test_records_stage_metrics(self, capsys):
+        results = run_benchmarks(pages=40, stages=["iterate_pages"], repeat=1)
+        stage = results["stages"]["iterate_pages"]
+        assert stage["seconds"] > 0
+        assert stage["pages_per_sec"] == pytest.approx(40 / stage["seconds"])
+        assert stage["peak_rss_mb"] is None or stage["peak_rss_mb"] >= stage["baseline_rss_mb"]
+
+        compare_results(results, results)
+        assert "1.00x" in capsys.readouterr().out
+
+
+class TestSimulateBenchmark:
+    def test_reports_each_build(self):
+        pytest.importorskip("numpy")
+        from benchmarks.simulate import benchmark_simulate
+
+        results = benchmark_simulate(["rare_hits"], trials=2000, repeat=1)
+        assert results["rare_hits"]["seconds"] > 0
+        assert results["rare_hits"]["hit_chance"] < 0.02 and results["rare_hits"]["mean_shots"] > 1000
@@ -0,0 +1,165 @@
+"""Tests for scripts/calculator.py - Python port of the frontend stacking rules."""
+
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from scripts.calculator import IncrementalBuild, calculate_modified_stats
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "docs" / "data"
+
+
+def _rows_by_stat(rows):
+    return {row["stat"]: row for row in rows}
+
+
+WEAPON = {
+    "id": "Weapon_Test",
+    "name": "Test",
+    "ammoType": "7.62mm",
+    "baseStats": {"Damage": 160.0, "RPM": 80.0, "Spread": 2.0, "Recoil": 20.0, "ProjectileCount": 1.0},
+}
+
+SCROLL_OF_LIGHT = {
+    "id": "Scroll_of_Light",
+    "modifiers": [{"attribute": "RPM", "modType": 200, "value": -0.5}],
+    "specialEffects": {"ConvertWpn": "Light"},
+}
+
+ATTACK_SPEED_OIL = {"id": "Attack_Speed_Oil", "modifiers": [{"attribute": "RPM", "modType": 200, "value": 0.25}]}
+
+CALIBERS = {
+    "baseAmmoDamage": {"7.62mm": 100, "9mm": 60},
+    "calibers": {"9mm": {"Damage": 96.0, "Spread": 2.0, "Recoil": 5.0, "ProjectileCount": 1}},
+}
+
+CHISEL_9MM = {"id": "Chamber_Chisel_(9mm)", "modifiers": {}, "specialEffects": {"caliberConversion": "9mm"}}
+
+
+class TestCalculateModifiedStats:
+    def test_nothing_applied_returns_none(self):
+        assert calculate_modified_stats(WEAPON, [], []) is None
+
+    def test_convert_scroll_applies_before_oils(self):
+        rows = _rows_by_stat(calculate_modified_stats(WEAPON, [], [ATTACK_SPEED_OIL, SCROLL_OF_LIGHT]))
+        # 80 * 0.5 = 40, then +25% of 40 = 50
+        assert rows["RPM"]["modifiedValue"] == 50
+        assert rows["RPM"]["change"] == -30
+
+    def test_oil_percent_add_uses_base_after_flat(self):
+        oils = [
+            {"modifiers": [{"attribute": "Damage", "modType": 100, "value": 40.0}]},
+            {"modifiers": [{"attribute": "Damage", "modType": 200, "value": 0.5}]},
+            {"modifiers": [{"attribute": "Damage", "modType": 200, "value": 0.5}]},
+        ]
+        rows = _rows_by_stat(calculate_modified_stats(WEAPON, [], oils))
+        assert rows["Damage"]["modifiedValue"] == 400
+
+    def test_attachment_percentages_compound(self):
+        attachment = {"modifiers": {"Recoil": {"value": -0.5, "type": "percent"}, "Spread": -0.75}}
+        rows = _rows_by_stat(calculate_modified_stats(WEAPON, [attachment, attachment], []))
+        assert rows["Recoil"]["modifiedValue"] == 5
+        assert rows["Spread"]["modifiedValue"] == 0.5
+
+    def test_chisel_converts_caliber(self):
+        rows = _rows_by_stat(calculate_modified_stats(WEAPON, [CHISEL_9MM], [], CALIBERS))
+        # weapon multiplier 160 / 100 applied to 9mm base damage 60
+        assert rows["Damage"]["modifiedValue"] == 96
+        assert rows["Damage"]["baseValue"] == 96
+        assert rows["Recoil"]["modifiedValue"] == 5
+
+    def test_crit_is_additive_and_feeds_ads_crit(self):
+        oil = {"modifiers": [{"attribute": "CritChance", "modType": 200, "value": 0.1}]}
+        scope = {"modifiers": {"ADSCritChance": 0.2}}
+        rows = _rows_by_stat(calculate_modified_stats(WEAPON, [scope], [oil]))
+        assert rows["CritChance"]["modifiedValue"] == 0.1
+        assert rows["ADSCritChance"]["modifiedValue"] == 0.3
+        assert rows["ADSCritChance"]["change"] == 0.2
+
+    def test_bypass_scroll_adds_per_bullet_damage(self):
+        scroll = {
+            "modifiers": [{"attribute": "Damage", "modType": 100, "value": 100.0}],
+            "specialEffects": {"bypassPercentages": True, "perBulletDamage": 25},
+        }
+        weapon = dict(WEAPON, baseStats=dict(WEAPON["baseStats"], ProjectileCount=8.0))
+        rows = _rows_by_stat(calculate_modified_stats(weapon, [], [scroll]))
+        assert rows["Damage"]["modifiedValue"] == 360
+
+    def test_modifier_only_stat_oil_percentages_compound(self):
+        oils = [
+            {"modifiers": [{"attribute": "BulletBounces", "modType": 100, "value": 2.0}]},
+            {"modifiers": [{"attribute": "BulletBounces", "modType": 200, "value": 0.5}]},
+            {"modifiers": [{"attribute": "BulletBounces", "modType": 200, "value": 0.5}]},
+        ]
+        rows = _rows_by_stat(calculate_modified_stats(WEAPON, [], oils))
+        assert rows["BulletBounces"]["modifiedValue"] == 4.5
+        assert rows["BulletBounces"]["baseValue"] == 0
+
+
+class TestIncrementalBuild:
+    def test_reports_only_touched_stats(self):
+        build = IncrementalBuild(WEAPON, CALIBERS)
+        assert build.set_enchantment("oil0", ATTACK_SPEED_OIL) == {"RPM"}
+        assert build.set_attachment("chisel", CHISEL_9MM) == {"Damage", "ProjectileCount", "Spread", "Recoil"}
+
+    def test_stage_values(self):
+        build = IncrementalBuild(WEAPON)
+        build.set_enchantment("oil0", ATTACK_SPEED_OIL)
+        build.set_enchantment("scroll", SCROLL_OF_LIGHT)
+        stages = build.stage_values("RPM")
+        assert stages["convert"] == pytest.approx(40)
+        assert stages["final"] == pytest.approx(50)
+
+    def test_clearing_everything_matches_empty_build(self):
+        build = IncrementalBuild(WEAPON, CALIBERS)
+        build.set_attachment("chisel", CHISEL_9MM)
+        build.set_enchantment("scroll", SCROLL_OF_LIGHT)
+        build.set_attachment("chisel", None)
+        build.set_enchantment("scroll", None)
+        assert build.results() is None
+        assert build.stats() == pytest.approx(WEAPON["baseStats"])
+
+    def test_random_swaps_match_full_recompute(self):
+        weapons = json.loads((DATA_DIR / "weapons.json").read_text(encoding="utf-8"))
+        oils = json.loads((DATA_DIR / "enchantments.json").read_text(encoding="utf-8"))
+        scrolls = json.loads((DATA_DIR / "scrolls.json").read_text(encoding="utf-8"))
+        calibers = json.loads((DATA_DIR / "caliber-modifiers.json").read_text(encoding="utf-8"))
+        slot_files = {
+            "muzzle": "attachments-muzzle.json",
+            "sight": "attachments-sights.json",
+            "laser": "attachments-lasers.json",
+            "chamber": "attachments-chamber.json",
+            "chisel": "attachments-chisels.json",
+        }
+        attachments = {
+            slot: json.loads((DATA_DIR / name).read_text(encoding="utf-8")) for slot, name in slot_files.items()
+        }
+
+        rng = random.Random(1234)
+        for weapon in rng.sample(weapons, 8):
+            build = IncrementalBuild(weapon, calibers)
+            for _ in range(40):
+                roll = rng.random()
+                if roll < 0.4:
+                    slot = rng.choice(list(attachments))
+                    build.set_attachment(slot, rng.choice(attachments[slot] + [None]))
+                elif roll < 0.8:
+                    build.set_enchantment(f"oil{rng.randrange(5)}", rng.choice(oils + [None]))
+                else:
+                    build.set_enchantment("scroll", rng.choice(scrolls + [None]))
+
+                expected = calculate_modified_stats(
+                    weapon,
+                    list(build._attachments.values()),
+                    list(build._enchantments.values()),
+                    calibers,
+                )
+                actual = build.results()
+                if expected is None:
+                    assert actual is None
+                    continue
+                assert [r["stat"] for r in actual] == [r["stat"] for r in expected]
+                for got, want in zip(actual, expected):
+                    assert got["modifiedValue"] == pytest.approx(want["modifiedValue"], abs=0.011)
@@ -0,0 +1,44 @@
+"""Tests for scripts/catalog.py - bundled, content-hashed data catalog."""
+
+import gzip
+import json
+
+from scripts.catalog import CATALOG_FILENAME, build_catalog, content_hash, write_catalog
+
+
+class TestContentHash:
+    def test_ignores_key_order(self):
+        assert content_hash({"a": 1, "b": [1, 2]}) == content_hash({"b": [1, 2], "a": 1})
+
+    def test_changes_with_data(self):
+        assert content_hash({"a": 1}) != content_hash({"a": 2})
+
+
+class TestWriteCatalog:
+    def test_bundles_files_and_gzip_twin(self, tmp_path, write_data):
+        write_data(tmp_path, "weapons.json", [{"id": "Weapon_X", "name": "X"}])
+        write_data(tmp_path, "attachments-muzzle.json", [{"id": "Muzzle_A", "name": "A"}])
+        write_data(tmp_path, "caliber-modifiers.json", {"calibers": {}})
+
+        catalog = write_catalog(str(tmp_path))
+
+        assert catalog["data"]["weapons"] == [{"id": "Weapon_X", "name": "X"}]
+        assert catalog["data"]["attachments"]["muzzle"] == [{"id": "Muzzle_A", "name": "A"}]
+        assert catalog["data"]["attachments"]["sight"] == []
+        assert "scrolls" not in catalog["data"]
+        raw = (tmp_path / CATALOG_FILENAME).read_bytes()
+        assert json.loads(raw) == catalog
+        assert gzip.decompress((tmp_path / (CATALOG_FILENAME + ".gz")).read_bytes()) == raw
+
+    def test_output_is_deterministic(self, tmp_path, write_data):
+        write_data(tmp_path, "weapons.json", [{"id": "Weapon_X"}])
+        write_catalog(str(tmp_path))
+        first = (tmp_path / (CATALOG_FILENAME + ".gz")).read_bytes()
+        write_catalog(str(tmp_path))
+        assert (tmp_path / (CATALOG_FILENAME + ".gz")).read_bytes() == first
+
+
+def test_committed_catalog_matches_data_files(committed_data_dir):
+    """The shipped catalog must be regenerated whenever a data file changes."""
+    shipped = json.loads((committed_data_dir / CATALOG_FILENAME).read_text(encoding="utf-8"))
+    assert shipped == build_catalog(str(committed_data_dir))
@@ -0,0 +1,58 @@
+"""Tests for scripts/compatibility.py - weapon/attachment compatibility index."""
+
+import json
+
+from scripts.compatibility import (
+    COMPATIBILITY_FILENAME,
+    build_compatibility_index,
+    compatible_attachments,
+    write_compatibility_index,
+)
+
+ATTACHMENTS = {
+    "muzzle": [{"id": "Muzzle_A", "name": "A"}, {"id": "Muzzle_B", "name": "B"}],
+    "sight": [{"id": "Sight_S", "name": "S"}],
+    "insurance": [{"id": "Insurance", "name": "Insurance"}],
+}
+
+
+class TestCompatibleAttachments:
+    def test_specific_restricts_matching_slots_only(self):
+        weapon = {"allowedAttachments": ["muzzle", "sight"], "specificAttachments": ["B"]}
+        result = compatible_attachments(weapon, ATTACHMENTS)
+        assert [a["name"] for a in result["muzzle"]] == ["B"]
+        assert [a["name"] for a in result["sight"]] == ["S"]
+        assert "insurance" not in result
+
+    def test_missing_allowed_means_every_slot(self):
+        assert list(compatible_attachments({}, ATTACHMENTS)) == ["muzzle", "sight", "insurance"]
+
+    def test_empty_allowed_means_no_slots(self):
+        assert compatible_attachments({"allowedAttachments": []}, ATTACHMENTS) == {}
+
+
+class TestBuildCompatibilityIndex:
+    def test_maps_weapon_ids_to_attachment_ids(self):
+        weapons = [
+            {"id": "Weapon_X", "allowedAttachments": ["sight", "muzzle"], "specificAttachments": ["A"]},
+            {"id": "Weapon_Y", "allowedAttachments": ["insurance"]},
+        ]
+        assert build_compatibility_index(weapons, ATTACHMENTS) == {
+            "Weapon_X": {"muzzle": ["Muzzle_A"], "sight": ["Sight_S"]},
+            "Weapon_Y": {"insurance": ["Insurance"]},
+        }
+
+
+class TestWriteCompatibilityIndex:
+    def test_reads_extractor_outputs(self, tmp_path):
+        (tmp_path / "weapons.json").write_text(json.dumps([
+            {"id": "Weapon_X", "allowedAttachments": ["muzzle", "laser"], "specificAttachments": []},
+        ]), encoding="utf-8")
+        (tmp_path / "attachments-muzzle.json").write_text(json.dumps(ATTACHMENTS["muzzle"]), encoding="utf-8")
+
+        index = write_compatibility_index(str(tmp_path))
+
+        # laser file is missing, so the slot is present but empty
+        assert index == {"Weapon_X": {"muzzle": ["Muzzle_A", "Muzzle_B"], "laser": []}}
+        written = json.loads((tmp_path / COMPATIBILITY_FILENAME).read_text(encoding="utf-8"))
+        assert written == index
@@ -0,0 +1,151 @@
+"""Tests for scripts/data_io.py - atomic writes, the output writer and staged output directories."""
+
+import json
+import os
+import stat
+import threading
+
+import pytest
+
+from scripts.data_io import (
+    STAGING_COMPLETE,
+    OutputWriter,
+    atomic_path,
+    atomic_write,
+    copy_file,
+    recover_output,
+    staged_output,
+    write_json,
+)
+
+
+class TestAtomicWrite:
+    def test_failed_write_keeps_old_file(self, tmp_path):
+        path = tmp_path / "weapons.json"
+        path.write_text("old", encoding="utf-8")
+        with pytest.raises(RuntimeError):
+            with atomic_write(str(path)) as f:
+                f.write("partial")
+                raise RuntimeError("crash")
+        assert path.read_text(encoding="utf-8") == "old"
+        assert os.listdir(tmp_path) == ["weapons.json"]
+
+    def test_write_json_matches_extractor_format(self, tmp_path):
+        data = [{"name": "Épée", "value": 1.5}]
+        write_json(str(tmp_path / "a.json"), data)
+        assert (tmp_path / "a.json").read_text(encoding="utf-8") == json.dumps(data, indent=2, ensure_ascii=False)
+
+    def test_write_json_compact(self, tmp_path):
+        data = [{"name": "Épée", "value": 1.5}]
+        write_json(str(tmp_path / "a.json"), data, pretty=False)
+        assert (tmp_path / "a.json").read_text(encoding="utf-8") == json.dumps(
+            data, ensure_ascii=False, separators=(",", ":"))
+
+    def test_keeps_mode_of_replaced_file(self, tmp_path):
+        path = tmp_path / "a.json"
+        path.write_text("old", encoding="utf-8")
+        os.chmod(path, 0o644)
+        write_json(str(path), [])
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+
+    def test_new_file_mode_follows_umask(self, tmp_path):
+        (tmp_path / "plain.json").write_text("[]", encoding="utf-8")
+        write_json(str(tmp_path / "atomic.json"), [])
+        assert os.stat(tmp_path / "atomic.json").st_mode == os.stat(tmp_path / "plain.json").st_mode
+
+    def test_atomic_path_and_copy(self, tmp_path):
+        with atomic_path(str(tmp_path / "db")) as tmp:
+            with open(tmp, "wb") as f:
+                f.write(b"data")
+            assert not (tmp_path / "db").exists()
+        copy_file(str(tmp_path / "db"), str(tmp_path / "copy"))
+        assert (tmp_path / "copy").read_bytes() == b"data"
+
+    def test_concurrent_writers_in_one_directory(self, tmp_path):
+        threads = [threading.Thread(target=write_json, args=(str(tmp_path / f"{i % 4}.json"), [i]))
+                   for i in range(32)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sorted(os.listdir(tmp_path)) == ["0.json", "1.json", "2.json", "3.json"]
+        for name in os.listdir(tmp_path):
+            json.loads((tmp_path / name).read_text(encoding="utf-8"))
+
+
+class TestOutputWriter:
+    def test_output_matches_write_json(self, tmp_path):
+        data = {"Épée": [1.5, {"a": None}]}
+        write_json(str(tmp_path / "direct.json"), data)
+        with OutputWriter(max_workers=2) as writer:
+            for i in range(8):
+                write_json(str(tmp_path / f"{i}.json"), data, writer)
+        expected = (tmp_path / "direct.json").read_bytes()
+        assert all((tmp_path / f"{i}.json").read_bytes() == expected for i in range(8))
+        assert len(writer.timings) == 8
+        assert all(t["bytes"] == len(expected) for t in writer.timings)
+
+    def test_flush_raises_write_errors(self, tmp_path):
+        with OutputWriter() as writer:
+            write_json(str(tmp_path / "missing" / "a.json"), [], writer)
+            with pytest.raises(FileNotFoundError):
+                writer.flush()
+            write_json(str(tmp_path / "b.json"), [], writer)
+        assert (tmp_path / "b.json").exists()
+
+    def test_report_lists_every_file(self, tmp_path, capsys):
+        with OutputWriter() as writer:
+            write_json(str(tmp_path / "a.json"), [], writer)
+            write_json(str(tmp_path / "b.json"), [1], writer)
+        writer.report()
+        out = capsys.readouterr().out
+        assert "a.json" in out and "b.json" in out
+
+
+class TestStagedOutput:
+    def test_success_swaps_in_staging(self, tmp_path):
+        out = tmp_path / "data"
+        out.mkdir()
+        (out / "keep.json").write_text("1", encoding="utf-8")
+        with staged_output(str(out)) as staging:
+            assert os.path.exists(os.path.join(staging, "keep.json"))
+            write_json(os.path.join(staging, "new.json"), [])
+            assert not (out / "new.json").exists()
+        assert sorted(os.listdir(out)) == ["keep.json", "new.json"]
+        assert sorted(os.listdir(tmp_path)) == ["data"]
+
+    def test_failure_leaves_output_untouched(self, tmp_path):
+        out = tmp_path / "data"
+        out.mkdir()
+        (out / "weapons.json").write_text("old", encoding="utf-8")
+        with pytest.raises(KeyboardInterrupt):
+            with staged_output(str(out)) as staging:
+                write_json(os.path.join(staging, "weapons.json"), ["new"])
+                raise KeyboardInterrupt
+        assert (out / "weapons.json").read_text(encoding="utf-8") == "old"
+        assert sorted(os.listdir(tmp_path)) == ["data"]
+
+    def test_creates_missing_output_dir(self, tmp_path):
+        with staged_output(str(tmp_path / "data")) as staging:
+            write_json(os.path.join(staging, "a.json"), [])
+        assert os.listdir(tmp_path / "data") == ["a.json"]
+
+
+class TestRecoverOutput:
+    def test_rolls_forward_completed_staging(self, tmp_path):
+        staging = tmp_path / "data.staging"
+        staging.mkdir()
+        (staging / STAGING_COMPLETE).write_text("", encoding="utf-8")
+        (staging / "new.json").write_text("[]", encoding="utf-8")
+        (tmp_path / "data.old").mkdir()
+        recover_output(str(tmp_path / "data"))
+        assert sorted(os.listdir(tmp_path)) == ["data"]
+        assert os.listdir(tmp_path / "data") == ["new.json"]
+
+    def test_rolls_back_incomplete_staging(self, tmp_path):
+        (tmp_path / "data.staging").mkdir()
+        (tmp_path / "data.old").mkdir()
+        (tmp_path / "data.old" / "old.json").write_text("[]", encoding="utf-8")
+        recover_output(str(tmp_path / "data"))
+        assert sorted(os.listdir(tmp_path)) == ["data"]
+        assert os.listdir(tmp_path / "data") == ["old.json"]
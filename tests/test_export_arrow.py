@@ -0,0 +1,81 @@
+"""Tests for scripts/export_arrow.py - Arrow/Parquet export."""
+
+import json
+import sys
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from scripts import update_all  # noqa: E402
+from scripts.export_arrow import SCHEMAS, build_tables, export_arrow, read_table  # noqa: E402
+from scripts.export_sqlite import collect_rows  # noqa: E402
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    data = tmp_path / "data"
+    data.mkdir()
+    (data / "weapons.json").write_text(json.dumps([
+        {"id": "Weapon_X", "name": "X", "baseStats": {"Damage": 50, "RPM": 600.0}},
+    ]), encoding="utf-8")
+    (data / "scrolls.json").write_text(json.dumps([
+        {"id": "Scroll_A", "name": "A", "modifiers": [],
+         "specialEffects": {"ConvertWpn": True, "Proc": "10%", "Range": [3, 4]}},
+    ]), encoding="utf-8")
+    return data
+
+
+class TestBuildTables:
+    def test_schemas_and_exploded_rows(self, data_dir):
+        tables = build_tables(str(data_dir))
+        assert set(tables) == set(SCHEMAS)
+        assert tables["base_stats"].column("stat").to_pylist() == ["Damage", "RPM"]
+        assert tables["base_stats"].column("value").to_pylist() == [50.0, 600.0]
+        assert tables["special_effects"].column("value").to_pylist() == ["1", "10%", "[3,4]"]
+        assert tables["modifiers"].num_rows == 0
+
+    def test_snapshot_column(self, data_dir):
+        table = build_tables(str(data_dir), snapshot="2024-06")["items"]
+        assert table.column("snapshot").to_pylist() == ["2024-06", "2024-06"]
+
+
+class TestExportAndRead:
+    @pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+    def test_round_trip(self, data_dir, tmp_path, fmt):
+        export_arrow(str(data_dir), str(tmp_path / "out"), fmt)
+        items = read_table(str(tmp_path / "out"), "items")
+        assert items.schema == SCHEMAS["items"]
+        assert items.column("id").to_pylist() == ["Weapon_X", "Scroll_A"]
+
+    def test_reads_many_snapshots_as_one_table(self, data_dir, tmp_path):
+        for snapshot in ("old", "new"):
+            export_arrow(str(data_dir), str(tmp_path / snapshot), "arrow", snapshot)
+        table = read_table([str(tmp_path / "old"), str(tmp_path / "new")], "base_stats")
+        assert table.column("snapshot").to_pylist() == ["old", "old", "new", "new"]
+
+    def test_unknown_format(self, data_dir, tmp_path):
+        with pytest.raises(ValueError):
+            export_arrow(str(data_dir), str(tmp_path / "out"), "csv")
+
+
+def test_committed_data_matches_sqlite_rows(committed_data_dir):
+    data_dir = str(committed_data_dir)
+    tables = build_tables(data_dir)
+    rows = collect_rows(data_dir)
+    assert {name: table.num_rows for name, table in tables.items()} == {name: len(r) for name, r in rows.items()}
+
+
+def test_update_all_writes_parquet_and_arrow(tmp_path, monkeypatch):
+    dump = tmp_path / "dump.xml"
+    dump.write_text(
+        '<mediawiki xmlns="http://www.mediawiki.org/xml/export-0.11/"><page><title>Pistol</title>'
+        '<revision><text>{{Item Infobox\n| kind = weapon\n| Damage = 20\n| RPM = 300\n}}</text></revision>'
+        '</page></mediawiki>', encoding="utf-8")
+    monkeypatch.setattr(sys, "argv", [
+        "update_all", str(dump), "--output-dir", str(tmp_path / "data"),
+        "--parquet", str(tmp_path / "parquet"), "--arrow", str(tmp_path / "arrow"), "--snapshot", "test",
+    ])
+    update_all.main()
+    assert (tmp_path / "parquet" / "items.parquet").exists()
+    assert read_table(str(tmp_path / "arrow"), "items").equals(read_table(str(tmp_path / "parquet"), "items"))
@@ -0,0 +1,93 @@
+"""Tests for scripts/export_sqlite.py - SQLite export of the data set."""
+
+import json
+import sqlite3
+
+import pytest
+
+from scripts.export_sqlite import export_sqlite
+
+
+@pytest.fixture
+def data_dir(tmp_path, write_data):
+    write_data(tmp_path, "weapons.json", [
+        {"id": "Weapon_X", "name": "X", "type": "Rifle", "ammoType": "9mm",
+         "baseStats": {"Damage": 50.0, "RPM": 600.0}, "allowedAttachments": ["muzzle", "insurance"]},
+    ])
+    write_data(tmp_path, "enchantments.json", [
+        {"id": "Damage_Oil", "name": "Damage Oil", "modifiers": [{"attribute": "Damage", "modType": 200, "value": 0.2}]},
+    ])
+    write_data(tmp_path, "scrolls.json", [
+        {"id": "Scroll_A", "name": "Scroll A", "modifiers": [],
+         "specialEffects": {"Proc": "10%", "Stacks": {"max": 3, "per": "kill"}, "Tags": ["fire"]},
+         "effects": ["First", "Second"]},
+    ])
+    write_data(tmp_path, "attachments-muzzle.json", [
+        {"id": "Silencer", "name": "Silencer", "type": "muzzle", "modifiers": {"Damage": {"value": -0.1, "type": "percent"}}},
+        {"id": "Shared", "name": "Shared", "type": "muzzle", "modifiers": {}},
+    ])
+    write_data(tmp_path, "attachments-insurance.json", [{"id": "Shared", "name": "Shared", "type": "insurance"}])
+    write_data(tmp_path, "caliber-modifiers.json", {
+        "baseAmmoDamage": {"9mm": 60},
+        "calibers": {"9mm": {"Damage": 96.0}, "12Ga": {"Damage": 32.0}},
+    })
+    return tmp_path
+
+
+def _query(db_path, sql, *params):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+
+class TestExportSqlite:
+    def test_row_counts(self, data_dir, tmp_path):
+        counts = export_sqlite(str(data_dir), str(tmp_path / "out.db"))
+        assert counts["items"] == 6
+        assert counts["base_stats"] == 2
+        assert counts["modifiers"] == 2
+        assert counts["effects"] == 2
+        assert counts["calibers"] == 2
+
+    def test_modifier_query(self, data_dir, tmp_path):
+        db = str(tmp_path / "out.db")
+        export_sqlite(str(data_dir), db)
+        rows = _query(db, "SELECT i.kind, i.id, m.mod_type, m.value FROM modifiers m JOIN items i USING (item_key) "
+                          "WHERE m.attribute = ? ORDER BY m.value", "Damage")
+        assert rows == [("attachment", "Silencer", "Percent", -0.1), ("oil", "Damage_Oil", "PercentAdd", 0.2)]
+
+    def test_compatibility_keeps_slot_copies_apart(self, data_dir, tmp_path):
+        db = str(tmp_path / "out.db")
+        export_sqlite(str(data_dir), db)
+        rows = _query(db, "SELECT c.slot, a.id, a.slot FROM compatibility c "
+                          "JOIN items a ON a.item_key = c.attachment_key ORDER BY c.slot, a.id")
+        assert rows == [("insurance", "Shared", "insurance"), ("muzzle", "Shared", "muzzle"),
+                        ("muzzle", "Silencer", "muzzle")]
+
+    def test_structured_special_effects_stored_as_json(self, data_dir, tmp_path):
+        db = str(tmp_path / "out.db")
+        export_sqlite(str(data_dir), db)
+        rows = dict(_query(db, "SELECT effect, value FROM special_effects"))
+        assert rows["Proc"] == "10%"
+        assert json.loads(rows["Stacks"]) == {"max": 3, "per": "kill"}
+        assert json.loads(rows["Tags"]) == ["fire"]
+
+    def test_calibers_and_indexes(self, data_dir, tmp_path):
+        db = str(tmp_path / "out.db")
+        export_sqlite(str(data_dir), db)
+        assert _query(db, "SELECT * FROM calibers ORDER BY caliber") == [("12Ga", None), ("9mm", 60.0)]
+        plan = _query(db, "EXPLAIN QUERY PLAN SELECT * FROM modifiers WHERE attribute = 'Damage'")
+        assert "modifiers_attribute" in " ".join(str(row) for row in plan)
+
+    def test_replaces_existing_database(self, data_dir, tmp_path):
+        db = str(tmp_path / "out.db")
+        export_sqlite(str(data_dir), db)
+        export_sqlite(str(data_dir), db)
+        assert _query(db, "SELECT COUNT(*) FROM items") == [(6,)]
+
+
+def test_exports_committed_data(tmp_path, committed_data_dir):
+    counts = export_sqlite(str(committed_data_dir), str(tmp_path / "sulfur.db"))
+    assert counts["items"] > 0 and counts["compatibility"] > 0
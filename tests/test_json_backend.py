@@ -0,0 +1,61 @@
+"""Tests for scripts/json_backend.py - fast JSON backend with stdlib-identical output."""
+
+import json
+import os
+
+import pytest
+
+from scripts import json_backend
+from scripts.json_backend import dumps, load_json, loads
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "docs", "data")
+
+EDGE_CASES = [
+    1e-05,
+    1e16,
+    [1.5e300, -2e-7, 0.0001, 0.00012],
+    {"x": 123456789012345678.0},
+    2 ** 70,
+    {1: "int key"},
+    {"É": [], "b": {}, "c": "2af14e9c"},
+    {"note": "range 1e5", "value": 1e-7},
+]
+
+
+def _stdlib(data, pretty=False, sort_keys=False):
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False, sort_keys=sort_keys).encode("utf-8")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys).encode("utf-8")
+
+
+@pytest.fixture(params=["default", "stdlib"])
+def backend(request, monkeypatch):
+    if request.param == "stdlib":
+        monkeypatch.setattr(json_backend, "orjson", None)
+    return request.param
+
+
+class TestDumps:
+    @pytest.mark.parametrize("data", EDGE_CASES)
+    def test_edge_cases_match_stdlib(self, backend, data):
+        assert dumps(data, pretty=True) == _stdlib(data, pretty=True)
+        assert dumps(data) == _stdlib(data)
+        assert dumps(data, sort_keys=True) == _stdlib(data, sort_keys=True)
+
+    def test_data_files_round_trip_byte_identical(self, backend):
+        for filename in sorted(os.listdir(DATA_DIR)):
+            if filename.endswith(".json"):
+                path = os.path.join(DATA_DIR, filename)
+                data = load_json(path)
+                with open(path, encoding="utf-8") as f:
+                    assert data == json.load(f)
+                assert dumps(data, pretty=True) == _stdlib(data, pretty=True), filename
+                assert dumps(data) == _stdlib(data), filename
+
+
+class TestLoads:
+    def test_big_int_falls_back_to_stdlib(self, backend):
+        assert loads(b"[1180591620717411303424]") == [2 ** 70]
+
+    def test_accepts_str(self, backend):
+        assert loads('{"a": "É"}') == {"a": "É"}
@@ -0,0 +1,53 @@
+"""Tests for scripts/manifest.py - content-addressed data files."""
+
+import json
+
+from scripts.manifest import MANIFEST_FILENAME, file_hash, hashed_name, is_hashed_name, write_manifest
+
+
+class TestNames:
+    def test_hashed_name_round_trip(self):
+        name = hashed_name("attachments-muzzle.json", "0123456789abcdef")
+        assert name == "attachments-muzzle.0123456789abcdef.json"
+        assert is_hashed_name(name)
+        assert is_hashed_name(name + ".gz")
+        assert not is_hashed_name("attachments-muzzle.json")
+        assert not is_hashed_name("catalog.json.gz")
+
+
+class TestWriteManifest:
+    def test_only_changed_files_get_new_names(self, tmp_path, write_data):
+        write_data(tmp_path, "weapons.json", [{"id": "Weapon_X"}])
+        write_data(tmp_path, "scrolls.json", [{"id": "Scroll_A"}])
+        first = write_manifest(str(tmp_path))["files"]
+        assert set(first) == {"weapons.json", "scrolls.json"}
+        assert (tmp_path / first["weapons.json"]).read_bytes() == (tmp_path / "weapons.json").read_bytes()
+
+        write_data(tmp_path, "scrolls.json", [{"id": "Scroll_B"}])
+        second = write_manifest(str(tmp_path))["files"]
+        assert second["weapons.json"] == first["weapons.json"]
+        assert second["scrolls.json"] != first["scrolls.json"]
+        written = json.loads((tmp_path / MANIFEST_FILENAME).read_text(encoding="utf-8"))
+        assert written["files"] == second
+
+    def test_keeps_previous_generation_only(self, tmp_path, write_data):
+        names = []
+        for version in range(3):
+            write_data(tmp_path, "scrolls.json", [{"id": f"Scroll_{version}"}])
+            names.append(write_manifest(str(tmp_path))["files"]["scrolls.json"])
+        assert not (tmp_path / names[0]).exists()
+        assert (tmp_path / names[1]).exists()
+        assert (tmp_path / names[2]).exists()
+
+    def test_gzip_twin_follows_its_json(self, tmp_path, write_data):
+        write_data(tmp_path, "catalog.json", {"data": {}})
+        (tmp_path / "catalog.json.gz").write_bytes(b"gz")
+        hashed = write_manifest(str(tmp_path))["files"]["catalog.json"]
+        assert (tmp_path / (hashed + ".gz")).read_bytes() == b"gz"
+
+
+def test_committed_manifest_matches_data_files(committed_data_dir):
+    manifest = json.loads((committed_data_dir / MANIFEST_FILENAME).read_text(encoding="utf-8"))
+    for logical, hashed in manifest["files"].items():
+        assert hashed == hashed_name(logical, file_hash(str(committed_data_dir / logical)))
+        assert (committed_data_dir / hashed).read_bytes() == (committed_data_dir / logical).read_bytes()
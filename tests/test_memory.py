@@ -0,0 +1,89 @@
+"""Memory regression tests for dump parsing.
+
+Each extractor runs under tracemalloc over two synthetic dumps with about
+the same number of item pages, one with 4x the filler pages. The measured
+quantity is transient memory: peak minus what is still allocated afterwards
+(the extracted items, which are kept alive). A streaming parser's transient
+memory depends on the largest page, not on the number of pages; a parser
+that keeps every page element (or the whole document) alive grows with the
+dump and fails the growth check.
+"""
+
+import os
+import tracemalloc
+
+import pytest
+
+from benchmarks.synthetic_dump import generate_dump
+from scripts.extract_attachments import extract_attachments
+from scripts.extract_calibers import extract_calibers
+from scripts.extract_enchantments import extract_enchantments
+from scripts.extract_scrolls import extract_scrolls
+from scripts.extract_weapons import extract_weapons
+from scripts.wiki_parser import iterate_page_revisions, iterate_pages
+
+SMALL_PAGES = 800
+LARGE_PAGES = 4 * SMALL_PAGES
+ITEM_PAGES = 160
+
+# Transient memory on the large dump must stay below this ...
+PEAK_BUDGET = 8 * 1024 * 1024
+# ... and may exceed the small dump's by at most this much
+GROWTH_BUDGET = 64 * 1024
+
+STAGES = {
+    "iterate_pages": lambda dump, out: [title for title, _ in iterate_pages(dump)],
+    "iterate_page_revisions": lambda dump, out: [
+        title for title, _ in iterate_page_revisions(dump, keep=lambda text: "Infobox" in text)
+    ],
+    "extract_attachments": lambda dump, out: extract_attachments(dump, out),
+    "extract_weapons": lambda dump, out: extract_weapons(dump, os.path.join(out, "weapons.json")),
+    "extract_enchantments": lambda dump, out: extract_enchantments(dump, os.path.join(out, "enchantments.json")),
+    "extract_scrolls": lambda dump, out: extract_scrolls(dump, os.path.join(out, "scrolls.json")),
+    "extract_calibers": lambda dump, out: extract_calibers(dump, os.path.join(out, "caliber-modifiers.json")),
+}
+
+
+@pytest.fixture(scope="module")
+def dumps(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("memory")
+    paths = {}
+    for pages in (SMALL_PAGES, LARGE_PAGES):
+        paths[pages] = str(directory / f"dump-{pages}.xml")
+        generate_dump(paths[pages], pages=pages, item_ratio=ITEM_PAGES / pages)
+    return paths
+
+
+def transient_memory(stage, dump: str, output_dir: str) -> int:
+    """Peak traced bytes during ``stage`` minus the bytes its result keeps alive."""
+    tracemalloc.start()
+    try:
+        result = STAGES[stage](dump, output_dir)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak - current
+
+
+@pytest.fixture(scope="module")
+def measure(dumps, tmp_path_factory):
+    """``measure(stage, pages)`` -> transient bytes, each run once per module."""
+    cache = {}
+
+    def _measure(stage, pages):
+        if (stage, pages) not in cache:
+            output_dir = str(tmp_path_factory.mktemp(stage))
+            cache[stage, pages] = transient_memory(stage, dumps[pages], output_dir)
+        return cache[stage, pages]
+    return _measure
+
+
+@pytest.mark.parametrize("stage", list(STAGES))
+class TestParserMemory:
+    def test_peak_is_bounded(self, stage, measure, capsys):
+        assert measure(stage, LARGE_PAGES) < PEAK_BUDGET
+
+    def test_independent_of_dump_size(self, stage, measure, capsys):
+        small, large = measure(stage, SMALL_PAGES), measure(stage, LARGE_PAGES)
+        assert large - small < GROWTH_BUDGET, f"{stage}: {small:,} -> {large:,} bytes for 4x the pages"
@@ -0,0 +1,205 @@
+"""Tests for scripts/page_cache.py and the page offset helpers in wiki_parser."""
+
+import os
+
+import pytest
+
+from benchmarks.synthetic_dump import generate_dump
+from scripts import extract_scrolls as scrolls_module
+from scripts import page_cache, wiki_parser
+from scripts.extract_attachments import extract_attachments
+from scripts.extract_calibers import extract_calibers
+from scripts.extract_enchantments import extract_enchantments
+from scripts.extract_scrolls import extract_scrolls
+from scripts.extract_weapons import extract_weapons
+from scripts.page_cache import ClassifiedPages, PageCache, dump_fingerprint, parser_version, set_page_cache
+from scripts.wiki_parser import iterate_pages, iterate_pages_at, page_spans_match, scan_page_offsets
+
+DUMP = """<mediawiki xmlns="http://www.mediawiki.org/xml/export-0.11/">
+  <page>
+    <title>Beck &amp; Co</title>
+    <revision><text>{{Item Infobox
+| kind = weapon
+}}</text></revision>
+  </page>
+  <page>
+    <title>Lore</title>
+    <revision><text>A &lt;page&gt; about nothing</text></revision>
+  </page>
+</mediawiki>
+"""
+
+
+@pytest.fixture(autouse=True)
+def no_cache_override():
+    yield
+    set_page_cache(None)
+
+
+@pytest.fixture(scope="module")
+def dump(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("page-cache") / "dump.xml")
+    generate_dump(path, pages=600, revisions=2, item_ratio=0.3)
+    return path
+
+
+class TestPageOffsets:
+    @pytest.mark.parametrize("chunk_size", [1 << 20, 16, 5])
+    def test_scan_across_chunk_boundaries(self, tmp_path, chunk_size):
+        path = tmp_path / "dump.xml"
+        path.write_text(DUMP, encoding="utf-8")
+        offsets = scan_page_offsets(str(path), chunk_size=chunk_size)
+        assert list(offsets) == ["Beck & Co", "Lore"]
+        offset, length = offsets["Lore"][0]
+        assert path.read_bytes()[offset:offset + length].startswith(b"<page>")
+        assert path.read_bytes()[offset:offset + length].endswith(b"</page>")
+
+    def test_scan_selected_titles(self, tmp_path):
+        path = tmp_path / "dump.xml"
+        path.write_text(DUMP, encoding="utf-8")
+        assert list(scan_page_offsets(str(path), {"Lore", "Missing"})) == ["Lore"]
+
+    def test_spans_match_until_pages_move(self, tmp_path):
+        path = tmp_path / "dump.xml"
+        path.write_text(DUMP, encoding="utf-8")
+        spans = [(offset, length, title) for title, found in scan_page_offsets(str(path)).items()
+                 for offset, length in found]
+        assert page_spans_match(str(path), spans)
+
+        # Same size, other title
+        path.write_text(DUMP.replace("Lore", "Lord"), encoding="utf-8")
+        assert not page_spans_match(str(path), spans)
+        # Same size, pages shifted
+        path.write_text(DUMP.replace("  <page>", "<page>  "), encoding="utf-8")
+        assert not page_spans_match(str(path), spans)
+
+    def test_pages_at_match_iterate_pages(self, dump):
+        spans = sorted(span for spans in scan_page_offsets(dump).values() for span in spans)
+        assert list(iterate_pages_at(dump, spans)) == list(iterate_pages(dump, progress=False))
+
+
+class TestClassifiedPages:
+    def test_off_without_directory(self, dump, monkeypatch):
+        monkeypatch.delenv(page_cache.PAGE_CACHE_ENV, raising=False)
+        pages = ClassifiedPages(dump, "scroll")
+        assert pages.cache is None and not pages.cached
+        assert len(list(pages)) == sum(1 for _ in iterate_pages(dump, progress=False))
+
+    def test_second_pass_reads_marked_pages_only(self, dump, tmp_path):
+        first = ClassifiedPages(dump, "weapon", cache_dir=str(tmp_path))
+        for title, text in first:
+            if "kind = weapon" in text:
+                first.mark(title)
+
+        second = ClassifiedPages(dump, "weapon", cache_dir=str(tmp_path))
+        assert second.cached
+        assert {title for title, _ in second} == first.marked
+
+    def test_interrupted_pass_is_not_recorded(self, dump, tmp_path):
+        pages = ClassifiedPages(dump, "weapon", cache_dir=str(tmp_path))
+        next(iter(pages))
+        assert not PageCache(dump, str(tmp_path)).is_classified("weapon")
+
+    def test_full_pass_still_records(self, dump, tmp_path):
+        list(ClassifiedPages(dump, "weapon", cache_dir=str(tmp_path)))
+        pages = ClassifiedPages(dump, "weapon", full_pass=True, cache_dir=str(tmp_path))
+        assert not pages.cached
+        assert len(list(pages)) == sum(1 for _ in iterate_pages(dump, progress=False))
+        assert PageCache(dump, str(tmp_path)).is_classified("weapon")
+
+    def test_parser_change_reclassifies(self, dump, tmp_path, monkeypatch):
+        list(ClassifiedPages(dump, "weapon", cache_dir=str(tmp_path)))
+        assert ClassifiedPages(dump, "weapon", cache_dir=str(tmp_path)).cached
+        monkeypatch.setattr(page_cache, "parser_version", lambda page_type: "changed")
+        assert not ClassifiedPages(dump, "weapon", cache_dir=str(tmp_path)).cached
+
+    def test_parser_version_follows_source(self, tmp_path, monkeypatch):
+        (tmp_path / "fake_parser.py").write_text("ACCEPT = 1\n", encoding="utf-8")
+        monkeypatch.syspath_prepend(str(tmp_path))
+        monkeypatch.setitem(page_cache.PARSER_MODULES, "fake", ("fake_parser",))
+        before = parser_version("fake")
+        assert parser_version("fake") == before != parser_version("scroll")
+        (tmp_path / "fake_parser.py").write_text("ACCEPT = 2\n", encoding="utf-8")
+        assert parser_version("fake") != before
+
+    def test_fingerprint_covers_small_dumps_in_full(self, tmp_path):
+        path = tmp_path / "dump.xml"
+        content = bytearray(b"x" * (page_cache._FINGERPRINT_BYTES + 1000))
+        path.write_bytes(content)
+        before = dump_fingerprint(str(path))
+        content[-10] = ord("y")
+        path.write_bytes(content)
+        assert dump_fingerprint(str(path)) != before
+
+    def test_fingerprint_follows_content(self, tmp_path):
+        path = tmp_path / "dump.xml"
+        path.write_text(DUMP, encoding="utf-8")
+        before = dump_fingerprint(str(path))
+        path.write_text(DUMP.replace("Lore", "Lord"), encoding="utf-8")
+        assert dump_fingerprint(str(path)) != before
+
+
+class TestExtractorsWithCache:
+    def _run_all(self, dump, out):
+        os.makedirs(out)
+        extract_attachments(dump, out)
+        extract_weapons(dump, os.path.join(out, "weapons.json"))
+        extract_enchantments(dump, os.path.join(out, "enchantments.json"))
+        extract_scrolls(dump, os.path.join(out, "scrolls.json"))
+        extract_calibers(dump, os.path.join(out, "caliber-modifiers.json"))
+        return {name: open(os.path.join(out, name), "rb").read() for name in sorted(os.listdir(out))}
+
+    def test_cached_runs_read_fewer_pages_with_same_output(self, dump, tmp_path, capsys):
+        uncached = self._run_all(dump, str(tmp_path / "uncached"))
+
+        set_page_cache(str(tmp_path / "cache"))
+        cold = self._run_all(dump, str(tmp_path / "cold"))
+        before = wiki_parser.PARSE_STATS["pages"]
+        warm = self._run_all(dump, str(tmp_path / "warm"))
+        pages_read = wiki_parser.PARSE_STATS["pages"] - before
+
+        assert cold == uncached and warm == uncached
+        assert list(PageCache(dump, str(tmp_path / "cache")).data["classified"]) == [
+            "attachment", "weapon", "oil", "scroll", "ammo"]
+        assert pages_read < 5 * 600 * 0.5
+
+    def test_warm_run_after_parser_fix_finds_new_pages(self, dump, tmp_path, monkeypatch):
+        out = str(tmp_path / "scrolls.json")
+        expected = extract_scrolls(dump, out)
+        assert len(expected) > 1
+        missed = expected[0]["name"]
+
+        # Cold run with a parser that misses one scroll
+        set_page_cache(str(tmp_path / "cache"))
+        parse_scroll_page = scrolls_module.parse_scroll_page
+        with monkeypatch.context() as patch:
+            patch.setattr(scrolls_module, "parse_scroll_page",
+                          lambda title, text: None if title == missed else parse_scroll_page(title, text))
+            patch.setattr(scrolls_module, "parse_scroll_from_equipment_infobox", lambda title, text: None)
+            patch.setattr(page_cache, "parser_version", lambda page_type: "before the fix")
+            assert len(extract_scrolls(dump, out)) < len(expected)
+
+        # Warm run with the fixed parser
+        assert extract_scrolls(dump, out) == expected
+        assert extract_scrolls(dump, out) == expected
+
+    def test_dump_edited_in_place_falls_back_to_full_pass(self, dump, tmp_path, monkeypatch):
+        # An in-place edit that leaves the fingerprint unchanged
+        monkeypatch.setattr(page_cache, "dump_fingerprint", lambda dump_path: "unchanged")
+        edited = str(tmp_path / "dump.xml")
+        with open(dump, encoding="utf-8") as f:
+            text = f.read()
+        with open(edited, "w", encoding="utf-8") as f:
+            f.write(text)
+
+        set_page_cache(str(tmp_path / "cache"))
+        extract_scrolls(edited, str(tmp_path / "scrolls.json"))
+        with open(edited, "w", encoding="utf-8") as f:
+            f.write(text.replace("<page>", "<page>\n", 1))
+        set_page_cache("")
+        expected = extract_scrolls(edited, str(tmp_path / "scrolls.json"))
+
+        set_page_cache(str(tmp_path / "cache"))
+        assert extract_scrolls(edited, str(tmp_path / "scrolls.json")) == expected
+        assert PageCache(edited, str(tmp_path / "cache")).is_classified("scroll")
+        assert extract_scrolls(edited, str(tmp_path / "scrolls.json")) == expected
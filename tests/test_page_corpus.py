@@ -0,0 +1,132 @@
+"""Tests for scripts/page_corpus.py, and parser replay over corpus pages.
+
+The replay tests run every page parser over a corpus built from a synthetic
+dump. Set ``SULFUR_CORPUS`` to a corpus built from a real dump
+(``python -m scripts.page_corpus build``) to replay real pages as well.
+"""
+
+import os
+
+import pytest
+
+from benchmarks.parsers import PAGE_PARSERS, benchmark_parsers
+from benchmarks.synthetic_dump import generate_dump
+from scripts import page_corpus
+from scripts.page_corpus import PageCorpus, build_corpus, classify_page
+from scripts.wiki_parser import iterate_pages
+
+CORPUS_ENV = "SULFUR_CORPUS"
+
+
+@pytest.fixture(scope="module")
+def dump(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("corpus") / "dump.xml")
+    generate_dump(path, pages=1500, item_ratio=0.5)
+    return path
+
+
+@pytest.fixture(scope="module")
+def corpus_path(dump, tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("corpus") / "pages.corpus")
+    build_corpus(dump, path, codec="zlib")
+    return path
+
+
+class TestClassifyPage:
+    def test_item_infobox_kind(self):
+        assert classify_page("{{Item Infobox\n| kind = Weapon\n| Mag = 8\n}}") == ("Item Infobox", "weapon")
+
+    def test_other_templates(self):
+        assert classify_page("{{Weapon_Infobox\n| RPM = 400\n}}") == ("Weapon Infobox", "")
+        assert classify_page("{{Misc Item Infobox\n}}") == ("Misc Item Infobox", "")
+
+    def test_not_an_item(self):
+        assert classify_page("Lore about [[Category:Weapons]]") is None
+
+
+class TestPageCorpus:
+    def test_round_trip_keeps_item_pages_in_order(self, dump, corpus_path):
+        expected = [(title, text) for title, text in iterate_pages(dump, progress=False) if classify_page(text)]
+        with PageCorpus(corpus_path) as corpus:
+            assert list(corpus) == expected
+            assert len(corpus) == len(expected)
+
+    def test_random_access_and_filters(self, corpus_path):
+        with PageCorpus(corpus_path) as corpus:
+            weapons = corpus.titles(template="Item Infobox", kind="weapon")
+            assert weapons and weapons[-1] in corpus
+            assert "kind = weapon" in corpus.get(weapons[-1])
+            assert [title for title, _ in corpus.pages(kind="weapon")] == weapons
+            with pytest.raises(KeyError):
+                corpus.get("No such page")
+
+    def test_smaller_than_wikitext(self, corpus_path):
+        with PageCorpus(corpus_path) as corpus:
+            text_bytes = sum(len(f"{title}\0{text}".encode("utf-8")) for title, text in corpus)
+            assert corpus.summary()["bytes"] * 2 < text_bytes
+
+    def test_all_pages(self, dump, tmp_path):
+        path = str(tmp_path / "all.corpus")
+        result = build_corpus(dump, path, codec="zlib", all_pages=True)
+        assert result["pages"] == sum(1 for _ in iterate_pages(dump, progress=False))
+
+    def test_failed_build_keeps_previous_corpus(self, dump, corpus_path, tmp_path, monkeypatch):
+        path = tmp_path / "pages.corpus"
+        path.write_bytes(open(corpus_path, "rb").read())
+
+        def broken_pages(dump_path):
+            yield from iterate_pages(dump_path, progress=False)
+            raise OSError("dump truncated")
+
+        monkeypatch.setattr(page_corpus, "iterate_pages", broken_pages)
+        with pytest.raises(OSError):
+            build_corpus(dump, str(path), codec="zlib")
+        assert os.listdir(tmp_path) == ["pages.corpus"]
+        with PageCorpus(str(path)) as corpus, PageCorpus(corpus_path) as original:
+            assert list(corpus) == list(original)
+
+    def test_not_a_corpus(self, dump):
+        with pytest.raises(ValueError):
+            PageCorpus(dump)
+
+    def test_zstd(self, dump, tmp_path):
+        pytest.importorskip("zstandard")
+        path = str(tmp_path / "pages.corpus")
+        assert build_corpus(dump, path, codec="zstd")["codec"] == "zstd"
+        with PageCorpus(path) as corpus:
+            assert corpus.summary()["codec"] == "zstd" and len(list(corpus)) == len(corpus)
+
+    def test_zstd_without_zstandard(self, dump, tmp_path, monkeypatch):
+        monkeypatch.setattr(page_corpus, "zstandard", None)
+        assert page_corpus.default_codec() == "zlib"
+        with pytest.raises(ImportError):
+            build_corpus(dump, str(tmp_path / "pages.corpus"), codec="zstd")
+
+
+# ---------------------------------------------------------------------------
+# Parser replay
+# ---------------------------------------------------------------------------
+
+
+def _corpora(synthetic_path):
+    paths = [synthetic_path]
+    if os.environ.get(CORPUS_ENV):
+        paths.append(os.environ[CORPUS_ENV])
+    return paths
+
+
+@pytest.mark.parametrize("parser", list(PAGE_PARSERS))
+def test_parsers_replay_corpus(parser, corpus_path):
+    """Every parser accepts every item page without raising."""
+    for path in _corpora(corpus_path):
+        with PageCorpus(path) as corpus:
+            for title, wikitext in corpus:
+                PAGE_PARSERS[parser](title, wikitext)
+
+
+def test_benchmark_parsers(corpus_path):
+    with PageCorpus(corpus_path) as corpus:
+        pages = list(corpus)
+    results = benchmark_parsers(pages, ["parse_weapon_page", "parse_ammo_page"], repeat=1)
+    assert results["parse_weapon_page"]["matched"] > 0
+    assert results["parse_ammo_page"]["pages_per_sec"] > 0
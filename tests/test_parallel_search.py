@@ -0,0 +1,56 @@
+"""Tests for scripts/parallel_search.py - process-pool Pareto search."""
+
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from scripts.parallel_search import SharedTables, attach_tables, search_weapons
+from scripts.pareto import explore_weapon, load_catalog
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "docs" / "data"
+
+OBJECTIVES = [("Damage", "max"), ("Recoil", "min"), ("Spread", "min")]
+
+
+def _build_keys(result):
+    return {
+        (b["scroll"], tuple(b["oils"]), tuple(sorted(b["attachments"].items())), tuple(b["stats"].values()))
+        for b in result["front"]
+    }
+
+
+class TestSharedTables:
+    def test_attached_views_match_and_are_read_only(self):
+        tables = {"a": np.arange(12, dtype=np.float64).reshape(3, 4), "b": np.array([-1, 2], dtype=np.int64)}
+        with SharedTables(tables) as shared:
+            views, blocks = attach_tables(shared.spec)
+            try:
+                for name, array in tables.items():
+                    assert views[name].dtype == array.dtype
+                    assert np.array_equal(views[name], array)
+                    assert not views[name].flags.writeable
+            finally:
+                del views
+                for block in blocks:
+                    block.close()
+
+
+class TestSearchWeapons:
+    def test_matches_serial_search(self):
+        catalog = load_catalog(str(DATA_DIR))
+        weapons = [w for w in catalog["weapons"] if w["name"] in ("Beck 8", "Knop .22", "Longboy")]
+        progress = []
+
+        results = list(search_weapons(weapons, catalog, OBJECTIVES, pool_size=2, max_oils=3, workers=2,
+                                      progress=lambda done, total, name: progress.append((done, total))))
+
+        assert sorted(r["weapon"] for r in results) == sorted(w["id"] for w in weapons)
+        assert [done for done, _ in progress] == list(range(1, len(progress) + 1))
+        assert all(total == len(progress) for _, total in progress)
+        for result in results:
+            weapon = next(w for w in weapons if w["id"] == result["weapon"])
+            expected = explore_weapon(weapon, catalog, OBJECTIVES, pool_size=2, max_oils=3)
+            assert result["candidates"] == expected["candidates"]
+            assert _build_keys(result) == _build_keys(expected)
@@ -0,0 +1,99 @@
+"""Tests for scripts/pareto.py - multi-objective build search."""
+
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from scripts.calculator import calculate_modified_stats
+from scripts.pareto import FrontAccumulator, explore_weapon, load_catalog, pareto_front
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "docs" / "data"
+
+
+def _brute_force_front(values):
+    n = len(values)
+    return {
+        i for i in range(n)
+        if not any((values[j] >= values[i]).all() and (values[j] > values[i]).any() for j in range(n))
+    }
+
+
+class TestParetoFront:
+    def test_simple_two_objectives(self):
+        values = np.array([[1.0, 5.0], [2.0, 4.0], [1.5, 3.0], [3.0, 1.0], [0.5, 0.5]])
+        assert pareto_front(values).tolist() == [0, 1, 3]
+
+    def test_duplicates_collapse(self):
+        values = np.array([[1.0, 1.0], [1.0, 1.0], [0.0, 2.0]])
+        assert pareto_front(values).tolist() == [0, 2]
+
+    def test_matches_brute_force(self):
+        values = np.random.default_rng(3).random((600, 3))
+        assert set(pareto_front(values).tolist()) == _brute_force_front(values)
+
+    def test_empty(self):
+        assert pareto_front(np.zeros((0, 2))).tolist() == []
+
+
+class TestFrontAccumulator:
+    def test_streamed_chunks_match_single_pass(self):
+        values = np.random.default_rng(5).random((900, 3))
+        acc = FrontAccumulator(np.array([1.0, -1.0, 1.0]))
+        for start in range(0, 900, 200):
+            acc.add(values[start:start + 200], np.arange(start, min(start + 200, 900))[:, None])
+        expected = _brute_force_front(values * np.array([1.0, -1.0, 1.0]))
+        assert set(acc.payload[:, 0].tolist()) == expected
+        assert acc.count == 900
+
+    def test_merging_shard_fronts_keeps_candidate_count(self):
+        values = np.random.default_rng(9).random((400, 2))
+        senses = np.array([1.0, 1.0])
+        shards = []
+        for start in (0, 200):
+            shard = FrontAccumulator(senses)
+            shard.add(values[start:start + 200], np.arange(start, start + 200)[:, None])
+            shards.append(shard)
+
+        merged = FrontAccumulator(senses)
+        for shard in shards:
+            merged.add(shard.values, shard.payload, count=shard.count)
+        assert merged.count == 400
+        assert set(merged.payload[:, 0].tolist()) == _brute_force_front(values)
+
+
+class TestExploreWeapon:
+    def test_front_builds_reproduce_with_scalar_calculator(self):
+        catalog = load_catalog(str(DATA_DIR))
+        weapon = next(w for w in catalog["weapons"] if w["name"] == "Beck 8")
+        objectives = [("Damage", "max"), ("Recoil", "min")]
+        result = explore_weapon(weapon, catalog, objectives, pool_size=2, max_oils=3)
+
+        assert result["weapon"] == weapon["id"]
+        assert result["candidates"] > len(result["front"]) > 0
+        assert result["pool_size"] == 2 and result["approximate"]
+
+        by_id = {item["id"]: item for item in catalog["oils"] + catalog["scrolls"]}
+        attachments_by_id = {a["id"]: a for items in catalog["attachments"].values() for a in items}
+        for build in result["front"]:
+            enchantments = [by_id[i] for i in build["oils"]]
+            if build["scroll"]:
+                enchantments.append(by_id[build["scroll"]])
+            attachments = [attachments_by_id[i] for i in build["attachments"].values()]
+            rows = calculate_modified_stats(weapon, attachments, enchantments, catalog["calibers"])
+            stats = {r["stat"]: r["modifiedValue"] for r in rows or []} or weapon["baseStats"]
+            assert build["stats"]["Damage"] == pytest.approx(stats["Damage"], abs=0.011)
+            assert build["stats"]["Recoil"] == pytest.approx(stats["Recoil"], abs=0.011)
+
+        damages = [b["stats"]["Damage"] for b in result["front"]]
+        recoils = [b["stats"]["Recoil"] for b in result["front"]]
+        assert damages == sorted(damages, reverse=True)
+        assert recoils == sorted(recoils, reverse=True)
+
+    def test_exact_when_pool_keeps_every_improving_item(self):
+        catalog = load_catalog(str(DATA_DIR))
+        weapon = next(w for w in catalog["weapons"] if w["name"] == "Beck 8")
+        objectives = [("Damage", "max"), ("Recoil", "min")]
+        result = explore_weapon(weapon, catalog, objectives, pool_size=1000, max_oils=1)
+        assert not result["approximate"]
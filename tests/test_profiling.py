@@ -0,0 +1,61 @@
+"""Tests for scripts/profiling.py and update_all --profile."""
+
+import json
+import re
+import sys
+
+from benchmarks.synthetic_dump import generate_dump
+from scripts import update_all
+from scripts.profiling import Profiler
+from scripts.wiki_parser import iterate_pages
+
+
+class TestProfiler:
+    def test_stage_counts_pages_and_regex_calls(self, tmp_path):
+        dump = str(tmp_path / "dump.xml")
+        generate_dump(dump, pages=30, item_ratio=1.0, formats=["item"])
+        profiler = Profiler()
+        original_search = re.search
+        with profiler.running():
+            with profiler.stage("read"):
+                titles = [title for title, text in iterate_pages(dump) if re.search("kind", text)]
+        assert re.search is original_search
+
+        stage = profiler.stages[0]
+        assert stage["name"] == "read"
+        assert stage["pages_read"] == 30
+        assert stage["pages_yielded"] == len(titles) == 30
+        assert 0 < stage["xml_seconds"] <= stage["wall"]
+        assert stage["regex_calls"] == 30
+        entry = profiler.report()["regex"][0]
+        assert (entry["module"], entry["function"], entry["pattern"], entry["calls"]) == \
+            (__name__, "search", "kind", 30)
+
+    def test_disabled_profiler_records_nothing(self):
+        profiler = Profiler(enabled=False)
+        with profiler.running():
+            with profiler.stage("noop"):
+                re.search("a", "a")
+        assert profiler.stages == [] and profiler.regex == {}
+
+
+class TestUpdateAllProfile:
+    def test_profile_report_and_cprofile(self, tmp_path, monkeypatch, capsys):
+        dump = str(tmp_path / "dump.xml")
+        generate_dump(dump, pages=60)
+        report_path, pstats_path = tmp_path / "timing.json", tmp_path / "run.pstats"
+        monkeypatch.setattr(sys, "argv", [
+            "update_all", dump, "--output-dir", str(tmp_path / "data"),
+            "--profile-report", str(report_path), "--cprofile", str(pstats_path),
+        ])
+        update_all.main()
+
+        report = json.loads(report_path.read_text(encoding="utf-8"))
+        names = [stage["name"] for stage in report["stages"]]
+        assert names[:5] == ["extract_attachments", "extract_weapons", "extract_enchantments",
+                             "extract_scrolls", "extract_calibers"]
+        assert "catalog" in names and "manifest" in names
+        assert all(stage["pages_read"] == 60 for stage in report["stages"][:5])
+        assert report["regex"] and report["writes"]
+        assert pstats_path.exists()
+        assert "=== Profile ===" in capsys.readouterr().out
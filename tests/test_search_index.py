@@ -0,0 +1,95 @@
+"""Tests for scripts/search_index.py - prebuilt item search index."""
+
+import json
+
+import pytest
+
+from scripts.search_index import (
+    SEARCH_INDEX_FILENAME,
+    SearchIndex,
+    build_search_index,
+    load_documents,
+    tokenize,
+    write_search_index,
+)
+
+DOCUMENTS = [
+    ("weapon", {"id": "Weapon_Rokua", "name": "Rokua .308", "type": "Rifle", "ammoType": "7.62mm",
+                "baseStats": {"Damage": 90.0}}),
+    ("oil", {"id": "Damage_Oil", "name": "Damage Oil", "modifiers": [
+        {"attribute": "Damage", "modType": 200, "value": 0.2},
+        {"attribute": "Recoil", "modType": 200, "value": 0.1},
+    ]}),
+    ("oil", {"id": "Weak_Oil", "name": "Weak Oil", "modifiers": [
+        {"attribute": "Damage", "modType": 200, "value": -0.3},
+    ]}),
+    ("scroll", {"id": "Scroll_of_Aftershock", "name": "Scroll of Aftershock", "modifiers": [],
+                "effects": ["Adds chance to shock the area on hit"]}),
+    ("attachment", {"id": "Haukland_Silencer", "name": "Haukland Silencer", "type": "muzzle",
+                    "modifiers": {"Damage": {"value": -0.1, "type": "percent"}, "Spread": 2.0},
+                    "description": "Reduces noise."}),
+]
+
+
+@pytest.fixture
+def index():
+    return SearchIndex(build_search_index(DOCUMENTS))
+
+
+def _ids(results):
+    return [doc["id"] for doc in results]
+
+
+class TestTokenize:
+    def test_keeps_dotted_numbers_and_calibers(self):
+        assert tokenize("Rokua .308, 7.62mm: Damage 0.2") == ["rokua", "308", "7.62mm", "damage", "0.2"]
+
+
+class TestSearch:
+    def test_infix_terms_use_trigrams(self, index):
+        assert _ids(index.search("ilenc")) == ["Haukland_Silencer"]
+
+    def test_short_terms_match_prefixes(self, index):
+        assert _ids(index.search("ro")) == ["Weapon_Rokua"]
+
+    def test_every_term_must_match(self, index):
+        assert _ids(index.search("damage oil")) == ["Damage_Oil", "Weak_Oil"]
+        assert _ids(index.search("damage shock")) == []
+
+    def test_searches_effects_description_and_stats(self, index):
+        assert _ids(index.search("shock")) == ["Scroll_of_Aftershock"]
+        assert _ids(index.search("noise")) == ["Haukland_Silencer"]
+        assert _ids(index.search("7.62")) == ["Weapon_Rokua"]
+
+    def test_kind_filter_and_empty_query(self, index):
+        assert _ids(index.search("damage", kind="attachment")) == ["Haukland_Silencer"]
+        assert _ids(index.search("", kind="oil")) == ["Damage_Oil", "Weak_Oil"]
+        assert index.search_ids("") is None
+
+
+class TestModifiers:
+    def test_sign_and_type(self, index):
+        assert _ids(index.with_modifier("Damage", "PercentAdd", sign="+")) == ["Damage_Oil"]
+        assert _ids(index.with_modifier("Damage", sign="-")) == ["Weak_Oil", "Haukland_Silencer"]
+        assert index.with_modifier("Spread")[0]["modifier"] == "Spread:Flat"
+
+    def test_query_combines_kind_modifiers_and_text(self, index):
+        assert _ids(index.query("kind:oil +Damage:PercentAdd")) == ["Damage_Oil"]
+        assert _ids(index.query("-Damage silencer")) == ["Haukland_Silencer"]
+        assert _ids(index.query("kind:oil recoil")) == ["Damage_Oil"]
+
+
+class TestWriteSearchIndex:
+    def test_reads_extractor_outputs(self, tmp_path):
+        (tmp_path / "enchantments.json").write_text(json.dumps([DOCUMENTS[1][1]]), encoding="utf-8")
+        (tmp_path / "attachments-muzzle.json").write_text(json.dumps([DOCUMENTS[4][1]]), encoding="utf-8")
+
+        assert [kind for kind, _ in load_documents(str(tmp_path))] == ["oil", "attachment"]
+        index = write_search_index(str(tmp_path))
+        written = json.loads((tmp_path / SEARCH_INDEX_FILENAME).read_text(encoding="utf-8"))
+        assert written == index
+
+
+def test_committed_index_matches_data_files(committed_data_dir):
+    written = json.loads((committed_data_dir / SEARCH_INDEX_FILENAME).read_text(encoding="utf-8"))
+    assert written == build_search_index(load_documents(str(committed_data_dir)))
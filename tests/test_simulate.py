@@ -0,0 +1,130 @@
+"""Tests for scripts/simulate.py - Monte Carlo TTK and DPS simulator."""
+
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from scripts.simulate import (
+    cycle_distribution,
+    hit_probability,
+    hits_to_kill_distribution,
+    resolve_stats,
+    shot_distribution,
+    simulate,
+)
+
+# Every pellet hits, never crits and never lands on the head
+SURE_HIT = {"distance": 10.0, "radius": 0.5, "head_fraction": 0.0, "crit_multiplier": 2.0,
+            "head_multiplier": 2.0, "ads": False}
+
+STATS = {"Damage": 100.0, "RPM": 600.0, "MagazineSize": 2.0, "Spread": 0.0, "ProjectileCount": 1.0,
+         "ReloadSpeed": 1.0, "AmmoConsumeChance": 1.0, "CritChance": 0.0, "BulletPenetrations": 0.0}
+
+
+class TestResolveStats:
+    def test_modifier_only_stats_start_from_neutral_defaults(self):
+        weapon = {"id": "Weapon_Test", "baseStats": {"Damage": 50.0, "ProjectileCount": 1.0}}
+        oil = {"modifiers": [{"attribute": "ReloadSpeed", "modType": 200, "value": 0.8}]}
+        stats = resolve_stats(weapon, [], [oil])
+        assert stats["ReloadSpeed"] == pytest.approx(1.8)
+        assert stats["AmmoConsumeChance"] == 1.0
+        assert stats["Damage"] == 50.0
+
+
+class TestShotDistribution:
+    def test_hit_probability(self):
+        assert hit_probability(0.0, 10.0, 0.5) == 1.0
+        # 1 m cone radius at 10 m, 0.5 m target: a quarter of the area
+        spread = math.degrees(math.atan(0.1))
+        assert hit_probability(spread, 10.0, 0.5) == pytest.approx(0.25)
+
+    def test_pellets_and_crits_combine(self):
+        stats = dict(STATS, ProjectileCount=2.0, CritChance=0.5)
+        values, cdf = shot_distribution(stats, SURE_HIT)
+        assert values.tolist() == [200.0, 300.0, 400.0]
+        assert np.diff(cdf, prepend=0.0) == pytest.approx([0.25, 0.5, 0.25])
+
+
+class TestCycleDistribution:
+    def test_expected_shots_and_damage(self):
+        probs = np.array([0.2, 0.5, 0.1, 0.15, 0.05])
+        multipliers = np.array([0.0, 1.0, 1.5, 2.0, 3.0])
+        shots, pmf, den = cycle_distribution(probs, multipliers, pellets=3, magazine=4, consume=0.5)
+        assert pmf.sum() == pytest.approx(1.0)
+        assert (pmf.sum(axis=1) @ shots) == pytest.approx(8.0)   # magazine / consume
+        mean_units = (pmf.sum(axis=0) @ np.arange(pmf.shape[1])) / den
+        assert mean_units == pytest.approx(8.0 * 3 * (probs @ multipliers))
+
+    def test_incommensurate_multipliers_fall_back(self):
+        probs = np.array([0.5, 0.5])
+        assert cycle_distribution(probs, np.array([0.0, math.sqrt(2)]), 1, 4, 1.0) is None
+
+
+class TestHitsToKillDistribution:
+    def test_fixed_damage(self):
+        probs = np.array([0.5, 0.5, 0.0, 0.0, 0.0])
+        multipliers = np.array([0.0, 1.0, 2.0, 2.0, 4.0])
+        pmf = hits_to_kill_distribution(probs, multipliers, pellets=1, health_units=4.5)
+        assert np.flatnonzero(pmf).tolist() == [5]
+
+    def test_crit_mixture(self):
+        # Every hit deals 1 or 2; two hits kill unless both are 1
+        probs = np.array([0.9, 0.05, 0.05, 0.0, 0.0])
+        multipliers = np.array([0.0, 1.0, 2.0, 2.0, 4.0])
+        pmf = hits_to_kill_distribution(probs, multipliers, pellets=1, health_units=3.0)
+        assert pmf[:4] == pytest.approx([0.0, 0.0, 0.75, 0.25])
+
+    def test_incommensurate_multipliers_fall_back(self):
+        probs = np.array([0.5, 0.5])
+        assert hits_to_kill_distribution(probs, np.array([0.0, math.sqrt(2)]), 1, 10.0) is None
+
+
+class TestSimulate:
+    def test_deterministic_build(self):
+        result = simulate(STATS, dict(SURE_HIT, health=250.0, reload_time=1.0), trials=1000, seed=0)
+        # 3 shots: 0.2 s between them plus one reload after the 2-round magazine
+        assert result["shots_to_kill"]["mean"] == 3
+        assert result["ttk"]["mean"] == pytest.approx(1.2)
+        assert result["ttk"]["p99"] == pytest.approx(1.2)
+        assert result["dps"]["mean"] == pytest.approx(200.0 / 1.2)
+
+    def test_crit_chance_changes_shots_to_kill(self):
+        stats = dict(STATS, CritChance=0.5)
+        result = simulate(stats, dict(SURE_HIT, health=150.0), trials=200_000, seed=1)
+        assert result["shots_to_kill"]["mean"] == pytest.approx(1.5, abs=0.01)
+        assert result["shots_to_kill"]["p10"] == 1
+        assert result["shots_to_kill"]["p90"] == 2
+
+    def test_penetration_counts_lined_up_targets(self):
+        stats = dict(STATS, BulletPenetrations=1.0)
+        single = simulate(stats, dict(SURE_HIT, targets=1), trials=1000, seed=2)
+        lined_up = simulate(stats, dict(SURE_HIT, targets=3), trials=1000, seed=2)
+        assert lined_up["dps"]["mean"] == pytest.approx(2 * single["dps"]["mean"])
+
+    def test_lattice_and_fallback_cycle_sampling_agree(self):
+        stats = dict(STATS, CritChance=0.3, AmmoConsumeChance=0.6, Spread=4.0, MagazineSize=10.0)
+        exact = simulate(stats, {"crit_multiplier": 1.75}, trials=200_000, seed=3)
+        fallback = simulate(stats, {"crit_multiplier": 1.75 + 1e-7}, trials=200_000, seed=3)
+        assert exact["dps"]["mean"] == pytest.approx(fallback["dps"]["mean"], rel=0.01)
+
+    def test_zero_rpm_never_finishes_a_multi_shot_kill(self):
+        result = simulate(dict(STATS, RPM=0.0), dict(SURE_HIT, health=250.0), trials=1000, seed=4)
+        assert math.isinf(result["ttk"]["mean"])
+        assert result["dps"]["mean"] == 0.0
+
+    def test_lattice_and_fallback_shots_to_kill_agree(self):
+        stats = dict(STATS, CritChance=0.3, Spread=12.0, ProjectileCount=3.0)
+        target = {"health": 900.0, "crit_multiplier": 1.75}
+        exact = simulate(stats, target, trials=100_000, seed=5)
+        fallback = simulate(stats, dict(target, crit_multiplier=1.75 + 1e-7), trials=100_000, seed=5)
+        for key in ("mean", "p10", "p50", "p90"):
+            assert exact["shots_to_kill"][key] == pytest.approx(fallback["shots_to_kill"][key], rel=0.02)
+
+    def test_rare_hits_and_long_kills(self):
+        # About 2% of shots hit and a kill takes ~1600 shots: the worst case for per-shot sampling
+        stats = dict(STATS, Damage=50.0, Spread=20.0, CritChance=0.2, MagazineSize=30.0, AmmoConsumeChance=0.7)
+        result = simulate(stats, {"health": 2000.0}, trials=100_000, seed=6)
+        assert result["hit_chance"] < 0.02 and result["shots_to_kill"]["mean"] > 1000
+        assert result["shots_to_kill"]["p10"] < result["shots_to_kill"]["p50"] < result["shots_to_kill"]["p90"]
@@ -0,0 +1,93 @@
+"""Tests for scripts/snapshots.py - content-addressed snapshot store."""
+
+import json
+
+import pytest
+
+from scripts import snapshots
+from scripts.diff_data import main as diff_main
+from scripts.snapshots import (
+    create_snapshot,
+    diff_snapshots,
+    list_snapshots,
+    load_snapshot,
+    restore_snapshot,
+)
+
+WEAPONS = [
+    {"id": "Weapon_A", "name": "A", "baseStats": {"Damage": 10.0}},
+    {"id": "Weapon_B", "name": "B", "baseStats": {"Damage": 20.0}},
+    {"id": "Weapon_C", "name": "C", "baseStats": {"Damage": 30.0}},
+]
+CALIBERS = {"baseAmmoDamage": {"9mm": 60}, "calibers": {"9mm": {"Damage": 96.0}}}
+
+
+def _write_data(directory, weapons, calibers=CALIBERS):
+    directory.mkdir(exist_ok=True)
+    (directory / "weapons.json").write_text(json.dumps(weapons, indent=2), encoding="utf-8")
+    (directory / "caliber-modifiers.json").write_text(json.dumps(calibers, indent=2), encoding="utf-8")
+
+
+def _objects(store):
+    return sorted(p.name for p in (store / "objects").rglob("*.json"))
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = tmp_path / "store"
+    _write_data(tmp_path / "v1", WEAPONS)
+    create_snapshot(str(store), str(tmp_path / "v1"), "v1")
+
+    changed = [dict(w) for w in WEAPONS[:2]] + [{"id": "Weapon_D", "name": "D", "baseStats": {}}]
+    changed[1] = {**changed[1], "baseStats": {"Damage": 25.0}}
+    _write_data(tmp_path / "v2", changed)
+    create_snapshot(str(store), str(tmp_path / "v2"), "v2")
+    return store
+
+
+class TestCreateSnapshot:
+    def test_items_are_stored_once(self, store):
+        # v1: 3 weapons + calibers; v2 adds changed B and new D only
+        assert len(_objects(store)) == 6
+        index = load_snapshot(str(store), "v2")
+        assert [key for key, _ in index["files"]["weapons.json"]["items"]] == ["A", "B", "D"]
+        assert index["files"]["caliber-modifiers.json"]["object"] == \
+            load_snapshot(str(store), "v1")["files"]["caliber-modifiers.json"]["object"]
+
+    def test_reports_new_objects(self, store, tmp_path, capsys):
+        _write_data(tmp_path / "v3", WEAPONS + [WEAPONS[0], {"id": "Weapon_E", "name": "E", "baseStats": {}}])
+        create_snapshot(str(store), str(tmp_path / "v3"), "v3")
+        assert "1 new objects" in capsys.readouterr().out
+        assert snapshots.put_object(str(store), WEAPONS[0]) == (
+            load_snapshot(str(store), "v1")["files"]["weapons.json"]["items"][0][1], False)
+
+    def test_list_snapshots(self, store):
+        assert [entry["name"] for entry in list_snapshots(str(store))] == ["v1", "v2"]
+
+    def test_restore_round_trip(self, store, tmp_path):
+        restore_snapshot(str(store), "v1", str(tmp_path / "restored"))
+        restored = json.loads((tmp_path / "restored" / "weapons.json").read_text(encoding="utf-8"))
+        assert restored == WEAPONS
+
+
+class TestDiffSnapshots:
+    def test_diff_matches_diff_data(self, store):
+        diff = diff_snapshots(str(store), "v1", "v2")
+        added, removed, changed = diff["weapons.json"]
+        assert added == ["D"]
+        assert removed == ["C"]
+        assert changed == [("B", {"baseStats": ({"Damage": 20.0}, {"Damage": 25.0})})]
+        assert diff["caliber-modifiers.json"] is None
+
+    def test_loads_only_changed_items(self, store, monkeypatch):
+        loaded = []
+        original = snapshots.get_object
+        monkeypatch.setattr(snapshots, "get_object", lambda s, d: loaded.append(d) or original(s, d))
+        diff_snapshots(str(store), "v1", "v2")
+        # old B, new B, removed C, added D
+        assert len(loaded) == 4
+
+    def test_diff_data_store_mode(self, store, capsys):
+        diff_main(["--store", str(store), "v1", "v2"])
+        out = capsys.readouterr().out
+        assert "+ D" in out and "- C" in out and "~ B" in out
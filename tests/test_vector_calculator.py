@@ -0,0 +1,69 @@
+"""Tests for scripts/vector_calculator.py - batched NumPy stacking rules."""
+
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from scripts.calculator import calculate_modified_stats
+from scripts.vector_calculator import evaluate_builds, modifier_tables, stat_list, weapon_table
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "docs" / "data"
+
+
+def _load(name):
+    return json.loads((DATA_DIR / name).read_text(encoding="utf-8"))
+
+
+class TestStatList:
+    def test_ads_crit_pulls_in_crit_chance(self):
+        assert stat_list(["Damage", "ADSCritChance"]) == ["Damage", "ADSCritChance", "CritChance"]
+
+    def test_deduplicates(self):
+        assert stat_list(["Damage", "Damage"]) == ["Damage"]
+
+
+class TestEvaluateBuilds:
+    def test_matches_scalar_calculator_on_random_builds(self):
+        weapons = _load("weapons.json")
+        enchantments = [None] + _load("enchantments.json") + _load("scrolls.json")
+        attachments = [None]
+        slots = []
+        for name in ("attachments-muzzle.json", "attachments-sights.json",
+                     "attachments-lasers.json", "attachments-chisels.json"):
+            items = _load(name)
+            slots.append(list(range(len(attachments), len(attachments) + len(items))))
+            attachments.extend(items)
+        calibers = _load("caliber-modifiers.json")
+
+        stats = stat_list(["Damage", "RPM", "Spread", "Recoil", "ProjectileCount",
+                           "ReloadSpeed", "BulletPenetrations", "ADSCritChance"])
+        tables = modifier_tables(enchantments, attachments, stats, calibers)
+
+        rng = random.Random(7)
+        for weapon in rng.sample(weapons, 6):
+            wtable = weapon_table(weapon, stats, calibers)
+            ench_rows, att_rows = [], []
+            for _ in range(50):
+                ench_rows.append([rng.randrange(len(enchantments)) for _ in range(5)])
+                att_rows.append([rng.choice([0] + slot) for slot in slots])
+            values = evaluate_builds(tables, wtable, stats, np.array(ench_rows), np.array(att_rows))
+
+            for row, (ench, att) in enumerate(zip(ench_rows, att_rows)):
+                rows = calculate_modified_stats(
+                    weapon,
+                    [attachments[i] for i in att if i],
+                    [enchantments[i] for i in ench if i],
+                    calibers,
+                )
+                if rows is None:
+                    continue
+                expected = {}
+                for r in rows:
+                    expected.setdefault(r["stat"], r["modifiedValue"])
+                for col, stat in enumerate(stats):
+                    if stat in expected:
+                        assert values[row, col] == pytest.approx(expected[stat], abs=0.011), stat
@@ -1,5 +1,17 @@
+import io
+
 import pytest
-from scripts.wiki_parser import parse_infobox, parse_modifier_value, parse_damage_field, extract_wikilink_text
+from scripts import wiki_parser
+from scripts.wiki_parser import (
+    ProgressReporter,
+    extract_wikilink_text,
+    iterate_page_revisions,
+    iterate_pages,
+    parse_damage_field,
+    parse_infobox,
+    parse_modifier_value,
+    set_progress,
+)
 
 
 class TestParseInfobox:
@@ -156,3 +168,99 @@ class TestExtractWikilinkText:
 
     def test_link_with_spaces(self):
         assert extract_wikilink_text('[[Muzzle Attachments|Muzzle attachment]]') == 'Muzzle attachment'
+
+
+DUMP = """<mediawiki xmlns="http://www.mediawiki.org/xml/export-0.11/">
+<page><title>Beck 8</title><revision><text>{{Item Infobox
+| kind = weapon
+}}</text></revision></page>
+<page><title>Category:Weapons</title><revision><text>x</text></revision></page>
+<page><title>Old</title><revision><text>#REDIRECT [[Beck 8]]</text></revision></page>
+</mediawiki>
+"""
+
+
+class TestProgress:
+    def test_reporter_line(self):
+        stream = io.StringIO()
+        reporter = ProgressReporter(4 * 1024 * 1024, "dump.xml", stream=stream, interval=0)
+        reporter.update(1024 * 1024, 500)
+        line = stream.getvalue()
+        assert line.startswith("\rdump.xml")
+        assert " 25.0%" in line and "1.0 MB/4.0 MB" in line and "500 pages" in line
+        assert "pages/s" in line and "MB/s" in line and "ETA" in line
+
+    def test_unknown_total_omits_percentage(self):
+        reporter = ProgressReporter(0, stream=io.StringIO())
+        reporter.update(2048, 3)
+        assert "%" not in reporter.line() and "ETA" not in reporter.line()
+
+    def test_iterate_pages_reports_bytes_and_pages(self, tmp_path, capsys):
+        dump = tmp_path / "dump.xml"
+        dump.write_text(DUMP, encoding="utf-8")
+        assert [title for title, _ in iterate_pages(str(dump), progress=True)] == ["Beck 8"]
+        final = capsys.readouterr().err.split("\r")[-1]
+        assert "100.0%" in final and "3 pages" in final
+
+    def test_silenced(self, tmp_path, capsys, monkeypatch):
+        dump = tmp_path / "dump.xml"
+        dump.write_text(DUMP, encoding="utf-8")
+        monkeypatch.setenv(wiki_parser.PROGRESS_ENV, "1")
+        set_progress(False)
+        try:
+            list(iterate_pages(str(dump)))
+        finally:
+            set_progress(None)
+        assert capsys.readouterr().err == ""
+
+    def test_env_enables(self, monkeypatch):
+        monkeypatch.setenv(wiki_parser.PROGRESS_ENV, "1")
+        assert wiki_parser.progress_enabled()
+        monkeypatch.setenv(wiki_parser.PROGRESS_ENV, "0")
+        assert not wiki_parser.progress_enabled()
+
+
+HISTORY_DUMP = """<mediawiki xmlns="http://www.mediawiki.org/xml/export-0.11/">
+<page><title>Beck 8</title>
+<revision><text>== Available Attachments ==
+* Sight</text></revision>
+<revision><text>== Available Attachments ==
+* Muzzle</text></revision>
+<revision><text>Stub with the section removed</text></revision>
+</page>
+<page><title>Vector &amp; Co</title><revision><text>== Available Attachments ==
+* Laser</text></revision></page>
+<page><title>Pickaxe</title><revision><text>No attachments</text></revision></page>
+</mediawiki>
+"""
+
+
+class TestIteratePageRevisions:
+    def test_latest_accepted_revision(self, tmp_path):
+        dump = tmp_path / "history.xml"
+        dump.write_text(HISTORY_DUMP, encoding="utf-8")
+        pages = list(iterate_page_revisions(str(dump), keep=lambda text: "Available Attachments" in text,
+                                            progress=False))
+        assert pages == [
+            ("Beck 8", "== Available Attachments ==\n* Muzzle"),
+            ("Vector & Co", "== Available Attachments ==\n* Laser"),
+        ]
+
+    def test_iterate_pages_uses_latest_revision(self, tmp_path):
+        dump = tmp_path / "history.xml"
+        dump.write_text(HISTORY_DUMP, encoding="utf-8")
+        pages = dict(iterate_pages(str(dump), progress=False))
+        assert pages["Beck 8"] == "Stub with the section removed"
+
+    def test_iterate_pages_reports_every_revision(self, tmp_path):
+        dump = tmp_path / "history.xml"
+        dump.write_text(HISTORY_DUMP, encoding="utf-8")
+        revisions = []
+        pages = list(iterate_pages(str(dump), progress=False,
+                                   on_revision=lambda title, text: revisions.append((title, text))))
+        assert pages == list(iterate_pages(str(dump), progress=False))
+        assert [text for title, text in revisions if title == "Beck 8"] == [
+            "== Available Attachments ==\n* Sight",
+            "== Available Attachments ==\n* Muzzle",
+            "Stub with the section removed",
+        ]